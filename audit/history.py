@@ -0,0 +1,71 @@
+"""Reading the audit log: keyset pagination and display values."""
+from collections import defaultdict
+
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.utils.text import capfirst
+from django.utils.translation import gettext as _
+
+from task_manager.keyset import keyset_page
+
+
+def history_page(queryset, cursor=None, size=50):
+    """Return the ``size`` newest entries older than ``cursor`` and the cursor of the next page."""
+    return keyset_page(queryset, 'changed_at', cursor, size)
+
+
+def get_field(model, name):
+    """Return the field ``name`` of ``model``, or None if it has since been removed or renamed."""
+    try:
+        return model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+
+
+def display_value(field, value, objects):
+    if value is None or value == '':
+        return '-'
+    if field is None:
+        return value
+    if field.is_relation:
+        obj = objects[field.related_model].get(value)
+        return str(obj) if obj is not None else f'#{value}'
+    if isinstance(value, bool):
+        return _('Yes') if value else _('No')
+    if field.choices:
+        return dict(field.flatchoices).get(value, value)
+    return value
+
+
+def describe(entries):
+    """Set ``actor`` and ``rows`` (field label, old, new) on each entry for display.
+
+    Foreign keys and actors are stored as ids; they are loaded with one
+    query per related model for the whole page. Fields that no longer exist
+    are shown by their stored name and raw values.
+    """
+    user_model = apps.get_model(settings.AUTH_USER_MODEL)
+    ids = defaultdict(set)
+    for entry in entries:
+        if entry.actor_id is not None:
+            ids[user_model].add(entry.actor_id)
+        model = apps.get_model(entry.model)
+        for name, values in entry.changes.items():
+            field = get_field(model, name)
+            if field is not None and field.is_relation:
+                ids[field.related_model].update(value for value in values if value is not None)
+    objects = defaultdict(dict, {model: model._base_manager.in_bulk(pks) for model, pks in ids.items()})
+
+    for entry in entries:
+        entry.actor = objects[user_model].get(entry.actor_id)
+        model = apps.get_model(entry.model)
+        entry.rows = []
+        for name, (old, new) in entry.changes.items():
+            field = get_field(model, name)
+            entry.rows.append((
+                capfirst(field.verbose_name) if field is not None else name,
+                display_value(field, old, objects),
+                display_value(field, new, objects),
+            ))
+    return entries
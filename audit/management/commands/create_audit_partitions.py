@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from audit.partitions import create_partitions, schedule_maintenance
+
+
+class Command(BaseCommand):
+    help = (
+        'Create the monthly audit log partitions for this month and the next ones, and schedule the '
+        'monthly job that keeps creating them (PostgreSQL only)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months', type=int, default=settings.AUDIT_PARTITIONS_AHEAD,
+            help='Months ahead to create partitions for (default: AUDIT_PARTITIONS_AHEAD).',
+        )
+        parser.add_argument('--database', default='default', help='Database alias (default: "default").')
+
+    def handle(self, *args, **options):
+        created = create_partitions(options['months'], using=options['database'])
+        for name in created:
+            self.stdout.write(f'Created {name}')
+        self.stdout.write(self.style.SUCCESS(f'{len(created)} partition(s) created.'))
+        if connections[options['database']].vendor == 'postgresql':
+            job = schedule_maintenance()
+            self.stdout.write(f'Next check scheduled for {job.run_at:%Y-%m-%d}.')
@@ -0,0 +1,16 @@
+from .recorder import batch
+
+
+class AuditMiddleware:
+    """Write the audit entries of a request in one INSERT when it ends.
+
+    Must come after AuthenticationMiddleware, which provides the user
+    recorded as the author of the changes.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with batch(request):
+            return self.get_response(request)
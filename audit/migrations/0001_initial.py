@@ -0,0 +1,73 @@
+# Generated by Django 6.0 on 2026-10-19 11:02
+
+import django.core.serializers.json
+import django.utils.timezone
+from django.db import migrations, models
+
+# PostgreSQL wants the partition key in the primary key; Django keeps
+# treating "id" alone as the primary key, which it still is in practice.
+PARTITIONED_TABLE = [
+    '''
+    CREATE TABLE "audit_auditentry" (
+        "id" bigint GENERATED BY DEFAULT AS IDENTITY,
+        "changed_at" timestamp with time zone NOT NULL,
+        "model" varchar(100) NOT NULL,
+        "object_id" bigint NOT NULL,
+        "task_id" bigint NULL,
+        "actor_id" bigint NULL,
+        "action" varchar(8) NOT NULL,
+        "changes" jsonb NOT NULL,
+        PRIMARY KEY ("id", "changed_at")
+    ) PARTITION BY RANGE ("changed_at")
+    ''',
+    'CREATE TABLE "audit_auditentry_default" PARTITION OF "audit_auditentry" DEFAULT',
+    'CREATE INDEX "audit_entry_task_changed_idx" ON "audit_auditentry" ("task_id", "changed_at")',
+]
+
+
+def create_table(apps, schema_editor):
+    AuditEntry = apps.get_model('audit', 'AuditEntry')
+    if schema_editor.connection.vendor != 'postgresql':
+        schema_editor.create_model(AuditEntry)
+        return
+    for sql in PARTITIONED_TABLE:
+        schema_editor.execute(sql)
+
+    from audit.partitions import create_partitions
+    create_partitions(using=schema_editor.connection.alias)
+
+
+def drop_table(apps, schema_editor):
+    schema_editor.delete_model(apps.get_model('audit', 'AuditEntry'))
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='AuditEntry',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                        ('model', models.CharField(max_length=100)),
+                        ('object_id', models.BigIntegerField()),
+                        ('task_id', models.BigIntegerField(blank=True, null=True)),
+                        ('actor_id', models.BigIntegerField(blank=True, null=True)),
+                        ('action', models.CharField(choices=[('create', 'Created'), ('update', 'Updated'), ('delete', 'Deleted')], max_length=8)),
+                        ('changes', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                    ],
+                    options={
+                        'indexes': [models.Index(fields=['task_id', 'changed_at'], name='audit_entry_task_changed_idx')],
+                    },
+                ),
+            ],
+        ),
+        migrations.RunPython(create_table, drop_table),
+    ]
@@ -0,0 +1,38 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+
+class AuditEntry(models.Model):
+    """One change to a tracked object; rows are only ever inserted.
+
+    There are no foreign keys: entries outlive the rows they describe and
+    inserts don't pay for constraint checks. On PostgreSQL the table is
+    partitioned by month of ``changed_at`` (see migration 0001 and
+    audit/partitions.py).
+    """
+
+    class Action(models.TextChoices):
+        CREATE = 'create', _('Created')
+        UPDATE = 'update', _('Updated')
+        DELETE = 'delete', _('Deleted')
+
+    changed_at = models.DateTimeField(default=timezone.now)
+    # Model label, e.g. 'tasks.Task'
+    model = models.CharField(max_length=100)
+    object_id = models.BigIntegerField()
+    # Set for task entries so a task's history is a single index range
+    task_id = models.BigIntegerField(blank=True, null=True)
+    actor_id = models.BigIntegerField(blank=True, null=True)
+    action = models.CharField(max_length=8, choices=Action.choices)
+    # {field name: [old value, new value]}, foreign keys as ids
+    changes = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=('task_id', 'changed_at'), name='audit_entry_task_changed_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.model} #{self.object_id} {self.action}'
@@ -0,0 +1,113 @@
+"""Monthly partitions of the audit table on PostgreSQL.
+
+The table is range-partitioned on ``changed_at`` with a DEFAULT partition,
+so inserts never fail, but rows should land in their month's partition:
+old months can then be detached or dropped without touching the rest.
+``create_partitions`` creates them ahead of time. It runs on deploy
+(``manage.py create_audit_partitions``) and from the ``maintain_partitions``
+job, which reschedules itself every month so partitions keep being created
+between deploys.
+"""
+from datetime import UTC, date, datetime
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+
+from jobs.queue import enqueue_once
+
+TABLE = 'audit_auditentry'
+DEFAULT_PARTITION = f'{TABLE}_default'
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f'{TABLE}_p{month:%Y_%m}'
+
+
+def existing_partitions(connection):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT child.relname FROM pg_inherits '
+            'JOIN pg_class parent ON parent.oid = pg_inherits.inhparent '
+            'JOIN pg_class child ON child.oid = pg_inherits.inhrelid '
+            'WHERE parent.relname = %s',
+            [TABLE],
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+
+def create_partition(connection, start):
+    """Create the partition for the month starting at ``start``.
+
+    PostgreSQL refuses to create a partition while the DEFAULT partition
+    holds rows in its range (e.g. after going longer than
+    AUDIT_PARTITIONS_AHEAD months without creating any), so in that case
+    DEFAULT is detached, the partition created, the rows moved over and
+    DEFAULT attached again, all in one transaction.
+    """
+    qn = connection.ops.quote_name
+    end = add_months(start, 1)
+    bounds = [datetime(start.year, start.month, 1, tzinfo=UTC), datetime(end.year, end.month, 1, tzinfo=UTC)]
+    create = (
+        f'CREATE TABLE {qn(partition_name(start))} PARTITION OF {qn(TABLE)} '
+        f"FOR VALUES FROM ('{start:%Y-%m-%d} 00:00:00+00') TO ('{end:%Y-%m-%d} 00:00:00+00')"
+    )
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT EXISTS (SELECT 1 FROM {qn(DEFAULT_PARTITION)} WHERE changed_at >= %s AND changed_at < %s)',
+            bounds,
+        )
+        if not cursor.fetchone()[0]:
+            cursor.execute(create)
+            return
+        cursor.execute(f'ALTER TABLE {qn(TABLE)} DETACH PARTITION {qn(DEFAULT_PARTITION)}')
+        cursor.execute(create)
+        cursor.execute(
+            f'WITH moved AS (DELETE FROM {qn(DEFAULT_PARTITION)} WHERE changed_at >= %s AND changed_at < %s RETURNING *) '
+            f'INSERT INTO {qn(partition_name(start))} SELECT * FROM moved',
+            bounds,
+        )
+        cursor.execute(f'ALTER TABLE {qn(TABLE)} ATTACH PARTITION {qn(DEFAULT_PARTITION)} DEFAULT')
+
+
+def create_partitions(months_ahead=None, using='default'):
+    """Create the partitions for this month and ``months_ahead`` months after it.
+
+    Returns the names of the partitions created; does nothing on other
+    databases.
+    """
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return []
+    if months_ahead is None:
+        months_ahead = settings.AUDIT_PARTITIONS_AHEAD
+
+    existing = existing_partitions(connection)
+    this_month = timezone.now().date().replace(day=1)
+    created = []
+    for offset in range(months_ahead + 1):
+        start = add_months(this_month, offset)
+        name = partition_name(start)
+        if name not in existing:
+            create_partition(connection, start)
+            created.append(name)
+    return created
+
+
+def schedule_maintenance():
+    """Queue ``maintain_partitions`` for the start of next month (once)."""
+    start = add_months(timezone.now().date().replace(day=1), 1)
+    run_at = datetime(start.year, start.month, 1, tzinfo=UTC)
+    return enqueue_once(maintain_partitions, run_at=run_at)
+
+
+def maintain_partitions():
+    """Job: create the upcoming partitions and run again next month."""
+    # Scheduled first so a failure here (retried by the queue) can't break the chain
+    schedule_maintenance()
+    return create_partitions()
@@ -0,0 +1,59 @@
+"""Buffer audit entries and write them in batches.
+
+Entries are queued once the transaction that made the change commits, so
+rolled back changes leave no trace. Inside ``batch()`` (AuditMiddleware
+wraps every request in one) they are collected and written with a single
+INSERT when the block ends; outside of it each one is written at commit.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import transaction
+
+from .models import AuditEntry
+
+_pending = ContextVar('audit_pending', default=None)
+_actor = ContextVar('audit_actor', default=None)
+
+
+def current_actor_id():
+    """Return the pk of the user making the current request, if any."""
+    request = _actor.get()
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return user.pk
+    return None
+
+
+def record(entry):
+    """Write ``entry`` once the current transaction commits."""
+    if entry.actor_id is None:
+        entry.actor_id = current_actor_id()
+
+    def queue():
+        pending = _pending.get()
+        if pending is None:
+            flush([entry])
+        else:
+            pending.append(entry)
+
+    transaction.on_commit(queue)
+
+
+def flush(entries):
+    if entries:
+        AuditEntry.objects.bulk_create(entries)
+
+
+@contextmanager
+def batch(request=None):
+    """Collect the entries recorded inside the block and write them together at its end."""
+    pending_token = _pending.set([])
+    actor_token = _actor.set(request)
+    try:
+        yield
+    finally:
+        entries = _pending.get()
+        _pending.reset(pending_token)
+        _actor.reset(actor_token)
+        flush(entries)
@@ -0,0 +1,80 @@
+from django.apps import apps
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from .models import AuditEntry
+from .recorder import record
+
+# Fields whose changes are recorded, per model
+TRACKED_FIELDS = {
+    'tasks.Task': ('name', 'description', 'status', 'executor', 'due_date', 'priority'),
+    'statuses.Status': ('name',),
+    settings.AUTH_USER_MODEL: ('username', 'first_name', 'last_name', 'email', 'is_active', 'is_staff', 'is_superuser'),
+}
+
+
+def tracked_fields(model, update_fields=None):
+    fields = [model._meta.get_field(name) for name in TRACKED_FIELDS[model._meta.label]]
+    if update_fields is not None:
+        fields = [field for field in fields if field.name in update_fields]
+    return fields
+
+
+def entry_for(instance, action, changes):
+    label = instance._meta.label
+    return AuditEntry(
+        model=label,
+        object_id=instance.pk,
+        task_id=instance.pk if label == 'tasks.Task' else None,
+        action=action,
+        changes=changes,
+    )
+
+
+def capture_old_values(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Read the stored values of the tracked fields before an update overwrites them."""
+    instance._audit_old_values = None
+    if raw or instance._state.adding:
+        return
+    fields = tracked_fields(sender, update_fields)
+    if fields:
+        # One primary key lookup of the tracked columns only
+        instance._audit_old_values = (
+            sender._base_manager.using(instance._state.db)
+            .filter(pk=instance.pk)
+            .values(*[field.attname for field in fields])
+            .first()
+        )
+
+
+def record_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if created:
+        changes = {field.name: [None, getattr(instance, field.attname)] for field in tracked_fields(sender)}
+        record(entry_for(instance, AuditEntry.Action.CREATE, changes))
+        return
+
+    old_values = instance.__dict__.pop('_audit_old_values', None)
+    if not old_values:
+        return
+    changes = {}
+    for field in tracked_fields(sender, update_fields):
+        old, new = old_values[field.attname], getattr(instance, field.attname)
+        if old != new:
+            changes[field.name] = [old, new]
+    if changes:
+        record(entry_for(instance, AuditEntry.Action.UPDATE, changes))
+
+
+def record_delete(sender, instance, **kwargs):
+    changes = {field.name: [getattr(instance, field.attname), None] for field in tracked_fields(sender)}
+    record(entry_for(instance, AuditEntry.Action.DELETE, changes))
+
+
+def connect():
+    for label in TRACKED_FIELDS:
+        model = apps.get_model(label)
+        pre_save.connect(capture_old_values, sender=model, dispatch_uid=f'audit_pre_save_{label}')
+        post_save.connect(record_save, sender=model, dispatch_uid=f'audit_post_save_{label}')
+        post_delete.connect(record_delete, sender=model, dispatch_uid=f'audit_post_delete_{label}')
@@ -0,0 +1,135 @@
+from datetime import UTC, date, datetime, timedelta
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from audit.history import describe, history_page
+from audit.models import AuditEntry
+from audit.partitions import DEFAULT_PARTITION, add_months, create_partitions, maintain_partitions, partition_name
+from jobs.models import Job
+from statuses.models import Status
+from task_manager.keyset import make_cursor, parse_cursor
+
+
+class HistoryPageTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        # Two entries share each timestamp, so the id breaks ties
+        AuditEntry.objects.bulk_create(
+            AuditEntry(
+                model='tasks.Task', object_id=1, task_id=1, action='update',
+                changed_at=now - timedelta(minutes=i // 2), changes={'name': [str(i), str(i + 1)]},
+            )
+            for i in range(7)
+        )
+        AuditEntry.objects.create(model='tasks.Task', object_id=2, task_id=2, action='update', changes={})
+
+    def test_pages_walk_the_whole_history_without_overlap(self):
+        queryset = AuditEntry.objects.filter(task_id=1)
+        seen, cursor = [], None
+        while True:
+            entries, cursor = history_page(queryset, cursor, size=3)
+            seen.extend(entries)
+            if cursor is None:
+                break
+        self.assertEqual(len(seen), 7)
+        self.assertEqual(len({entry.pk for entry in seen}), 7)
+        positions = [(entry.changed_at, entry.pk) for entry in seen]
+        self.assertEqual(positions, sorted(positions, reverse=True))
+
+    def test_last_full_page_has_no_cursor(self):
+        entries, cursor = history_page(AuditEntry.objects.filter(task_id=1), size=7)
+        self.assertEqual(len(entries), 7)
+        self.assertIsNone(cursor)
+
+    def test_each_page_is_one_query(self):
+        first, cursor = history_page(AuditEntry.objects.filter(task_id=1), size=3)
+        with self.assertNumQueries(1):
+            history_page(AuditEntry.objects.filter(task_id=1), cursor, size=3)
+
+    def test_cursor_round_trip(self):
+        entry = AuditEntry.objects.first()
+        self.assertEqual(parse_cursor(make_cursor(entry, 'changed_at')), (entry.changed_at, entry.pk))
+        self.assertIsNone(parse_cursor('garbage'))
+
+    def test_invalid_cursor_gives_first_page(self):
+        entries, _ = history_page(AuditEntry.objects.filter(task_id=1), 'x.y', size=3)
+        self.assertEqual(entries, history_page(AuditEntry.objects.filter(task_id=1), size=3)[0])
+
+
+class DescribeTests(TestCase):
+    def test_related_objects_and_actors_are_loaded_per_model(self):
+        user = get_user_model().objects.create_user(username='alice')
+        statuses = Status.objects.bulk_create([Status(name='New'), Status(name='Done')])
+        entries = [
+            AuditEntry(
+                model='tasks.Task', object_id=1, action='update', actor_id=user.pk,
+                changes={'status': [statuses[0].pk, statuses[1].pk], 'executor': [None, user.pk]},
+            ),
+            AuditEntry(model='tasks.Task', object_id=1, action='update', changes={'status': [statuses[1].pk, 999]}),
+        ]
+        # users, statuses
+        with self.assertNumQueries(2):
+            describe(entries)
+        self.assertEqual(entries[0].actor, user)
+        self.assertEqual(entries[0].rows, [('Status', 'New', 'Done'), ('Executor', '-', 'alice')])
+        self.assertEqual(entries[1].rows, [('Status', 'Done', '#999')])
+        self.assertIsNone(entries[1].actor)
+
+    def test_removed_fields_show_their_stored_name_and_values(self):
+        entry = AuditEntry(
+            model='tasks.Task', object_id=1, action='update', changes={'estimate': [None, 3], 'name': ['a', 'b']},
+        )
+        describe([entry])
+        self.assertEqual(entry.rows, [('estimate', '-', 3), ('Name', 'a', 'b')])
+
+
+class PartitionTests(TestCase):
+    def test_names(self):
+        self.assertEqual(add_months(date(2026, 11, 1), 2), date(2027, 1, 1))
+        self.assertEqual(partition_name(date(2027, 1, 1)), 'audit_auditentry_p2027_01')
+
+    def test_other_databases_are_not_partitioned(self):
+        if connection.vendor != 'postgresql':
+            self.assertEqual(create_partitions(), [])
+
+    def test_maintenance_job_reschedules_itself_for_next_month_once(self):
+        maintain_partitions()
+        maintain_partitions()
+        job = Job.objects.get()
+        self.assertEqual(job.name, 'audit.partitions.maintain_partitions')
+        next_month = add_months(timezone.now().date().replace(day=1), 1)
+        self.assertEqual(job.run_at, datetime(next_month.year, next_month.month, 1, tzinfo=UTC))
+
+    def partition_of(self, entry):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT tableoid::regclass::text FROM audit_auditentry WHERE id = %s', [entry.pk])
+            return cursor.fetchone()[0]
+
+    @skipUnless(connection.vendor == 'postgresql', 'partitioning is PostgreSQL-only')
+    def test_entries_land_in_their_month(self):
+        create_partitions(1)
+        self.assertEqual(create_partitions(1), [])
+        entry = AuditEntry.objects.create(model='tasks.Task', object_id=1, action='create')
+        self.assertEqual(self.partition_of(entry), partition_name(timezone.now().date().replace(day=1)))
+
+    @skipUnless(connection.vendor == 'postgresql', 'partitioning is PostgreSQL-only')
+    def test_rows_in_the_default_partition_move_to_a_new_partition(self):
+        # Written while no partition covered that month, so it landed in DEFAULT
+        month = add_months(timezone.now().date().replace(day=1), 12)
+        entry = AuditEntry.objects.create(
+            model='tasks.Task', object_id=1, action='create',
+            changed_at=datetime(month.year, month.month, 15, tzinfo=UTC),
+        )
+        self.assertEqual(self.partition_of(entry), DEFAULT_PARTITION)
+        self.assertIn(partition_name(month), create_partitions(12))
+        self.assertEqual(self.partition_of(entry), partition_name(month))
+        self.assertEqual(AuditEntry.objects.get(), entry)
+        # DEFAULT is attached again
+        self.assertEqual(self.partition_of(AuditEntry.objects.create(
+            model='tasks.Task', object_id=2, action='create', changed_at=datetime(2001, 1, 1, tzinfo=UTC),
+        )), DEFAULT_PARTITION)
@@ -0,0 +1,57 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import RequestFactory, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from audit.middleware import AuditMiddleware
+from audit.models import AuditEntry
+from audit.recorder import batch
+from statuses.models import Status
+from tasks.models import Task
+
+
+class AuditBatchTests(TransactionTestCase):
+    # Runs in autocommit, as requests do, so on_commit callbacks fire when they would there
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username='u1')
+        self.status = Status.objects.create(name='New')
+        AuditEntry.objects.all().delete()
+
+    def test_entries_of_a_request_are_written_in_one_insert(self):
+        def view(request):
+            for i in range(3):
+                Task.objects.create(name=f'Task {i}', status=self.status, author=self.user)
+            self.assertFalse(AuditEntry.objects.exists())
+            return 'response'
+
+        request = RequestFactory().get('/')
+        request.user = self.user
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(AuditMiddleware(view)(request), 'response')
+        inserts = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('INSERT INTO "audit_auditentry"')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(AuditEntry.objects.count(), 3)
+        self.assertEqual(set(AuditEntry.objects.values_list('actor_id', flat=True)), {self.user.pk})
+
+    def test_entries_are_written_when_the_view_fails(self):
+        def view(request):
+            Task.objects.create(name='Task', status=self.status, author=self.user)
+            raise ValueError
+
+        request = RequestFactory().get('/')
+        with self.assertRaises(ValueError):
+            AuditMiddleware(view)(request)
+        self.assertEqual(AuditEntry.objects.count(), 1)
+
+    def test_outside_a_batch_entries_are_written_at_commit(self):
+        Status.objects.create(name='Done')
+        self.assertEqual(AuditEntry.objects.get().changes, {'name': [None, 'Done']})
+
+    def test_nested_batches(self):
+        with batch():
+            Status.objects.create(name='A')
+            with batch():
+                Status.objects.create(name='B')
+            self.assertEqual(AuditEntry.objects.count(), 1)
+        self.assertEqual(AuditEntry.objects.count(), 2)
@@ -0,0 +1,74 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.test import TestCase
+
+from audit.models import AuditEntry
+from statuses.models import Status
+from tasks.models import Task
+
+User = get_user_model()
+
+
+class AuditSignalTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='u1', password='pass12345')
+        cls.new = Status.objects.create(name='New')
+        cls.done = Status.objects.create(name='Done')
+        cls.task = Task.objects.create(name='Task', status=cls.new, author=cls.user)
+
+    def test_create_records_initial_values(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            task = Task.objects.create(name='Fresh', status=self.new, author=self.user, executor=self.user)
+        entry = AuditEntry.objects.get(task_id=task.pk)
+        self.assertEqual(entry.action, AuditEntry.Action.CREATE)
+        self.assertEqual(entry.changes['name'], [None, 'Fresh'])
+        self.assertEqual(entry.changes['status'], [None, self.new.pk])
+
+    def test_update_records_changed_fields_only(self):
+        self.task.name = 'Renamed'
+        self.task.status = self.done
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.save()
+        entry = AuditEntry.objects.get(task_id=self.task.pk)
+        self.assertEqual(entry.action, AuditEntry.Action.UPDATE)
+        self.assertEqual(entry.model, 'tasks.Task')
+        self.assertEqual(entry.changes, {'name': ['Task', 'Renamed'], 'status': [self.new.pk, self.done.pk]})
+
+    def test_unchanged_save_records_nothing(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.save()
+        self.assertFalse(AuditEntry.objects.exists())
+
+    def test_untracked_update_fields_skip_the_lookup(self):
+        # e.g. the last_login update on every login
+        with self.assertNumQueries(1):
+            self.user.save(update_fields=['last_login'])
+
+    def test_delete_records_last_values(self):
+        pk = self.done.pk
+        with self.captureOnCommitCallbacks(execute=True):
+            self.done.delete()
+        entry = AuditEntry.objects.get(model='statuses.Status')
+        self.assertEqual(entry.action, AuditEntry.Action.DELETE)
+        self.assertEqual(entry.object_id, pk)
+        self.assertIsNone(entry.task_id)
+        self.assertEqual(entry.changes, {'name': ['Done', None]})
+
+    def test_user_changes_are_recorded(self):
+        self.user.email = 'u1@example.com'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+        entry = AuditEntry.objects.get(model='auth.User')
+        self.assertEqual(entry.changes, {'email': ['', 'u1@example.com']})
+
+    def test_rolled_back_changes_are_not_recorded(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    self.task.name = 'Never'
+                    self.task.save()
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        self.assertFalse(AuditEntry.objects.exists())
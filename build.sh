@@ -8,6 +8,10 @@ source "$HOME/.local/bin/env"
 # здесь добавьте все необходимые команды для установки вашего проекта
 # команду установки зависимостей, сборки статики, применения миграций и другие
 uv sync
+uv run python manage.py check_translations
 uv run python manage.py compilemessages
+uv run python manage.py build_bootstrap_subset
 uv run python manage.py collectstatic --noinput
+uv run python manage.py check_static_manifest
 uv run python manage.py migrate
+uv run python manage.py create_audit_partitions
@@ -0,0 +1,67 @@
+"""Gunicorn configuration; every setting can be overridden from the environment.
+
+    uv run gunicorn task_manager.wsgi:application -c gunicorn.conf.py
+"""
+import multiprocessing
+import os
+from pathlib import Path
+
+if (Path(__file__).parent / '.env').exists():
+    from dotenv import load_dotenv
+
+    load_dotenv(Path(__file__).parent / '.env')
+
+bind = os.getenv('GUNICORN_BIND', f'0.0.0.0:{os.getenv("PORT", "8000")}')
+
+# Threaded workers by default: streamed responses and slow clients don't tie
+# up a whole process, and threads share one copy of the application.
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+# Gunicorn turns sync workers into gthread ones when threads > 1
+threads = int(os.getenv('GUNICORN_THREADS', '4' if worker_class == 'gthread' else '1'))
+# Each thread keeps its own database connection (see CONN_MAX_AGE in
+# settings), so with threads one process per core is enough: workers * threads
+# connections per instance, e.g. 9 * 4 = 36 on 8 cores rather than 17 * 4 = 68.
+default_workers = multiprocessing.cpu_count() + 1 if threads > 1 else multiprocessing.cpu_count() * 2 + 1
+workers = int(os.getenv('WEB_CONCURRENCY', default_workers))
+
+# Import the application once in the master; workers share its memory pages
+preload_app = os.getenv('GUNICORN_PRELOAD', 'True') == 'True'
+
+# Recycle workers to bound memory growth; jitter keeps them from restarting together
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '1000'))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', '100'))
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '30'))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', '5'))
+
+# Heartbeat files on tmpfs, so a slow disk can't make workers look dead
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+accesslog = os.getenv('GUNICORN_ACCESSLOG', '-')
+loglevel = os.getenv('GUNICORN_LOGLEVEL', 'info')
+
+warmup = os.getenv('GUNICORN_WARMUP', 'True') == 'True'
+
+
+def pre_fork(server, worker):
+    # Never share the master's database connections with the workers
+    if preload_app:
+        from django.db import connections
+
+        connections.close_all()
+
+
+def post_worker_init(worker):
+    """Warm the worker up once the application is loaded, before it accepts requests."""
+    if not warmup:
+        return
+    from task_manager.warmup import warm_up
+
+    # Threaded workers open a database connection in each request thread
+    timings = warm_up(getattr(worker, 'tpool', None), worker.cfg.threads)
+    worker.log.info(
+        'Worker warmed up: %s',
+        ', '.join(f'{name} {seconds * 1000:.0f} ms' for name, seconds in timings.items()),
+    )
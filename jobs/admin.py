@@ -0,0 +1,12 @@
+from django.contrib import admin
+
+from task_manager.admin_helpers import LargeTableAdmin
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(LargeTableAdmin):
+    list_display = ('id', 'name', 'status', 'attempts', 'run_at', 'created_at', 'finished_at')
+    list_filter = ('status',)
+    search_fields = ('name',)
+    readonly_fields = ('locked_by', 'locked_until', 'started_at', 'finished_at', 'created_at')
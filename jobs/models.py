@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+
+class Job(models.Model):
+    class Status(models.TextChoices):
+        QUEUED = 'queued', _('Queued')
+        RUNNING = 'running', _('Running')
+        SUCCEEDED = 'succeeded', _('Succeeded')
+        FAILED = 'failed', _('Failed')
+
+    # Dotted path to the callable, e.g. 'tasks.jobs.rebalance'
+    name = models.CharField(_('Name'), max_length=255)
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+    status = models.CharField(_('Status'), max_length=16, choices=Status.choices, default=Status.QUEUED)
+    attempts = models.PositiveIntegerField(_('Attempts'), default=0)
+    max_attempts = models.PositiveIntegerField(_('Max attempts'), default=3)
+    run_at = models.DateTimeField(_('Run at'), default=timezone.now)
+    result = models.JSONField(null=True, blank=True)
+    last_error = models.TextField(_('Last error'), blank=True)
+    locked_by = models.CharField(max_length=255, blank=True)
+    # Lease of a running job, renewed by its worker; once expired the job is requeued
+    locked_until = models.DateTimeField(blank=True, null=True)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        related_name='jobs',
+        blank=True,
+        null=True,
+    )
+
+    created_at = models.DateTimeField(_('Created'), auto_now_add=True)
+    started_at = models.DateTimeField(_('Started'), blank=True, null=True)
+    finished_at = models.DateTimeField(_('Finished'), blank=True, null=True)
+
+    class Meta:
+        verbose_name = _('Job')
+        verbose_name_plural = _('Jobs')
+        ordering = ('-created_at', '-id')
+        indexes = [
+            # Workers poll for the oldest ready job: status = 'queued' AND run_at <= now()
+            models.Index(fields=('status', 'run_at'), name='jobs_job_status_run_at_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.name} #{self.pk}'
+
+    @property
+    def is_finished(self):
+        return self.status in (self.Status.SUCCEEDED, self.Status.FAILED)
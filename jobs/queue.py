@@ -0,0 +1,161 @@
+"""Database-backed job queue.
+
+The jobs table doubles as the broker: producers insert rows with ``enqueue``,
+workers claim them with ``claim_next`` and execute them with ``run_job``.
+On PostgreSQL claims use ``SELECT ... FOR UPDATE SKIP LOCKED`` so concurrent
+workers never block on each other; on SQLite (no row locks) a conditional
+``UPDATE ... WHERE status = 'queued'`` makes the claim atomic instead.
+A claimed job is leased to its worker for JOBS_STALE_TIMEOUT seconds; the
+worker renews the lease while it is alive (``renew_leases``) and jobs whose
+lease expired are put back in the queue (``requeue_stale``).
+"""
+import json
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.db.models.functions import Least
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Job
+
+
+def _callable_path(func):
+    if isinstance(func, str):
+        return func
+    return f'{func.__module__}.{func.__qualname__}'
+
+
+def enqueue(func, args=(), kwargs=None, *, run_at=None, max_attempts=None, created_by=None):
+    """Schedule ``func(*args, **kwargs)`` to run in a worker and return the Job.
+
+    ``func`` is a module-level callable or its dotted path; arguments must be
+    JSON-serialisable.
+    """
+    return Job.objects.create(
+        name=_callable_path(func),
+        args=list(args),
+        kwargs=kwargs or {},
+        run_at=run_at or timezone.now(),
+        max_attempts=max_attempts or settings.JOBS_MAX_ATTEMPTS,
+        created_by=created_by,
+    )
+
+
+def enqueue_once(func, args=(), kwargs=None, *, run_at=None, **options):
+    """Like ``enqueue`` but reuse an identical job that is still waiting to run.
+
+    The reused job runs no later than ``run_at``: a job waiting for a later
+    moment (e.g. a retry after a backoff) is moved forward.
+    """
+    run_at = run_at or timezone.now()
+    pending = Job.objects.filter(
+        name=_callable_path(func),
+        args=list(args),
+        kwargs=kwargs or {},
+        status=Job.Status.QUEUED,
+    ).order_by('run_at', 'id').first()
+    if pending is None:
+        return enqueue(func, args, kwargs, run_at=run_at, **options)
+    if pending.run_at > run_at:
+        # Conditional, in case a worker claimed the job meanwhile
+        moved = Job.objects.filter(pk=pending.pk, status=Job.Status.QUEUED).update(run_at=Least(F('run_at'), run_at))
+        if not moved:
+            return enqueue(func, args, kwargs, run_at=run_at, **options)
+        pending.run_at = run_at
+    return pending
+
+
+def retry_delay(attempts):
+    """Exponential backoff before the next attempt, capped by JOBS_RETRY_BACKOFF_MAX."""
+    delay = settings.JOBS_RETRY_BACKOFF * 2 ** max(attempts - 1, 0)
+    return timedelta(seconds=min(delay, settings.JOBS_RETRY_BACKOFF_MAX))
+
+
+def lease_end(now=None):
+    return (now or timezone.now()) + timedelta(seconds=settings.JOBS_STALE_TIMEOUT)
+
+
+def claim_next(worker_id=''):
+    """Atomically mark the oldest ready job as running and return it (or None)."""
+    now = timezone.now()
+    ready = Job.objects.filter(status=Job.Status.QUEUED, run_at__lte=now).order_by('run_at', 'id')
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            job = ready.select_for_update(skip_locked=True).first()
+            if job is None:
+                return None
+            job.status = Job.Status.RUNNING
+            job.attempts += 1
+            job.locked_by = worker_id
+            job.locked_until = lease_end(now)
+            job.started_at = now
+            job.save(update_fields=['status', 'attempts', 'locked_by', 'locked_until', 'started_at'])
+            return job
+
+    # SQLite fallback: whoever flips the status first owns the job.
+    for pk in ready.values_list('pk', flat=True)[:10]:
+        claimed = Job.objects.filter(pk=pk, status=Job.Status.QUEUED).update(
+            status=Job.Status.RUNNING,
+            attempts=F('attempts') + 1,
+            locked_by=worker_id,
+            locked_until=lease_end(now),
+            started_at=now,
+        )
+        if claimed:
+            return Job.objects.get(pk=pk)
+    return None
+
+
+def run_job(job):
+    """Execute a claimed job and record success, a scheduled retry or failure."""
+    try:
+        result = import_string(job.name)(*job.args, **job.kwargs)
+    except Exception:
+        job.last_error = traceback.format_exc()
+        if job.attempts < job.max_attempts:
+            job.status = Job.Status.QUEUED
+            job.run_at = timezone.now() + retry_delay(job.attempts)
+        else:
+            job.status = Job.Status.FAILED
+            job.finished_at = timezone.now()
+    else:
+        try:
+            json.dumps(result)
+        except (TypeError, ValueError):
+            result = repr(result)
+        job.result = result
+        job.status = Job.Status.SUCCEEDED
+        job.finished_at = timezone.now()
+    job.locked_by = ''
+    job.locked_until = None
+    job.save(update_fields=['status', 'run_at', 'result', 'last_error', 'locked_by', 'locked_until', 'finished_at'])
+    return job
+
+
+def renew_leases(worker_id, job_ids):
+    """Extend the lease of the jobs ``worker_id`` is still running."""
+    return Job.objects.filter(pk__in=job_ids, status=Job.Status.RUNNING, locked_by=worker_id).update(
+        locked_until=lease_end(),
+    )
+
+
+def requeue_stale(worker_id=''):
+    """Return jobs left running by a crashed worker to the queue.
+
+    That is running jobs whose lease expired, plus those still locked by
+    ``worker_id``: a worker starting up under the id of a previous one (same
+    host and pid, as in containers) isn't running them any more.
+    """
+    stale = Q(locked_until__lt=timezone.now()) | Q(locked_until__isnull=True)
+    if worker_id:
+        stale |= Q(locked_by=worker_id)
+    return Job.objects.filter(stale, status=Job.Status.RUNNING).update(
+        status=Job.Status.QUEUED,
+        locked_by='',
+        locked_until=None,
+    )
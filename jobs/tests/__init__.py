@@ -0,0 +1 @@
+# tests package for jobs app
@@ -0,0 +1,16 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from jobs.models import Job
+from jobs.queue import enqueue
+
+
+class RunWorkerCommandTests(TestCase):
+    def test_burst_run_processes_queue_and_exits(self):
+        enqueue('jobs.tests.test_queue.add', args=(1, 2))
+        out = StringIO()
+        call_command('run_worker', '--burst', '--concurrency', '1', stdout=out)
+        self.assertIn('Worker stopped', out.getvalue())
+        self.assertEqual(Job.objects.get().status, Job.Status.SUCCEEDED)
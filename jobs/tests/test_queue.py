@@ -0,0 +1,130 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.queue import claim_next, enqueue, enqueue_once, renew_leases, requeue_stale, retry_delay, run_job
+from jobs.worker import Worker
+
+
+def add(a, b):
+    return a + b
+
+
+def explode():
+    raise RuntimeError('boom')
+
+
+@override_settings(JOBS_RETRY_BACKOFF=10, JOBS_RETRY_BACKOFF_MAX=60)
+class JobQueueTests(TestCase):
+    def test_enqueue_accepts_callable_and_path(self):
+        job1 = enqueue(add, args=(1, 2))
+        job2 = enqueue('jobs.tests.test_queue.add', kwargs={'a': 1, 'b': 2})
+        self.assertEqual(job1.name, 'jobs.tests.test_queue.add')
+        self.assertEqual(job2.name, job1.name)
+        self.assertEqual(job1.status, Job.Status.QUEUED)
+
+    def test_enqueue_once_reuses_pending_job(self):
+        job = enqueue_once(add, args=(1, 2))
+        self.assertEqual(enqueue_once(add, args=(1, 2)).pk, job.pk)
+        self.assertNotEqual(enqueue_once(add, args=(2, 3)).pk, job.pk)
+
+    def test_enqueue_once_moves_a_later_job_forward(self):
+        now = timezone.now()
+        job = enqueue_once(add, args=(1, 2), run_at=now + timedelta(hours=1))
+        self.assertEqual(enqueue_once(add, args=(1, 2), run_at=now + timedelta(hours=2)).pk, job.pk)
+        job.refresh_from_db()
+        self.assertEqual(job.run_at, now + timedelta(hours=1))
+
+        self.assertEqual(enqueue_once(add, args=(1, 2), run_at=now).pk, job.pk)
+        job.refresh_from_db()
+        self.assertEqual(job.run_at, now)
+        self.assertEqual(Job.objects.count(), 1)
+
+    def test_enqueue_once_without_run_at_is_due_now(self):
+        job = enqueue_once(add, args=(1, 2), run_at=timezone.now() + timedelta(hours=1))
+        enqueue_once(add, args=(1, 2))
+        job.refresh_from_db()
+        self.assertLessEqual(job.run_at, timezone.now())
+        self.assertEqual(claim_next().pk, job.pk)
+
+    def test_claim_skips_future_and_claimed_jobs(self):
+        enqueue(add, args=(1, 1), run_at=timezone.now() + timedelta(hours=1))
+        ready = enqueue(add, args=(2, 2))
+        claimed = claim_next('w1')
+        self.assertEqual(claimed.pk, ready.pk)
+        self.assertEqual(claimed.status, Job.Status.RUNNING)
+        self.assertEqual(claimed.attempts, 1)
+        self.assertEqual(claimed.locked_by, 'w1')
+        self.assertIsNone(claim_next('w2'))
+
+    def test_run_job_success_stores_result(self):
+        enqueue(add, args=(2, 3))
+        job = run_job(claim_next())
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.SUCCEEDED)
+        self.assertEqual(job.result, 5)
+        self.assertIsNotNone(job.finished_at)
+
+    def test_failure_is_retried_with_backoff_then_failed(self):
+        enqueue(explode, max_attempts=2)
+        job = run_job(claim_next())
+        self.assertEqual(job.status, Job.Status.QUEUED)
+        self.assertIn('boom', job.last_error)
+        self.assertGreater(job.run_at, timezone.now())
+
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        job = run_job(claim_next())
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertEqual(job.attempts, 2)
+
+    def test_retry_delay_is_exponential_and_capped(self):
+        self.assertEqual(retry_delay(1), timedelta(seconds=10))
+        self.assertEqual(retry_delay(2), timedelta(seconds=20))
+        self.assertEqual(retry_delay(3), timedelta(seconds=40))
+        self.assertEqual(retry_delay(10), timedelta(seconds=60))
+
+    def test_requeue_stale_running_jobs(self):
+        enqueue(add, args=(1, 1))
+        job = claim_next('w1')
+        self.assertEqual(requeue_stale('w2'), 0)
+        Job.objects.filter(pk=job.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(requeue_stale('w2'), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_by, job.locked_until), (Job.Status.QUEUED, '', None))
+
+    def test_requeue_stale_takes_back_jobs_of_a_previous_worker_with_the_same_id(self):
+        enqueue(add, args=(1, 1))
+        claim_next('host:1')
+        self.assertEqual(requeue_stale('host:1'), 1)
+
+    def test_renew_leases_of_running_jobs(self):
+        enqueue(add, args=(1, 1))
+        job = claim_next('w1')
+        Job.objects.filter(pk=job.pk).update(locked_until=timezone.now())
+        self.assertEqual(renew_leases('w2', [job.pk]), 0)
+        self.assertEqual(renew_leases('w1', [job.pk]), 1)
+        job.refresh_from_db()
+        self.assertGreater(job.locked_until, timezone.now() + timedelta(seconds=60))
+
+    def test_worker_burst_drains_queue(self):
+        for i in range(3):
+            enqueue(add, args=(i, i))
+        Worker(concurrency=1).run(burst=True)
+        self.assertEqual(Job.objects.filter(status=Job.Status.SUCCEEDED).count(), 3)
+
+    def test_worker_keeps_going_after_a_database_error(self):
+        enqueue(add, args=(1, 1))
+        claims = [DatabaseError('gone'), claim_next('w1'), None]
+        with mock.patch('jobs.worker.claim_next', side_effect=claims), self.assertLogs('jobs.worker', 'ERROR'):
+            Worker(concurrency=1, poll_interval=0).run(burst=True)
+        self.assertEqual(Job.objects.get().status, Job.Status.SUCCEEDED)
+
+    def test_fatal_errors_in_worker_threads_stop_the_worker(self):
+        worker = Worker(concurrency=2)
+        with mock.patch.object(worker, '_loop', side_effect=RuntimeError('fatal')), self.assertRaises(RuntimeError):
+            worker.run()
+        self.assertTrue(worker.stop_event.is_set())
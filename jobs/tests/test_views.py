@@ -0,0 +1,41 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from jobs.queue import enqueue
+
+
+class JobViewsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(username='u1', password='pass12345')
+        cls.other = User.objects.create_user(username='u2', password='pass12345')
+        cls.job = enqueue('jobs.tests.test_queue.add', args=(1, 2), created_by=cls.user)
+
+    def test_list_requires_login(self):
+        resp = self.client.get(reverse('jobs:list'))
+        self.assertEqual(resp.status_code, 302)
+        self.assertIn(reverse('login'), resp.url)
+
+    def test_list_shows_own_jobs_only(self):
+        self.client.login(username='u1', password='pass12345')
+        resp = self.client.get(reverse('jobs:list'))
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(list(resp.context['jobs']), [self.job])
+
+        self.client.login(username='u2', password='pass12345')
+        resp = self.client.get(reverse('jobs:list'))
+        self.assertEqual(list(resp.context['jobs']), [])
+
+    def test_detail_status_page(self):
+        self.client.login(username='u1', password='pass12345')
+        resp = self.client.get(reverse('jobs:detail', args=[self.job.pk]))
+        self.assertEqual(resp.status_code, 200)
+        self.assertTemplateUsed(resp, 'jobs/detail.html')
+        self.assertContains(resp, self.job.name)
+
+    def test_detail_of_foreign_job_is_404(self):
+        self.client.login(username='u2', password='pass12345')
+        resp = self.client.get(reverse('jobs:detail', args=[self.job.pk]))
+        self.assertEqual(resp.status_code, 404)
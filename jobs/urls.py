@@ -0,0 +1,10 @@
+from django.urls import path
+from .views import JobListView, JobDetailView, JobFileView
+
+app_name = 'jobs'
+
+urlpatterns = [
+    path('', JobListView.as_view(), name='list'),
+    path('<int:pk>/', JobDetailView.as_view(), name='detail'),
+    path('<int:pk>/file/', JobFileView.as_view(), name='file'),
+]
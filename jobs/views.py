@@ -0,0 +1,48 @@
+from pathlib import PurePath
+
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.files.storage import default_storage
+from django.http import Http404
+from django.views.generic import ListView, DetailView
+
+from task_manager.downloads import serve_file
+from .models import Job
+
+
+class OwnJobsMixin(LoginRequiredMixin):
+    """Users see the jobs they started; superusers see every job."""
+
+    def get_queryset(self):
+        queryset = Job.objects.all()
+        if not self.request.user.is_superuser:
+            queryset = queryset.filter(created_by=self.request.user)
+        return queryset
+
+
+class JobListView(OwnJobsMixin, ListView):
+    model = Job
+    template_name = 'jobs/list.html'
+    context_object_name = 'jobs'
+    paginate_by = 50
+
+    def get_queryset(self):
+        return super().get_queryset().defer('args', 'kwargs', 'result', 'last_error')
+
+
+class JobDetailView(OwnJobsMixin, DetailView):
+    model = Job
+    template_name = 'jobs/detail.html'
+    context_object_name = 'job'
+
+
+class JobFileView(OwnJobsMixin, DetailView):
+    """Download the file a job produced, named by its ``{'file': ...}`` result."""
+    model = Job
+    http_method_names = ['get', 'head', 'options']
+
+    def get(self, request, *args, **kwargs):
+        job = self.get_object()
+        name = job.result.get('file') if isinstance(job.result, dict) else None
+        if not name or not default_storage.exists(name):
+            raise Http404
+        return serve_file(request, default_storage.path(name), PurePath(name).name, storage_name=name)
@@ -0,0 +1,98 @@
+import logging
+import os
+import socket
+import threading
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+
+from .queue import claim_next, renew_leases, requeue_stale, run_job
+
+logger = logging.getLogger(__name__)
+
+
+class Worker:
+    """Poll the jobs table and execute ready jobs on a pool of threads."""
+
+    def __init__(self, concurrency=1, poll_interval=1.0):
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = poll_interval
+        self.worker_id = f'{socket.gethostname()}:{os.getpid()}'
+        self.stop_event = threading.Event()
+        self.heartbeat_stop = threading.Event()
+        # Ids of the jobs being run right now, whose leases the heartbeat renews
+        self.running = set()
+
+    def process_one(self):
+        """Claim and run a single job in the current thread. Return False if the queue is empty."""
+        job = claim_next(self.worker_id)
+        if job is None:
+            return False
+        logger.info('Running job %s (attempt %s)', job, job.attempts)
+        self.running.add(job.pk)
+        try:
+            run_job(job)
+        finally:
+            self.running.discard(job.pk)
+        logger.info('Job %s finished with status %s', job, job.status)
+        return True
+
+    def _loop(self, burst):
+        while not self.stop_event.is_set():
+            close_old_connections()
+            try:
+                if self.process_one():
+                    continue
+            except Exception:
+                # E.g. the database went away: drop a broken connection and try again
+                logger.exception('Worker %s failed to process a job', self.worker_id)
+                close_old_connections()
+            else:
+                if burst:
+                    return
+            self.stop_event.wait(self.poll_interval)
+
+    def _thread_loop(self, burst):
+        try:
+            self._loop(burst)
+        finally:
+            # Each pool thread owns its own connection; don't leak it.
+            connection.close()
+
+    def _heartbeat(self):
+        """Renew the leases of our running jobs and requeue those of dead workers."""
+        try:
+            while not self.heartbeat_stop.wait(settings.JOBS_STALE_TIMEOUT / 3):
+                try:
+                    renew_leases(self.worker_id, list(self.running))
+                    requeue_stale()
+                except Exception:
+                    logger.exception('Worker %s failed to renew its leases', self.worker_id)
+                    close_old_connections()
+        finally:
+            connection.close()
+
+    def run(self, burst=False):
+        """Process jobs until stopped; with ``burst`` exit once the queue is drained."""
+        requeue_stale(self.worker_id)
+        heartbeat = threading.Thread(target=self._heartbeat, name='job-worker-heartbeat', daemon=True)
+        heartbeat.start()
+        try:
+            if self.concurrency == 1:
+                self._loop(burst)
+                return
+            with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='job-worker') as pool:
+                futures = [pool.submit(self._thread_loop, burst) for _ in range(self.concurrency)]
+                done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+                # A loop only raises on errors it can't recover from: stop the
+                # other threads and let the exception end the process.
+                self.stop_event.set()
+                for future in done:
+                    future.result()
+        finally:
+            self.heartbeat_stop.set()
+            heartbeat.join()
+
+    def stop(self, *args):
+        self.stop_event.set()
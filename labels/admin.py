@@ -0,0 +1,9 @@
+from django.contrib import admin
+
+from .models import Label
+
+
+@admin.register(Label)
+class LabelAdmin(admin.ModelAdmin):
+    list_display = ('id', 'name')
+    search_fields = ('name',)
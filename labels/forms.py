@@ -0,0 +1,9 @@
+from django import forms
+from django.utils.translation import gettext_lazy as _
+from .models import Label
+
+class LabelForm(forms.ModelForm):
+    class Meta:
+        model = Label
+        fields = ('name',)
+        labels = {'name': _('Name')}
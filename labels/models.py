@@ -0,0 +1,13 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+class Label(models.Model):
+    name = models.CharField(_('Name'), max_length=255, unique=True)
+
+    class Meta:
+        verbose_name = _('Label')
+        verbose_name_plural = _('Labels')
+        ordering = ('name',)  # default ordering for lists
+
+    def __str__(self):
+        return self.name
@@ -0,0 +1,40 @@
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import ProtectedError
+from django.test import TestCase
+
+from labels.models import Label
+from statuses.models import Status
+from tasks.models import Task, TaskLabel
+
+
+class LabelModelTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username='u1')
+        cls.status = Status.objects.create(name='New')
+        cls.label = Label.objects.create(name='bug')
+        cls.task = Task.objects.create(name='T', status=cls.status, author=cls.user)
+
+    def test_str_returns_name(self):
+        self.assertEqual(str(self.label), 'bug')
+
+    def test_name_is_unique(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Label.objects.create(name='bug')
+
+    def test_label_once_per_task(self):
+        self.task.labels.add(self.label)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            TaskLabel.objects.create(task=self.task, label=self.label)
+
+    def test_label_in_use_is_protected(self):
+        self.task.labels.add(self.label)
+        with self.assertRaises(ProtectedError):
+            self.label.delete()
+
+    def test_deleting_task_removes_its_labels(self):
+        self.task.labels.add(self.label)
+        self.task.delete()
+        self.assertFalse(TaskLabel.objects.exists())
+        self.assertTrue(Label.objects.filter(pk=self.label.pk).exists())
@@ -0,0 +1,69 @@
+from django.contrib.auth import get_user_model
+from django.contrib.messages import get_messages
+from django.contrib.messages.constants import ERROR, SUCCESS
+from django.test import TestCase
+from django.urls import reverse
+
+from labels.models import Label
+from statuses.models import Status
+from tasks.models import Task
+
+
+class LabelCRUDTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username='user', password='pass12345')
+        cls.status = Status.objects.create(name='New')
+        cls.bug = Label.objects.create(name='bug')
+        cls.feature = Label.objects.create(name='feature')
+        cls.task = Task.objects.create(name='T', status=cls.status, author=cls.user)
+        cls.task.labels.add(cls.bug)
+
+    def setUp(self):
+        self.client.login(username='user', password='pass12345')
+
+    def test_list_requires_login(self):
+        self.client.logout()
+        resp = self.client.get(reverse('labels:list'))
+        self.assertRedirects(resp, f"{reverse('login')}?next={reverse('labels:list')}")
+
+    def test_list_shows_task_counts_in_one_query(self):
+        Task.objects.create(name='T2', status=self.status, author=self.user).labels.add(self.bug)
+        # user, then the labels with their counts, the navbar's "my work" count (uncached in tests)
+        with self.assertNumQueries(3):
+            resp = self.client.get(reverse('labels:list'))
+        counts = {label.name: label.task_count for label in resp.context['labels']}
+        self.assertEqual(counts, {'bug': 2, 'feature': 0})
+        self.assertContains(resp, f'?label={self.bug.pk}')
+
+    def test_create(self):
+        resp = self.client.post(reverse('labels:create'), {'name': 'urgent'})
+        self.assertRedirects(resp, reverse('labels:list'))
+        self.assertTrue(Label.objects.filter(name='urgent').exists())
+        self.assertTrue(any(m.level == SUCCESS for m in get_messages(resp.wsgi_request)))
+
+    def test_create_duplicate_name(self):
+        resp = self.client.post(reverse('labels:create'), {'name': 'bug'})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(Label.objects.filter(name='bug').count(), 1)
+
+    def test_update(self):
+        resp = self.client.post(reverse('labels:update', args=[self.feature.pk]), {'name': 'enhancement'})
+        self.assertRedirects(resp, reverse('labels:list'))
+        self.feature.refresh_from_db()
+        self.assertEqual(self.feature.name, 'enhancement')
+
+    def test_delete_unused(self):
+        resp = self.client.post(reverse('labels:delete', args=[self.feature.pk]))
+        self.assertRedirects(resp, reverse('labels:list'))
+        self.assertFalse(Label.objects.filter(pk=self.feature.pk).exists())
+
+    def test_delete_in_use_is_refused(self):
+        resp = self.client.post(reverse('labels:delete', args=[self.bug.pk]))
+        self.assertRedirects(resp, reverse('labels:list'))
+        self.assertTrue(Label.objects.filter(pk=self.bug.pk).exists())
+        self.assertTrue(any(m.level == ERROR for m in get_messages(resp.wsgi_request)))
+
+    def test_delete_http_method_is_not_allowed(self):
+        resp = self.client.delete(reverse('labels:delete', args=[self.feature.pk]))
+        self.assertEqual(resp.status_code, 405)
@@ -0,0 +1,58 @@
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.views.generic import ListView, CreateView, UpdateView, DeleteView
+from django.urls import reverse_lazy
+from django.contrib import messages
+from django.utils.translation import gettext_lazy as _
+from django.db.models import Count, ProtectedError
+from django.shortcuts import redirect
+
+from .models import Label
+from .forms import LabelForm
+
+class LabelListView(LoginRequiredMixin, ListView):
+    template_name = 'labels/list.html'
+    context_object_name = 'labels'
+
+    def get_queryset(self):
+        # One grouped query over the through table instead of a count per label
+        return Label.objects.annotate(task_count=Count('tasks'))
+
+class LabelCreateView(LoginRequiredMixin, CreateView):
+    model = Label
+    form_class = LabelForm
+    template_name = 'labels/create.html'
+    success_url = reverse_lazy('labels:list')
+    # Disallow unsupported methods (PUT/DELETE)
+    http_method_names = ['get', 'post', 'head', 'options']
+
+    def form_valid(self, form):
+        messages.success(self.request, _('Label created successfully'))
+        return super().form_valid(form)
+
+class LabelUpdateView(LoginRequiredMixin, UpdateView):
+    model = Label
+    form_class = LabelForm
+    template_name = 'labels/update.html'
+    success_url = reverse_lazy('labels:list')
+    # Disallow unsupported methods (PUT/DELETE)
+    http_method_names = ['get', 'post', 'head', 'options']
+
+    def form_valid(self, form):
+        messages.success(self.request, _('Label updated successfully'))
+        return super().form_valid(form)
+
+class LabelDeleteView(LoginRequiredMixin, DeleteView):
+    model = Label
+    template_name = 'labels/delete.html'
+    success_url = reverse_lazy('labels:list')
+    # Disallow HTTP DELETE so client.delete(...) returns 405; keep POST for controlled deletion
+    http_method_names = ['get', 'post', 'head', 'options']
+
+    def post(self, request, *args, **kwargs):
+        self.object = self.get_object()
+        try:
+            self.object.delete()
+            messages.success(request, _('Label deleted successfully'))
+        except ProtectedError:
+            messages.error(request, _('Label cannot be deleted because it is in use'))
+        return redirect(self.success_url)
@@ -0,0 +1,122 @@
+"""Email users about changes to their tasks, a digest per recipient and window.
+
+``notify_task_change`` is called by the task views. Once the change
+commits, it stores one Notification per recipient who wants it. Each
+Notification is due at the end of its recipient's digest window. Windows
+are aligned to the clock (every 5 minutes, on the hour, at midnight UTC),
+so everyone with the same window is due at the same moments. A single
+``send_due_digests`` job is queued per moment. It sends one email per
+recipient with everything due, over one mail connection, in batches of
+NOTIFICATION_DIGEST_BATCH_SIZE recipients, and deletes what it sent.
+"""
+import datetime
+from itertools import groupby
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.db import transaction
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.translation import gettext
+
+from jobs.queue import enqueue_once
+from .models import Notification, NotificationSettings
+
+
+def window_end(moment, window):
+    """Return the end of the ``window``-second slot (counted from the Unix epoch) that ``moment`` is in."""
+    slot = int(moment.timestamp()) // window + 1
+    return datetime.datetime.fromtimestamp(slot * window, tz=datetime.UTC)
+
+
+def notify_task_change(task, actor, assigned=False, status_changed=False):
+    """Notify the people concerned about ``task`` once the current transaction commits.
+
+    ``assigned``: the task got a new executor (or was created with one),
+    who is told. ``status_changed``: its status changed, which the executor
+    and the author are told. Nobody is told about their own changes.
+    """
+    events = {}
+    if status_changed:
+        for user_id in (task.author_id, task.executor_id):
+            events[user_id] = Notification.Kind.STATUS
+    if assigned:
+        # Being assigned says more than the status the task came with
+        events[task.executor_id] = Notification.Kind.ASSIGNED
+    events.pop(None, None)
+    events.pop(actor.pk, None)
+    if not events:
+        return
+    task_id, status_id, actor_id = task.pk, task.status_id, actor.pk
+    transaction.on_commit(lambda: queue_notifications(task_id, status_id, actor_id, events))
+
+
+def queue_notifications(task_id, status_id, actor_id, events):
+    """Store the notifications ``events`` ({recipient id: kind}) that their recipients want and schedule them."""
+    now = timezone.now()
+    preferences = NotificationSettings.for_users(list(events))
+    notifications = [
+        Notification(
+            recipient_id=recipient_id,
+            kind=kind,
+            task_id=task_id,
+            status_id=status_id if kind == Notification.Kind.STATUS else None,
+            actor_id=actor_id,
+            due_at=window_end(now, preferences[recipient_id].window),
+        )
+        for recipient_id, kind in events.items()
+        if preferences[recipient_id].wants(kind)
+    ]
+    Notification.objects.bulk_create(notifications)
+    for due_at in {notification.due_at for notification in notifications}:
+        # One job per moment, however many changes fall before it
+        enqueue_once(send_due_digests, kwargs={'due': due_at.isoformat()}, run_at=due_at)
+
+
+def digest_message(recipient, notifications, connection=None):
+    context = {
+        'recipient': recipient,
+        'notifications': notifications,
+        'site_url': settings.SITE_URL,
+    }
+    return mail.EmailMessage(
+        subject=gettext('Task Manager: updates on your tasks'),
+        body=render_to_string('notifications/digest.txt', context),
+        to=[recipient.email],
+        connection=connection,
+    )
+
+
+def send_due_digests(due):
+    """Job: email each recipient the notifications due by ``due`` (ISO 8601); return the number of emails."""
+    due = datetime.datetime.fromisoformat(due)
+    users = get_user_model().objects
+    sent = 0
+    with mail.get_connection() as connection:
+        while True:
+            with transaction.atomic():
+                recipient_ids = list(
+                    Notification.objects.filter(due_at__lte=due)
+                    .order_by().values_list('recipient_id', flat=True).distinct()[:settings.NOTIFICATION_DIGEST_BATCH_SIZE]
+                )
+                if not recipient_ids:
+                    return sent
+                # Locked, so a job for a later moment running meanwhile doesn't send them too
+                notifications = list(
+                    Notification.objects.select_for_update()
+                    .filter(due_at__lte=due, recipient_id__in=recipient_ids)
+                    .select_related('task', 'actor', 'status')
+                    .order_by('recipient_id', 'created_at')
+                )
+                recipients = users.in_bulk(recipient_ids)
+                messages = [
+                    digest_message(recipients[recipient_id], list(group), connection)
+                    for recipient_id, group in groupby(notifications, key=lambda notification: notification.recipient_id)
+                    # Without an address there is nowhere to send them; they are dropped
+                    if recipients[recipient_id].email
+                ]
+                # A failure rolls back and the job is retried
+                connection.send_messages(messages)
+                Notification.objects.filter(pk__in=[notification.pk for notification in notifications]).delete()
+            sent += len(messages)
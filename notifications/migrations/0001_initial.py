@@ -0,0 +1,48 @@
+# Generated by Django 6.0 on 2026-10-19 17:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('statuses', '0002_status_is_closed'),
+        ('tasks', '0008_due_date_priority'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationSettings',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='notification_settings', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('on_assignment', models.BooleanField(default=True, verbose_name='When a task is assigned to me')),
+                ('on_status_change', models.BooleanField(default=True, verbose_name='When the status of my task changes')),
+                ('window', models.PositiveIntegerField(choices=[(300, 'At most every 5 minutes'), (3600, 'At most once an hour'), (86400, 'At most once a day')], default=300, verbose_name='Digest emails')),
+            ],
+            options={
+                'verbose_name': 'Notification settings',
+                'verbose_name_plural': 'Notification settings',
+            },
+        ),
+        migrations.CreateModel(
+            name='Notification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('assigned', 'Assigned'), ('status', 'Status changed')], max_length=16)),
+                ('due_at', models.DateTimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('recipient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to=settings.AUTH_USER_MODEL)),
+                ('status', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='statuses.status')),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='tasks.task')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['due_at', 'recipient'], name='notifications_due_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,82 @@
+from django.conf import settings
+from django.db import models
+from django.utils.translation import gettext, gettext_lazy as _
+
+
+class NotificationSettings(models.Model):
+    """A user's choice of what to be emailed about and how often.
+
+    Users without a row get the field defaults (see ``for_users``).
+    """
+
+    class Window(models.IntegerChoices):
+        # Seconds
+        FIVE_MINUTES = 300, _('At most every 5 minutes')
+        HOUR = 3600, _('At most once an hour')
+        DAY = 86400, _('At most once a day')
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name='notification_settings',
+    )
+    on_assignment = models.BooleanField(_('When a task is assigned to me'), default=True)
+    on_status_change = models.BooleanField(_('When the status of my task changes'), default=True)
+    window = models.PositiveIntegerField(_('Digest emails'), choices=Window, default=Window.FIVE_MINUTES)
+
+    class Meta:
+        verbose_name = _('Notification settings')
+        verbose_name_plural = _('Notification settings')
+
+    def __str__(self):
+        return f'Notification settings of {self.user_id}'
+
+    @classmethod
+    def for_users(cls, user_ids):
+        """Return {user id: settings} for ``user_ids`` in one query, defaults for those without a row."""
+        found = cls.objects.in_bulk(user_ids)
+        return {user_id: found.get(user_id) or cls(user_id=user_id) for user_id in user_ids}
+
+    def wants(self, kind):
+        if kind == Notification.Kind.ASSIGNED:
+            return self.on_assignment
+        return self.on_status_change
+
+
+class Notification(models.Model):
+    """A change waiting to go out in its recipient's next digest email; deleted once sent.
+
+    ``due_at`` is the end of the recipient's digest window the change fell
+    in: everything due at the same moment goes out together.
+    """
+
+    class Kind(models.TextChoices):
+        ASSIGNED = 'assigned', _('Assigned')
+        STATUS = 'status', _('Status changed')
+
+    recipient = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='notifications')
+    kind = models.CharField(max_length=16, choices=Kind.choices)
+    task = models.ForeignKey('tasks.Task', on_delete=models.CASCADE, related_name='+')
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, related_name='+', blank=True, null=True,
+    )
+    # The status the task was moved to
+    status = models.ForeignKey('statuses.Status', on_delete=models.SET_NULL, related_name='+', blank=True, null=True)
+    due_at = models.DateTimeField()
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # The digest job takes what is due, recipient by recipient
+            models.Index(fields=('due_at', 'recipient'), name='notifications_due_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.kind} {self.task_id} for {self.recipient_id}'
+
+    def describe(self):
+        actor = (self.actor.get_full_name() or self.actor.username) if self.actor else gettext('Someone')
+        if self.kind == self.Kind.ASSIGNED:
+            return gettext('%(actor)s assigned "%(task)s" to you') % {'actor': actor, 'task': self.task}
+        return gettext('%(actor)s moved "%(task)s" to %(status)s') % {
+            'actor': actor, 'task': self.task, 'status': self.status or '-',
+        }
@@ -0,0 +1,137 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from jobs.models import Job
+from notifications.digests import send_due_digests, window_end
+from notifications.models import Notification, NotificationSettings
+from statuses.models import Status
+from tasks.models import Task
+
+User = get_user_model()
+
+
+class WindowTests(TestCase):
+    def test_windows_end_on_clock_boundaries(self):
+        moment = datetime.datetime(2026, 10, 19, 14, 7, 30, tzinfo=datetime.UTC)
+        self.assertEqual(window_end(moment, 300), moment.replace(minute=10, second=0))
+        self.assertEqual(window_end(moment, 3600), moment.replace(hour=15, minute=0, second=0))
+        self.assertEqual(window_end(moment, 86400), datetime.datetime(2026, 10, 20, tzinfo=datetime.UTC))
+
+
+class NotifyTaskChangeTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='author', password='pass12345', email='author@example.com')
+        cls.executor = User.objects.create_user(username='executor', password='pass12345', email='executor@example.com')
+        cls.new = Status.objects.create(name='New')
+        cls.done = Status.objects.create(name='Done')
+
+    def setUp(self):
+        self.client.login(username='author', password='pass12345')
+
+    def create_task(self, executor, name='Task'):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('tasks:create'), {
+                'name': name, 'status': self.new.pk, 'executor': executor.pk if executor else '',
+            })
+        return Task.objects.get(name=name)
+
+    def test_assignment_is_notified_after_commit(self):
+        task = self.create_task(self.executor)
+        notification = Notification.objects.get()
+        self.assertEqual(
+            (notification.recipient, notification.kind, notification.task, notification.actor),
+            (self.executor, Notification.Kind.ASSIGNED, task, self.author),
+        )
+        self.assertGreater(notification.due_at, timezone.now())
+        job = Job.objects.get(name='notifications.digests.send_due_digests')
+        self.assertEqual((job.kwargs, job.run_at), ({'due': notification.due_at.isoformat()}, notification.due_at))
+
+    def test_own_changes_are_not_notified(self):
+        self.create_task(self.author)
+        self.create_task(None, name='Unassigned')
+        self.assertFalse(Notification.objects.exists())
+        self.assertFalse(Job.objects.exists())
+
+    def test_status_change_tells_executor_and_author_but_not_the_actor(self):
+        task = self.create_task(self.executor)
+        Notification.objects.all().delete()
+        self.client.login(username='executor', password='pass12345')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('tasks:move', args=[task.pk]), {'status': self.done.pk}, content_type='application/json')
+        notification = Notification.objects.get()
+        self.assertEqual(
+            (notification.recipient, notification.kind, notification.status), (self.author, Notification.Kind.STATUS, self.done),
+        )
+
+    def test_changes_within_a_window_share_one_job(self):
+        # A day long, so the two changes can't straddle the end of a window
+        NotificationSettings.objects.create(user=self.executor, window=NotificationSettings.Window.DAY)
+        task = self.create_task(self.executor)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('tasks:move', args=[task.pk]), {'status': self.done.pk}, content_type='application/json')
+        self.assertEqual(Notification.objects.filter(recipient=self.executor).count(), 2)
+        self.assertEqual(Job.objects.count(), 1)
+
+    def test_preferences_are_respected(self):
+        NotificationSettings.objects.create(user=self.executor, on_assignment=False)
+        self.create_task(self.executor)
+        self.assertFalse(Notification.objects.exists())
+
+    def test_window_comes_from_the_recipients_settings(self):
+        NotificationSettings.objects.create(user=self.executor, window=NotificationSettings.Window.DAY)
+        self.create_task(self.executor)
+        self.assertEqual(Notification.objects.get().due_at.time(), datetime.time(0))
+
+
+class SendDueDigestsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='author', first_name='Ann', last_name='Author')
+        cls.status = Status.objects.create(name='Done')
+        cls.task = Task.objects.create(name='Write docs', status=cls.status, author=cls.author)
+        cls.now = timezone.now()
+
+    def notify(self, recipient, kind=Notification.Kind.ASSIGNED, due_at=None):
+        return Notification.objects.create(
+            recipient=recipient, kind=kind, task=self.task, actor=self.author,
+            status=self.status if kind == Notification.Kind.STATUS else None, due_at=due_at or self.now,
+        )
+
+    def test_one_email_per_recipient_with_everything_due(self):
+        alice = User.objects.create_user(username='alice', email='alice@example.com')
+        bob = User.objects.create_user(username='bob', email='bob@example.com')
+        self.notify(alice)
+        self.notify(alice, Notification.Kind.STATUS)
+        self.notify(bob)
+        self.assertEqual(send_due_digests(self.now.isoformat()), 2)
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), ['alice@example.com', 'bob@example.com'])
+        body = next(message.body for message in mail.outbox if message.to == ['alice@example.com'])
+        self.assertIn('Ann Author assigned "Write docs" to you', body)
+        self.assertIn('Ann Author moved "Write docs" to Done', body)
+        self.assertIn(f'http://localhost:8000/tasks/{self.task.pk}/', body)
+        self.assertFalse(Notification.objects.exists())
+
+    def test_later_notifications_wait_for_their_moment(self):
+        alice = User.objects.create_user(username='alice', email='alice@example.com')
+        later = self.notify(alice, due_at=self.now + datetime.timedelta(hours=1))
+        self.assertEqual(send_due_digests(self.now.isoformat()), 0)
+        self.assertEqual(list(Notification.objects.all()), [later])
+
+    def test_recipients_without_an_address_are_skipped(self):
+        self.notify(User.objects.create_user(username='nomail'))
+        self.assertEqual(send_due_digests(self.now.isoformat()), 0)
+        self.assertEqual(mail.outbox, [])
+        self.assertFalse(Notification.objects.exists())
+
+    @override_settings(NOTIFICATION_DIGEST_BATCH_SIZE=2)
+    def test_recipients_are_sent_in_batches(self):
+        for i in range(5):
+            self.notify(User.objects.create_user(username=f'user{i}', email=f'user{i}@example.com'))
+        self.assertEqual(send_due_digests(self.now.isoformat()), 5)
+        self.assertEqual(len(mail.outbox), 5)
@@ -0,0 +1,36 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from notifications.models import NotificationSettings
+
+
+class NotificationSettingsViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username='u1', password='pass12345')
+
+    def setUp(self):
+        self.client.login(username='u1', password='pass12345')
+
+    def test_defaults_are_shown_without_creating_a_row(self):
+        resp = self.client.get(reverse('notifications:settings'))
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.context['form'].initial['on_assignment'])
+        self.assertFalse(NotificationSettings.objects.exists())
+
+    def test_save(self):
+        resp = self.client.post(reverse('notifications:settings'), {
+            'on_status_change': 'on', 'window': NotificationSettings.Window.HOUR,
+        })
+        self.assertRedirects(resp, reverse('notifications:settings'))
+        settings = NotificationSettings.objects.get(user=self.user)
+        self.assertEqual(
+            (settings.on_assignment, settings.on_status_change, settings.window),
+            (False, True, NotificationSettings.Window.HOUR),
+        )
+
+    def test_requires_login(self):
+        self.client.logout()
+        resp = self.client.get(reverse('notifications:settings'))
+        self.assertEqual(resp.status_code, 302)
@@ -0,0 +1,21 @@
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.messages.views import SuccessMessageMixin
+from django.urls import reverse_lazy
+from django.utils.translation import gettext_lazy as _
+from django.views.generic import UpdateView
+
+from .forms import NotificationSettingsForm
+from .models import NotificationSettings
+
+
+class NotificationSettingsView(LoginRequiredMixin, SuccessMessageMixin, UpdateView):
+    """The current user's notification settings; the row is only created when they are first saved."""
+    form_class = NotificationSettingsForm
+    template_name = 'notifications/settings.html'
+    success_url = reverse_lazy('notifications:settings')
+    success_message = _('Notification settings saved')
+    http_method_names = ['get', 'post', 'head', 'options']
+
+    def get_object(self, queryset=None):
+        user = self.request.user
+        return NotificationSettings.objects.filter(user=user).first() or NotificationSettings(user=user)
@@ -0,0 +1,16 @@
+// Reloads the admin changelist when an AutocompleteFilter value changes.
+// select2 only fires jQuery events, hence django.jQuery instead of addEventListener.
+(function ($) {
+  'use strict';
+
+  $(document).on('change', 'select[data-filter-param]', function () {
+    var params = new URLSearchParams(window.location.search);
+    params.delete('p');
+    if (this.value) {
+      params.set(this.dataset.filterParam, this.value);
+    } else {
+      params.delete(this.dataset.filterParam);
+    }
+    window.location.search = params.toString();
+  });
+})(django.jQuery);
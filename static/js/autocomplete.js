@@ -0,0 +1,45 @@
+// Progressive enhancement for <select data-autocomplete-url="...">:
+// adds a search box above the select and replaces its options with the
+// matches returned by the lookup endpoint ({"results": [{"id", "text"}]}).
+(function () {
+  'use strict';
+
+  function setOptions(select, results) {
+    var selected = select.value;
+    Array.from(select.options).forEach(function (option) {
+      if (option.value !== '' && option.value !== selected) {
+        option.remove();
+      }
+    });
+    results.forEach(function (item) {
+      var value = String(item.id);
+      if (value !== selected) {
+        select.add(new Option(item.text, value));
+      }
+    });
+  }
+
+  function enhance(select) {
+    var input = document.createElement('input');
+    var timer = null;
+    input.type = 'search';
+    input.className = 'form-control mb-1';
+    input.autocomplete = 'off';
+    input.setAttribute('aria-label', select.getAttribute('aria-label') || select.name);
+    select.parentNode.insertBefore(input, select);
+
+    input.addEventListener('input', function () {
+      clearTimeout(timer);
+      timer = setTimeout(function () {
+        var url = select.dataset.autocompleteUrl + '?q=' + encodeURIComponent(input.value.trim());
+        fetch(url, {credentials: 'same-origin', headers: {'Accept': 'application/json'}})
+          .then(function (response) { return response.json(); })
+          .then(function (data) { setOptions(select, data.results); });
+      }, 200);
+    });
+  }
+
+  document.addEventListener('DOMContentLoaded', function () {
+    document.querySelectorAll('select[data-autocomplete-url]').forEach(enhance);
+  });
+})();
@@ -0,0 +1,110 @@
+// Task board behaviour:
+// * lazy loading: when the "show more" link at the end of a column
+//   (<div data-board-more>) scrolls into view, the next cards are fetched
+//   and put in its place, with the next link if there are more;
+// * drag and drop: dropping a card in a column POSTs {"status": id,
+//   "after": id of the card above it or null} as JSON to the card's
+//   data-move-url; the card moves back if that fails.
+(function () {
+  'use strict';
+
+  var board = document.querySelector('[data-board]');
+  if (!board) {
+    return;
+  }
+  var token = document.querySelector('[name=csrfmiddlewaretoken]').value;
+
+  function loadMore(container) {
+    var link = container.querySelector('a');
+    container.removeAttribute('data-board-more');
+    fetch(link.href, {credentials: 'same-origin', headers: {'Accept': 'text/html'}})
+      .then(function (response) { return response.text(); })
+      .then(function (html) {
+        container.insertAdjacentHTML('afterend', html);
+        container.remove();
+        observeMoreLinks();
+      });
+  }
+
+  var observer = 'IntersectionObserver' in window ? new IntersectionObserver(function (entries) {
+    entries.forEach(function (entry) {
+      if (entry.isIntersecting && entry.target.hasAttribute('data-board-more')) {
+        observer.unobserve(entry.target);
+        loadMore(entry.target);
+      }
+    });
+  }) : null;
+
+  function observeMoreLinks() {
+    board.querySelectorAll('[data-board-more]').forEach(function (container) {
+      if (observer) {
+        observer.observe(container);
+      }
+    });
+  }
+
+  board.addEventListener('click', function (event) {
+    var container = event.target.closest('[data-board-more]');
+    if (container && event.target.closest('a')) {
+      event.preventDefault();
+      loadMore(container);
+    }
+  });
+
+  var dragged = null;
+
+  board.addEventListener('dragstart', function (event) {
+    dragged = event.target.closest('[data-move-url]');
+    if (dragged) {
+      event.dataTransfer.effectAllowed = 'move';
+    }
+  });
+
+  board.addEventListener('dragover', function (event) {
+    if (dragged && event.target.closest('[data-board-column]')) {
+      event.preventDefault();
+    }
+  });
+
+  board.addEventListener('drop', function (event) {
+    var column = event.target.closest('[data-board-column]');
+    if (!dragged || !column) {
+      return;
+    }
+    event.preventDefault();
+    var card = dragged;
+    var origin = card.parentNode;
+    var next = card.nextSibling;
+    dragged = null;
+    // Drop above the card under the pointer if in its upper half, else below it
+    var target = event.target.closest('[data-task-id]');
+    if (target === card) {
+      return;
+    }
+    if (!target) {
+      column.insertBefore(card, column.querySelector('[data-board-more]'));
+    } else if (event.clientY < target.getBoundingClientRect().top + target.offsetHeight / 2) {
+      target.before(card);
+    } else {
+      target.after(card);
+    }
+    var above = card.previousElementSibling;
+    fetch(card.dataset.moveUrl, {
+      method: 'POST',
+      credentials: 'same-origin',
+      headers: {'Content-Type': 'application/json', 'X-CSRFToken': token},
+      body: JSON.stringify({
+        status: Number(column.dataset.boardColumn),
+        after: above && above.dataset.taskId ? Number(above.dataset.taskId) : null,
+      }),
+    }).then(function (response) {
+      if (!response.ok) {
+        throw new Error(response.statusText);
+      }
+    }).catch(function () {
+      origin.insertBefore(card, next);
+    });
+  });
+
+  observeMoreLinks();
+})();
@@ -0,0 +1,106 @@
+// Progressive enhancement for <form data-chunked-upload="<start url>">:
+// sends the chosen file in 8 MiB chunks (PUT with Content-Range) to a
+// resumable upload instead of one multipart post. A failed chunk is
+// retried from the offset the server reports, and an upload interrupted by
+// a page reload resumes when the same file is chosen again (its URL is kept
+// in localStorage). Without JavaScript the form posts the file as usual.
+(function () {
+  'use strict';
+
+  var CHUNK_SIZE = 8 * 1024 * 1024;
+  var RETRIES = 5;
+
+  function fileKey(file) {
+    return 'chunked-upload:' + [file.name, file.size, file.lastModified].join(':');
+  }
+
+  function start(form, file, token) {
+    var saved = localStorage.getItem(fileKey(file));
+    if (saved) {
+      return fetch(saved, {credentials: 'same-origin'}).then(function (response) {
+        if (!response.ok) {
+          localStorage.removeItem(fileKey(file));
+          return start(form, file, token);
+        }
+        return response.json().then(function (data) { return {url: saved, offset: data.offset}; });
+      });
+    }
+    var body = new FormData();
+    body.append('name', file.name);
+    body.append('size', file.size);
+    return fetch(form.dataset.chunkedUpload, {
+      method: 'POST', body: body, credentials: 'same-origin', headers: {'X-CSRFToken': token},
+    }).then(function (response) {
+      return response.json().then(function (data) {
+        if (!response.ok) {
+          throw new Error(Object.values(data.errors || {}).join(' '));
+        }
+        localStorage.setItem(fileKey(file), data.url);
+        return data;
+      });
+    });
+  }
+
+  function send(upload, file, token, progress, retries) {
+    var end = Math.min(upload.offset + CHUNK_SIZE, file.size);
+    return fetch(upload.url, {
+      method: 'PUT',
+      body: file.slice(upload.offset, end),
+      credentials: 'same-origin',
+      headers: {
+        'X-CSRFToken': token,
+        'Content-Range': 'bytes ' + upload.offset + '-' + (end - 1) + '/' + file.size,
+      },
+    }).then(function (response) {
+      return response.json().then(function (data) {
+        if (response.status === 201) {
+          return data;
+        }
+        if (response.ok || response.status === 409) {
+          upload.offset = data.offset;
+          progress(upload.offset / file.size);
+          return send(upload, file, token, progress, RETRIES);
+        }
+        throw new Error(data.error);
+      });
+    }).catch(function (error) {
+      if (!retries) {
+        throw error;
+      }
+      // Ask where the server got to and go on from there
+      return fetch(upload.url, {credentials: 'same-origin'})
+        .then(function (response) { return response.json(); })
+        .then(function (data) {
+          upload.offset = data.offset;
+          return send(upload, file, token, progress, retries - 1);
+        }, function () {
+          return send(upload, file, token, progress, retries - 1);
+        });
+    });
+  }
+
+  document.addEventListener('submit', function (event) {
+    var form = event.target.closest('form[data-chunked-upload]');
+    var file = form && form.querySelector('input[type=file]').files[0];
+    if (!file || !window.fetch) {
+      return;
+    }
+    event.preventDefault();
+    var token = form.querySelector('[name=csrfmiddlewaretoken]').value;
+    var bar = form.querySelector('.progress');
+    var progress = function (fraction) {
+      bar.firstElementChild.style.width = Math.round(fraction * 100) + '%';
+    };
+    bar.classList.remove('d-none');
+    form.querySelector('[type=submit]').disabled = true;
+    start(form, file, token)
+      .then(function (upload) { return send(upload, file, token, progress, RETRIES); })
+      .then(function () {
+        localStorage.removeItem(fileKey(file));
+        window.location.reload();
+      }, function (error) {
+        form.querySelector('[type=submit]').disabled = false;
+        window.alert(error.message);
+      });
+  });
+})();
@@ -0,0 +1,19 @@
+// Progressive enhancement for "show more" links inside <div data-load-more>:
+// fetches the next page fragment from data-load-more-url and puts it in
+// place of the link (the fragment brings its own link to the page after).
+// Without JavaScript the link opens the page on its own.
+(function () {
+  'use strict';
+
+  document.addEventListener('click', function (event) {
+    var link = event.target.closest('[data-load-more] a[data-load-more-url]');
+    if (!link) {
+      return;
+    }
+    event.preventDefault();
+    var container = link.closest('[data-load-more]');
+    fetch(link.dataset.loadMoreUrl, {credentials: 'same-origin', headers: {'Accept': 'text/html'}})
+      .then(function (response) { return response.text(); })
+      .then(function (html) { container.outerHTML = html; });
+  });
+})();
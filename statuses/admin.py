@@ -0,0 +1,9 @@
+from django.contrib import admin
+
+from .models import Status
+
+
+@admin.register(Status)
+class StatusAdmin(admin.ModelAdmin):
+    list_display = ('id', 'name')
+    search_fields = ('name',)
@@ -5,5 +5,5 @@ from .models import Status
 class StatusForm(forms.ModelForm):
     class Meta:
         model = Status
-        fields = ('name',)
+        fields = ('name', 'is_closed')
         labels = {'name': _('Name')}
@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-19 16:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('statuses', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='status',
+            name='is_closed',
+            field=models.BooleanField(default=False, verbose_name='Closed'),
+        ),
+    ]
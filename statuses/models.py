@@ -3,6 +3,8 @@ from django.utils.translation import gettext_lazy as _
 
 class Status(models.Model):
     name = models.CharField(_('Name'), max_length=255, unique=True)
+    # Tasks in a closed status are done: they leave "my work" and stop blocking others
+    is_closed = models.BooleanField(_('Closed'), default=False)
 
     class Meta:
         verbose_name = _('Status')
@@ -1,4 +1,4 @@
-from django.test import TestCase, Client
+from django.test import TestCase
 from django.urls import reverse
 from django.contrib.auth.models import User
 from django.contrib.messages import get_messages
@@ -10,11 +10,11 @@ from statuses.models import Status
 
 
 class StatusCRUDTestCase(TestCase):
-    def setUp(self):
-        self.client = Client()
-        self.user = User.objects.create_user(username='user', password='pass12345')
-        self.status1 = Status.objects.create(name='New')
-        self.status2 = Status.objects.create(name='In progress')
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='user', password='pass12345')
+        cls.status1 = Status.objects.create(name='New')
+        cls.status2 = Status.objects.create(name='In progress')
 
     def test_list_requires_login(self):
         resp = self.client.get(reverse('statuses:list'))
@@ -181,3 +181,12 @@ class StatusCRUDTestCase(TestCase):
         self.client.login(username='user', password='pass12345')
         resp = self.client.delete(reverse('statuses:delete', args=[self.status1.id]))
         self.assertEqual(resp.status_code, 405)
+
+    def test_lookup_returns_matching_statuses(self):
+        self.client.login(username='user', password='pass12345')
+        resp = self.client.get(reverse('statuses:lookup'), {'q': 'in'})
+        self.assertEqual(resp.json(), {'results': [{'id': self.status2.id, 'text': 'In progress'}]})
+
+    def test_lookup_requires_login(self):
+        resp = self.client.get(reverse('statuses:lookup'))
+        self.assertEqual(resp.status_code, 302)
@@ -1,10 +1,11 @@
 from django.urls import path
-from .views import StatusListView, StatusCreateView, StatusUpdateView, StatusDeleteView
+from .views import StatusListView, StatusLookupView, StatusCreateView, StatusUpdateView, StatusDeleteView
 
 app_name = 'statuses'
 
 urlpatterns = [
     path('', StatusListView.as_view(), name='list'),
+    path('lookup/', StatusLookupView.as_view(), name='lookup'),
     path('create/', StatusCreateView.as_view(), name='create'),
     path('<int:pk>/update/', StatusUpdateView.as_view(), name='update'),
     path('<int:pk>/delete/', StatusDeleteView.as_view(), name='delete'),
@@ -6,6 +6,7 @@ from django.utils.translation import gettext_lazy as _
 from django.db.models import ProtectedError
 from django.shortcuts import redirect
 
+from task_manager.lookups import AutocompleteLookupView
 from .models import Status
 from .forms import StatusForm
 
@@ -14,6 +15,10 @@ class StatusListView(LoginRequiredMixin, ListView):
     template_name = 'statuses/list.html'
     context_object_name = 'statuses'
 
+class StatusLookupView(AutocompleteLookupView):
+    def search(self, query):
+        return Status.objects.filter(name__istartswith=query)
+
 class StatusCreateView(LoginRequiredMixin, CreateView):
     model = Status
     form_class = StatusForm
@@ -0,0 +1,113 @@
+"""Admin building blocks for tables too large to count or list in full."""
+import json
+
+from django import forms
+from django.contrib import admin
+from django.contrib.admin.options import ShowFacets
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+
+
+def estimate_count(queryset):
+    """Return PostgreSQL's row estimate for ``queryset``, or None when there isn't one.
+
+    An unfiltered queryset gets the table's ``pg_class.reltuples`` (kept up to
+    date by autovacuum/ANALYZE); anything else the planner's row estimate
+    from ``EXPLAIN``. Other databases return None.
+    """
+    if not isinstance(queryset, QuerySet):
+        return None
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+
+    query = queryset.query
+    with connection.cursor() as cursor:
+        if not query.where and not query.distinct and not query.is_sliced:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                [connection.ops.quote_name(queryset.model._meta.db_table)],
+            )
+            row = cursor.fetchone()
+            # -1 until the table has been vacuumed or analyzed
+            if row and row[0] >= 0:
+                return row[0]
+            return None
+        sql, params = queryset.order_by().query.sql_with_params()
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that uses planner estimates instead of COUNT(*) for big result sets.
+
+    When the estimate is below ``exact_threshold`` rows the exact count is
+    cheap enough and is used instead, so small filtered lists stay exact.
+    """
+
+    exact_threshold = 10000
+
+    @cached_property
+    def count(self):
+        estimate = estimate_count(self.object_list)
+        if estimate is None or estimate < self.exact_threshold:
+            return super().count
+        return estimate
+
+
+class AutocompleteFilter(admin.RelatedFieldListFilter):
+    """Related-object filter with an autocomplete box instead of a link per object.
+
+    Only the selected object is loaded; the others are searched through the
+    admin's autocomplete view, so the related model admin needs
+    ``search_fields``.
+    """
+
+    template = 'admin/autocomplete_filter.html'
+
+    def __init__(self, field, request, params, model, model_admin, field_path):
+        self.model_admin = model_admin
+        super().__init__(field, request, params, model, model_admin, field_path)
+
+    def field_choices(self, field, request, model_admin):
+        # The widget loads the selected object itself
+        return []
+
+    def has_output(self):
+        return True
+
+    @property
+    def rendered_widget(self):
+        widget = AutocompleteSelect(self.field, self.model_admin.admin_site, attrs={
+            'id': f'autocomplete-filter-{self.field_path}',
+            'data-filter-param': self.lookup_kwarg,
+        })
+        queryset = self.field.remote_field.model._default_manager.all()
+        form_field = forms.ModelChoiceField(queryset, widget=widget, required=False)
+        return form_field.widget.render(self.lookup_kwarg, self.lookup_val[0] if self.lookup_val else None)
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """ModelAdmin defaults for tables with millions of rows.
+
+    No COUNT(*) of the whole table, estimated counts for big result sets, no
+    facet counts, and the media AutocompleteFilter needs on the changelist.
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    show_facets = ShowFacets.NEVER
+
+    @property
+    def media(self):
+        media = super().media
+        if any(isinstance(spec, tuple) and spec[1] is AutocompleteFilter for spec in self.list_filter):
+            media += AutocompleteSelect(None, self.admin_site).media
+            media += forms.Media(js=['admin/js/jquery.init.js', 'js/admin_autocomplete_filter.js'])
+        return media
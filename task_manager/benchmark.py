@@ -0,0 +1,56 @@
+"""Helpers shared by the ``bench_*`` management commands.
+
+Benchmarks run against a throwaway test database, the same way the test
+runner does, so they can create as much data as they need without touching
+the real one. Like the test settings, they use the plain staticfiles storage
+so pages render without running collectstatic first.
+"""
+import statistics
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+
+@contextmanager
+def benchmark_database(verbosity=0):
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=verbosity, autoclobber=True, serialize=False)
+    storages = {
+        **settings.STORAGES,
+        'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    }
+    try:
+        with override_settings(STORAGES=storages):
+            yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=verbosity)
+        teardown_test_environment()
+
+
+def measure(func, repeat, clock=time.perf_counter):
+    """Call ``func`` ``repeat`` times and return the duration of each call in seconds.
+
+    Pass ``clock=time.process_time`` to measure CPU time instead of wall time.
+    """
+    durations = []
+    for _ in range(repeat):
+        start = clock()
+        func()
+        durations.append(clock() - start)
+    return durations
+
+
+def summary(label, durations):
+    """One line with throughput and latency percentiles for ``durations``."""
+    ordered = sorted(durations)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return (
+        f'{label:<24} {len(durations) / sum(durations):9.1f} ops/s  '
+        f'mean {statistics.mean(durations) * 1000:8.2f} ms  '
+        f'p50 {statistics.median(durations) * 1000:8.2f} ms  '
+        f'p95 {p95 * 1000:8.2f} ms'
+    )
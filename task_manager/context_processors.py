@@ -0,0 +1,5 @@
+from django.conf import settings
+
+
+def static_assets(request):
+    return {'bootstrap_css_subset': settings.BOOTSTRAP_CSS_SUBSET}
@@ -0,0 +1,128 @@
+"""Remove CSS rules whose class selectors are never used.
+
+Small, dependency-free purger for the vendored Bootstrap stylesheet: it only
+understands what minified Bootstrap contains (plain rules, nested @media /
+@supports / @container blocks, and at-rules kept verbatim).
+"""
+import re
+from pathlib import Path
+
+CLASS_RE = re.compile(r'\.(-?[_a-zA-Z][_a-zA-Z0-9-]*)')
+CLASS_ATTR_RE = re.compile(r'class\s*=\s*"([^"]*)"|class\s*=\s*\'([^\']*)\'')
+CLASS_NAME_RE = re.compile(r'className\s*=\s*["\']([^"\']*)["\']')
+NOT_RE = re.compile(r':not\([^()]*\)')
+
+# At-rules whose body is a list of rules that can be filtered
+NESTED_AT_RULES = ('@media', '@supports', '@container', '@layer')
+
+# Classes Bootstrap's JavaScript toggles at runtime, and ones django-bootstrap5
+# adds when rendering forms and messages (they never appear in our templates).
+SAFELIST = {
+    'active', 'show', 'showing', 'hide', 'fade', 'collapse', 'collapsing', 'collapsed',
+    'disabled', 'modal-open', 'was-validated',
+    'form-control', 'form-select', 'form-label', 'form-text', 'form-check',
+    'form-check-input', 'form-check-label', 'form-floating', 'input-group',
+    'invalid-feedback', 'valid-feedback', 'is-invalid', 'is-valid', 'text-muted',
+    'mb-3', 'btn-close', 'alert-dismissible', 'visually-hidden',
+}
+SAFELIST_PREFIXES = ('alert-',)
+
+
+def used_classes(paths):
+    """Return (class names, class prefixes) found in class attributes of ``paths``.
+
+    Template tags inside an attribute (``alert-{{ message.tags }}``) turn the
+    static part before them into a prefix, so every ``alert-*`` rule is kept.
+    """
+    classes, prefixes = set(SAFELIST), set(SAFELIST_PREFIXES)
+    for path in paths:
+        text = Path(path).read_text(encoding='utf-8')
+        values = [a or b for a, b in CLASS_ATTR_RE.findall(text)] + CLASS_NAME_RE.findall(text)
+        for value in values:
+            value = re.sub(r'{%.*?%}', ' ', value)
+            for token in value.split():
+                if '{{' in token:
+                    if token.index('{{') > 0:
+                        prefixes.add(token[:token.index('{{')])
+                elif '{' not in token and '}' not in token:
+                    classes.add(token)
+    return classes, prefixes
+
+
+def _is_used(name, classes, prefixes):
+    return name in classes or name.startswith(tuple(prefixes))
+
+
+def _split_selectors(prelude):
+    """Split a selector list on top-level commas (not those inside parentheses)."""
+    parts, depth, current = [], 0, []
+    for char in prelude:
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        if char == ',' and depth == 0:
+            parts.append(''.join(current))
+            current = []
+        else:
+            current.append(char)
+    parts.append(''.join(current))
+    return parts
+
+
+def _keep_selector(selector, classes, prefixes):
+    return all(_is_used(name, classes, prefixes) for name in CLASS_RE.findall(NOT_RE.sub('', selector)))
+
+
+def _blocks(css):
+    """Yield (prelude, body) for each top-level statement; body is None for ``@x ...;`` statements."""
+    i, length = 0, len(css)
+    while i < length:
+        if css.startswith('/*', i):
+            end = css.find('*/', i) + 2
+            if css.startswith('/*!', i):
+                yield css[i:end], None  # license banner
+            i = end
+            continue
+        start = i
+        while i < length and css[i] not in '{;':
+            if css[i] in '"\'':
+                i = css.index(css[i], i + 1)
+            i += 1
+        if i >= length:
+            break
+        prelude = css[start:i].strip()
+        if css[i] == ';':
+            yield prelude + ';', None
+            i += 1
+            continue
+        depth, j = 1, i + 1
+        while depth:
+            if css[j] in '"\'':
+                j = css.index(css[j], j + 1)
+            elif css[j] == '{':
+                depth += 1
+            elif css[j] == '}':
+                depth -= 1
+            j += 1
+        yield prelude, css[i + 1:j - 1]
+        i = j
+
+
+def purge_css(css, classes, prefixes=()):
+    """Return ``css`` without rules that only target classes not in ``classes``/``prefixes``."""
+    out = []
+    for prelude, body in _blocks(css):
+        if body is None:
+            out.append(prelude)
+        elif prelude.startswith(NESTED_AT_RULES):
+            inner = purge_css(body, classes, prefixes)
+            if inner:
+                out.append(f'{prelude}{{{inner}}}')
+        elif prelude.startswith('@'):
+            out.append(f'{prelude}{{{body}}}')
+        else:
+            selectors = [s for s in _split_selectors(prelude) if _keep_selector(s, classes, prefixes)]
+            if selectors:
+                out.append(f'{",".join(selectors)}{{{body}}}')
+    return ''.join(out)
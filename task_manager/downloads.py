@@ -0,0 +1,113 @@
+"""Serve files from disk without reading them into memory, with HTTP Range support.
+
+``serve_file`` answers ``Range: bytes=...`` requests with 206 Partial
+Content (one range; requests for several ranges get the whole file, which
+RFC 9110 allows), honours ``If-Range`` and streams the file in blocks
+through FileResponse, so the WSGI server can use sendfile(). With
+``FILE_DOWNLOAD_OFFLOAD`` set, the response only carries an X-Sendfile or
+X-Accel-Redirect header and the front-end web server sends the file (and
+handles ranges) itself.
+"""
+import os
+import re
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+from django.utils.http import content_disposition_header
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def parse_range(header, size):
+    """Return (start, end) for a single-range ``Range`` header, inclusive.
+
+    Returns None when the header should be ignored (absent, malformed or
+    several ranges) and raises ValueError when the range is unsatisfiable.
+    """
+    match = RANGE_RE.match((header or '').strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # bytes=-N: the last N bytes
+        if int(last) == 0 or size == 0:
+            raise ValueError('empty suffix range')
+        return max(size - int(last), 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or (last and int(last) < start):
+        raise ValueError('range not satisfiable')
+    return start, end
+
+
+class FileRange:
+    """Read-only view of ``length`` bytes of ``file`` from its current position.
+
+    ``fileno()`` is passed through so sendfile() still works; the server
+    sends Content-Length bytes from the file's position.
+    """
+
+    def __init__(self, file, length):
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def offload_response(storage_name, path, filename):
+    response = HttpResponse(content_type='application/octet-stream')
+    response.headers['Content-Disposition'] = content_disposition_header(True, filename)
+    if settings.FILE_DOWNLOAD_OFFLOAD == 'x-sendfile':
+        response.headers['X-Sendfile'] = str(path)
+    else:
+        response.headers['X-Accel-Redirect'] = settings.FILE_DOWNLOAD_ACCEL_PREFIX + storage_name
+    return response
+
+
+def serve_file(request, path, filename, etag=None, storage_name=None):
+    """Return a download response for the file at ``path``, named ``filename``.
+
+    ``etag`` (a strong validator such as a checksum) enables ``If-Range``;
+    ``storage_name`` is the path the X-Accel-Redirect location maps to.
+    """
+    if settings.FILE_DOWNLOAD_OFFLOAD:
+        return offload_response(storage_name, path, filename)
+
+    size = os.path.getsize(path)
+    quoted_etag = f'"{etag}"' if etag else None
+    byte_range = None
+    if_range = request.headers.get('If-Range')
+    if 'Range' in request.headers and (if_range is None or if_range == quoted_etag):
+        try:
+            byte_range = parse_range(request.headers['Range'], size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response.headers['Content-Range'] = f'bytes */{size}'
+            return response
+
+    file = open(path, 'rb')
+    if byte_range is None:
+        response = FileResponse(file, as_attachment=True, filename=filename)
+    else:
+        start, end = byte_range
+        file.seek(start)
+        response = FileResponse(FileRange(file, end - start + 1), as_attachment=True, filename=filename, status=206)
+        response.headers['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response.headers['Content-Length'] = str(end - start + 1)
+    response.headers['Accept-Ranges'] = 'bytes'
+    if quoted_etag:
+        response.headers['ETag'] = quoted_etag
+    return response
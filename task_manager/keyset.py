@@ -0,0 +1,59 @@
+"""Keyset ("seek") pagination over a datetime or text column and the primary key.
+
+Pages are selected with a WHERE on the last row seen instead of an OFFSET,
+so with an index on the column every page is an index range scan however
+deep it is, and rows inserted meanwhile don't shift the pages.
+"""
+from datetime import UTC, datetime, timedelta
+
+from django.db.models import DateTimeField
+
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+
+def make_cursor(obj, field):
+    """Encode ``obj``'s (field, pk) position as '<value>.<pk>'.
+
+    Datetimes are written as microseconds since the epoch, text as is.
+    """
+    value = getattr(obj, field)
+    if isinstance(value, datetime):
+        value = (value - EPOCH) // timedelta(microseconds=1)
+    return f'{value}.{obj.pk}'
+
+
+def parse_cursor(cursor, text=False):
+    """Return the (value, pk) of a cursor from ``make_cursor``, or None if it is invalid.
+
+    The value is a datetime, or the text itself with ``text=True``.
+    """
+    try:
+        value, pk = cursor.rsplit('.', 1)
+        if text:
+            return value, int(pk)
+        return EPOCH + timedelta(microseconds=int(value)), int(pk)
+    except (AttributeError, ValueError, OverflowError):
+        return None
+
+
+def keyset_page(queryset, field, cursor=None, size=50, descending=True):
+    """Return the ``size`` rows after ``cursor`` in (field, pk) order and the cursor of the next page.
+
+    The next cursor is None on the last page; an invalid cursor gives the
+    first page.
+    """
+    prefix = '-' if descending else ''
+    queryset = queryset.order_by(f'{prefix}{field}', f'{prefix}pk')
+    text = not isinstance(queryset.model._meta.get_field(field), DateTimeField)
+    position = parse_cursor(cursor, text) if cursor else None
+    if position:
+        value, pk = position
+        # (field, pk) < (value, pk) or >, written so the field bound is an index range
+        if descending:
+            queryset = queryset.filter(**{f'{field}__lte': value}).exclude(**{field: value, 'pk__gte': pk})
+        else:
+            queryset = queryset.filter(**{f'{field}__gte': value}).exclude(**{field: value, 'pk__lte': pk})
+    rows = list(queryset[:size + 1])
+    if len(rows) > size:
+        return rows[:size], make_cursor(rows[size - 1], field)
+    return rows, None
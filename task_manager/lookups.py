@@ -0,0 +1,25 @@
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import JsonResponse
+from django.views import View
+
+
+class AutocompleteLookupView(LoginRequiredMixin, View):
+    """JSON endpoint behind AutocompleteSelect widgets.
+
+    ``GET ?q=<text>`` returns ``{"results": [{"id": ..., "text": ...}]}`` with
+    at most ``limit`` matches. Subclasses implement ``search()``, which should
+    be served by an index.
+    """
+
+    limit = 20
+
+    def search(self, query):
+        raise NotImplementedError
+
+    def get(self, request, *args, **kwargs):
+        query = request.GET.get('q', '').strip()
+        results = [
+            {'id': obj.pk, 'text': str(obj)}
+            for obj in self.search(query)[:self.limit]
+        ]
+        return JsonResponse({'results': results})
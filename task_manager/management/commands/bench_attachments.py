@@ -0,0 +1,147 @@
+import io
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+from django.test.client import ClientHandler
+from django.urls import reverse
+
+from statuses.models import Status
+from task_manager.benchmark import benchmark_database
+from tasks.models import Task
+
+BOUNDARY = 'BenchBoundary'
+PATTERN = bytes(range(256)) * 256
+
+
+class GeneratedBody(io.RawIOBase):
+    """A request body of ``size`` generated bytes between ``prefix`` and ``suffix``, made as it is read."""
+
+    def __init__(self, size, prefix=b'', suffix=b''):
+        self.parts = [prefix, None, suffix]
+        self.remaining = size
+        self.length = len(prefix) + size + len(suffix)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while self.parts:
+            part = self.parts[0]
+            if part is None:
+                chunk = PATTERN[:min(len(buffer), self.remaining)]
+                self.remaining -= len(chunk)
+                if not self.remaining:
+                    self.parts.pop(0)
+            else:
+                chunk = part[:len(buffer)]
+                self.parts[0] = part[len(chunk):]
+                if not self.parts[0]:
+                    self.parts.pop(0)
+            if chunk:
+                buffer[:len(chunk)] = chunk
+                return len(chunk)
+        return 0
+
+
+class Command(BaseCommand):
+    help = 'Measure peak Python memory and throughput of attachment uploads and downloads of a large file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size-mb', type=int, default=1024, help='Size of the file in MiB (default: 1024).')
+        parser.add_argument('--chunk-mb', type=int, default=8, help='Chunk size of the resumable upload in MiB.')
+
+    def handle(self, *args, **options):
+        self.size = options['size_mb'] * 2**20
+        chunk_size = options['chunk_mb'] * 2**20
+        if not self.size or not chunk_size:
+            raise CommandError('Sizes must be positive.')
+
+        with tempfile.TemporaryDirectory() as media_root, benchmark_database(), override_settings(
+            MEDIA_ROOT=media_root, ATTACHMENT_MAX_SIZE=max(self.size, settings.ATTACHMENT_MAX_SIZE),
+        ):
+            user = get_user_model().objects.create_user(username='bench', password='bench-pass-123')
+            status = Status.objects.create(name='Bench')
+            task = Task.objects.create(name='Bench task', status=status, author=user)
+            client = Client()
+            client.force_login(user)
+            self.cookie = '; '.join(f'{name}={morsel.value}' for name, morsel in client.cookies.items())
+            self.handler = ClientHandler(enforce_csrf_checks=False)
+
+            prefix = (
+                f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="file"; filename="big.bin"\r\n'
+                'Content-Type: application/octet-stream\r\n\r\n'
+            ).encode()
+            body = GeneratedBody(self.size, prefix, f'\r\n--{BOUNDARY}--\r\n'.encode())
+            self.run(
+                'multipart upload', self.size, 'POST', reverse('tasks:attachment_create', args=[task.pk]), body,
+                CONTENT_TYPE=f'multipart/form-data; boundary={BOUNDARY}',
+            )
+            if not task.attachments.exists():
+                raise CommandError('The multipart upload failed.')
+
+            def chunked_upload():
+                response = client.post(reverse('tasks:upload_create', args=[task.pk]), {'name': 'big.bin', 'size': self.size})
+                url = response.json()['url']
+                for start in range(0, self.size, chunk_size):
+                    length = min(chunk_size, self.size - start)
+                    response = self.request(
+                        'PUT', url, GeneratedBody(length), CONTENT_TYPE='application/octet-stream',
+                        HTTP_CONTENT_RANGE=f'bytes {start}-{start + length - 1}/{self.size}',
+                    )
+                    response.close()
+                if response.status_code != 201:
+                    raise CommandError(f'The chunked upload failed: {response.content[:200]!r}')
+
+            self.report('chunked upload', self.size, chunked_upload)
+
+            attachment = task.attachments.latest('created_at')
+            url = reverse('tasks:attachment', args=[task.pk, attachment.pk])
+            self.run('download', self.size, 'GET', url)
+            half = self.size // 2
+            self.run('ranged download', self.size - half, 'GET', url, HTTP_RANGE=f'bytes={half}-')
+
+    def request(self, method, path, body=None, **extra):
+        if body is None:
+            body = GeneratedBody(0)
+        return self.handler({
+            'REQUEST_METHOD': method,
+            'PATH_INFO': path,
+            'SCRIPT_NAME': '',
+            'SERVER_NAME': 'testserver',
+            'SERVER_PORT': '80',
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'HTTP_COOKIE': self.cookie,
+            'CONTENT_LENGTH': str(body.length),
+            'wsgi.input': io.BufferedReader(body),
+            'wsgi.url_scheme': 'http',
+            'wsgi.errors': sys.stderr,
+            **extra,
+        })
+
+    def run(self, label, size, method, path, body=None, **extra):
+        def send():
+            response = self.request(method, path, body, **extra)
+            received = sum(len(chunk) for chunk in response) if method == 'GET' else size
+            response.close()
+            if response.status_code >= 400 or received != size:
+                raise CommandError(f'{label} failed: {response.status_code}, {received} of {size} bytes')
+
+        self.report(label, size, send)
+
+    def report(self, label, size, func):
+        tracemalloc.start()
+        start = time.perf_counter()
+        func()
+        duration = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.stdout.write(
+            f'{label:<18} {size / 2**20:8.0f} MiB  {size / 2**20 / duration:8.1f} MiB/s  '
+            f'peak memory {peak / 2**20:8.2f} MiB'
+        )
@@ -0,0 +1,62 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from statuses.models import Status
+from task_manager import middleware
+from task_manager.benchmark import benchmark_database, measure, summary
+from tasks.models import Task
+
+ENCODINGS = ('identity', 'gzip', 'br')
+
+
+class Command(BaseCommand):
+    help = 'Measure bytes on the wire and CPU time per request for the task and user lists'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=500, help='Tasks (and users) to create.')
+        parser.add_argument('--requests', type=int, default=20, help='Requests per combination.')
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            user = self.populate(options['tasks'])
+            for url in (reverse('tasks:list'), reverse('users:list')):
+                self.stdout.write(url)
+                for minify in (False, True):
+                    # New client per setting: middleware is loaded on the first request
+                    with override_settings(HTML_MINIFY=minify):
+                        client = Client()
+                        client.force_login(user)
+                        for encoding in ENCODINGS:
+                            if encoding == 'br' and middleware.brotli is None:
+                                self.stdout.write('  br skipped: Brotli is not installed')
+                                continue
+                            self.bench(client, url, encoding, minify, options['requests'])
+
+    def populate(self, count):
+        User = get_user_model()
+        User.objects.bulk_create(
+            User(username=f'bench-{i}', first_name='Bench', last_name=f'User {i}') for i in range(count)
+        )
+        user = User.objects.create_user(username='bench', password='bench-pass-123')
+        status = Status.objects.create(name='Bench')
+        Task.objects.bulk_create(
+            Task(name=f'Task {i}', description='Benchmark task', status=status, author=user, executor=user)
+            for i in range(count)
+        )
+        return user
+
+    def bench(self, client, url, encoding, minify, requests):
+        sizes = []
+
+        def get():
+            response = client.get(url, headers={'accept-encoding': encoding})
+            body = b''.join(response.streaming_content) if response.streaming else response.content
+            sizes.append(len(body))
+
+        durations = measure(get, requests, clock=time.process_time)
+        label = f'{encoding}{" +minify" if minify else ""}'
+        self.stdout.write(f'  {summary(label, durations)}  {sizes[-1]:9d} bytes')
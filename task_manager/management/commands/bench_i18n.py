@@ -0,0 +1,50 @@
+import gettext
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.urls import reverse
+
+from statuses.models import Status
+from task_manager.benchmark import benchmark_database, measure, summary
+from tasks.models import Task
+
+PAGES = ('home', 'login', 'users:list', 'statuses:list', 'tasks:list')
+
+
+class Command(BaseCommand):
+    help = 'Compare render times of the main pages in every language from LANGUAGES'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=50, help='Requests per page and language.')
+        parser.add_argument('--tasks', type=int, default=50, help='Tasks to create for the task list.')
+
+    def handle(self, *args, **options):
+        languages = [code for code, _ in settings.LANGUAGES]
+        for code in languages:
+            if code != settings.LANGUAGE_CODE and not gettext.find('django', settings.LOCALE_PATHS[0], [code]):
+                self.stderr.write(f'{code}: no compiled catalogue, run compilemessages first')
+
+        with benchmark_database():
+            user = get_user_model().objects.create_user(username='bench', password='bench-pass-123')
+            status = Status.objects.create(name='Bench')
+            Task.objects.bulk_create(
+                Task(name=f'Task {i}', status=status, author=user, executor=user) for i in range(options['tasks'])
+            )
+            for page in PAGES:
+                means = {}
+                for code in languages:
+                    client = Client(headers={'accept-language': code})
+                    client.force_login(user)
+                    url = reverse(page)
+                    durations = measure(lambda: self.get(client, url), options['requests'])
+                    means[code] = sum(durations) / len(durations)
+                    self.stdout.write(summary(f'{page} [{code}]', durations))
+                baseline = means[settings.LANGUAGE_CODE]
+                self.stdout.write('  ' + '  '.join(f'{code} {mean / baseline:.2f}x' for code, mean in means.items()))
+
+    def get(self, client, url):
+        response = client.get(url)
+        if response.streaming:
+            b''.join(response.streaming_content)
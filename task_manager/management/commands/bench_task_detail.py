@@ -0,0 +1,59 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from statuses.models import Status
+from task_manager.benchmark import benchmark_database, measure, summary
+from task_manager.keyset import make_cursor
+from tasks.models import Task, TaskComment
+from tasks.views import TaskDetailView
+
+
+class Command(BaseCommand):
+    help = 'Show that the task page and deep pages of its comments stay as fast as the comment count grows'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', type=int, nargs='+', default=[0, 100, 1000, 10000], help='Numbers of comments on the task.',
+        )
+        parser.add_argument('--requests', type=int, default=50, help='Requests per page and size.')
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            user = get_user_model().objects.create_user(username='bench', password='bench-pass-123')
+            status = Status.objects.create(name='Bench')
+            task = Task.objects.create(name='Bench task', description='Benchmark task', status=status, author=user)
+            # Other tasks' comments share the table and the index
+            other = Task.objects.create(name='Other task', status=status, author=user)
+            client = Client()
+            client.force_login(user)
+            detail_url = reverse('tasks:detail', args=[task.pk])
+            comments_url = reverse('tasks:comments', args=[task.pk])
+
+            created = 0
+            for size in sorted(options['sizes']):
+                for target in (task, other):
+                    TaskComment.objects.bulk_create(
+                        (TaskComment(task=target, author=user, text=f'Comment {i}') for i in range(created, size)),
+                        batch_size=1000,
+                    )
+                Task.objects.filter(pk__in=[task.pk, other.pk]).update(comments_count=size)
+                created = size
+
+                with CaptureQueriesContext(connection) as ctx:
+                    client.get(detail_url)
+                # Read now: the next request clears the query log
+                queries = len(ctx)
+                durations = measure(lambda: client.get(detail_url), options['requests'])
+                self.stdout.write(f'{summary(f"{size} comments: page", durations)}  {queries} queries')
+
+                # The last "show older comments" page: the oldest comments, from a cursor
+                page_size = TaskDetailView.comments_page_size
+                if size > page_size:
+                    anchor = task.comments.order_by('created_at', 'pk')[page_size]
+                    url = f'{comments_url}?after={make_cursor(anchor, "created_at")}'
+                    durations = measure(lambda: client.get(url), options['requests'])
+                    self.stdout.write(summary(f'{size} comments: oldest', durations))
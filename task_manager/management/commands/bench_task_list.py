@@ -0,0 +1,58 @@
+import time
+import tracemalloc
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from statuses.models import Status
+from task_manager.benchmark import benchmark_database
+from tasks.models import Task
+
+
+class Command(BaseCommand):
+    help = 'Compare time to first byte and peak memory of the buffered and streamed task list'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', type=int, nargs='+', default=[100, 1000, 5000], help='Numbers of tasks to list.',
+        )
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            user = get_user_model().objects.create_user(username='bench', password='bench-pass-123')
+            status = Status.objects.create(name='Bench')
+            created = 0
+            for size in sorted(options['sizes']):
+                Task.objects.bulk_create(
+                    Task(name=f'Task {i}', description='Benchmark task', status=status, author=user, executor=user)
+                    for i in range(created, size)
+                )
+                created = size
+                for streaming in (False, True):
+                    self.bench(user, size, streaming)
+
+    def bench(self, user, size, streaming):
+        with override_settings(TASK_LIST_STREAMING=streaming):
+            client = Client()
+            client.force_login(user)
+            tracemalloc.start()
+            start = time.perf_counter()
+            response = client.get(reverse('tasks:list'))
+            if streaming:
+                chunks = iter(response.streaming_content)
+                total = len(next(chunks))
+                first_byte = time.perf_counter() - start
+                total += sum(len(chunk) for chunk in chunks)
+            else:
+                total = len(response.content)
+                first_byte = time.perf_counter() - start
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        mode = 'streamed' if streaming else 'buffered'
+        self.stdout.write(
+            f'{size:>6} tasks {mode:<9} ttfb {first_byte * 1000:8.1f} ms  total {elapsed * 1000:8.1f} ms  '
+            f'peak {peak / 2**20:7.1f} MiB  {total / 2**10:8.0f} KiB'
+        )
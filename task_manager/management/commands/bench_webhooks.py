@@ -0,0 +1,63 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+
+from task_manager.benchmark import benchmark_database
+from webhooks.delivery import deliver_events
+from webhooks.models import WebhookEndpoint, WebhookEvent
+from webhooks.testing import StubReceiver
+
+
+class Command(BaseCommand):
+    help = 'Measure webhook delivery throughput to local stub receivers by batch size and concurrency'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=2000, help='Events per endpoint.')
+        parser.add_argument('--endpoints', type=int, default=4, help='Number of receiving endpoints.')
+        parser.add_argument('--latency-ms', type=float, default=20, help='Time each receiver takes to answer.')
+        parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 10, 100])
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4], help='POSTs in flight per endpoint.')
+
+    def handle(self, *args, **options):
+        if options['events'] < 1 or options['endpoints'] < 1:
+            raise CommandError('--events and --endpoints must be positive.')
+        receivers = [StubReceiver(secret='bench', delay=options['latency_ms'] / 1000) for _ in range(options['endpoints'])]
+        with benchmark_database():
+            for receiver in receivers:
+                receiver.__enter__()
+            try:
+                endpoints = [WebhookEndpoint.objects.create(url=receiver.url, secret='bench') for receiver in receivers]
+                for batch_size in options['batch_sizes']:
+                    for concurrency in options['concurrency']:
+                        self.run(endpoints, receivers, options['events'], batch_size, concurrency)
+            finally:
+                for receiver in receivers:
+                    receiver.__exit__(None, None, None)
+
+    def run(self, endpoints, receivers, count, batch_size, concurrency):
+        WebhookEvent.objects.bulk_create(
+            (WebhookEvent(endpoint=endpoint, type='task.updated', payload={'id': i, 'name': f'Task {i}'})
+             for endpoint in endpoints for i in range(count)),
+            batch_size=1000,
+        )
+        for receiver in receivers:
+            receiver.requests.clear()
+            receiver.events.clear()
+        with override_settings(
+            WEBHOOK_BATCH_SIZE=batch_size,
+            WEBHOOK_ENDPOINT_CONCURRENCY=concurrency,
+            WEBHOOK_WORKERS=concurrency * len(endpoints),
+        ):
+            start = time.perf_counter()
+            while WebhookEvent.objects.filter(status=WebhookEvent.Status.PENDING).exists():
+                deliver_events()
+            duration = time.perf_counter() - start
+        received = sum(len(receiver.events) for receiver in receivers)
+        posts = sum(len(receiver.requests) for receiver in receivers)
+        if received != count * len(endpoints) or WebhookEvent.objects.exists():
+            raise CommandError(f'Only {received} of {count * len(endpoints)} events were delivered.')
+        self.stdout.write(
+            f'batch {batch_size:>4}  concurrency {concurrency:>2}  '
+            f'{received / duration:9.1f} events/s  {posts / duration:8.1f} POSTs/s'
+        )
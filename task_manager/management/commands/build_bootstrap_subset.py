@@ -0,0 +1,38 @@
+from pathlib import Path
+
+import django_bootstrap5
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.template import engines
+
+from task_manager.csspurge import purge_css, used_classes
+
+BOOTSTRAP_DIR = Path(settings.BASE_DIR) / 'static' / 'vendor' / 'bootstrap'
+
+
+def source_files():
+    """Templates and scripts whose class attributes decide what CSS is kept."""
+    for engine in engines.all():
+        for directory in getattr(engine, 'template_dirs', ()):
+            yield from sorted(Path(directory).rglob('*.html'))
+    yield from sorted((Path(django_bootstrap5.__file__).parent / 'templates').rglob('*.html'))
+    for directory in settings.STATICFILES_DIRS:
+        yield from (path for path in sorted(Path(directory).rglob('*.js')) if 'vendor' not in path.parts)
+
+
+class Command(BaseCommand):
+    help = 'Write a Bootstrap stylesheet containing only the rules our templates use'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--source', default=BOOTSTRAP_DIR / 'css' / 'bootstrap.min.css', type=Path)
+        parser.add_argument('--output', default=BOOTSTRAP_DIR / 'css' / 'bootstrap.subset.min.css', type=Path)
+
+    def handle(self, *args, **options):
+        classes, prefixes = used_classes(source_files())
+        css = options['source'].read_text(encoding='utf-8')
+        subset = purge_css(css, classes, prefixes)
+        options['output'].write_text(subset, encoding='utf-8')
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote {options["output"]}: {len(subset) // 1024} KiB (from {len(css) // 1024} KiB, '
+            f'{len(classes)} classes, {len(prefixes)} prefixes).'
+        ))
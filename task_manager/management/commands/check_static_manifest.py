@@ -0,0 +1,39 @@
+import re
+from pathlib import Path
+
+from django.contrib.staticfiles.storage import ManifestFilesMixin, staticfiles_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.template import engines
+
+# {% static 'path' %} / {% static "path" %}; tags with variables are skipped
+STATIC_TAG_RE = re.compile(r"""{%\s*static\s+(['"])(?P<path>[^'"]+)\1""")
+
+
+def referenced_static_paths():
+    """Yield (template file, static path) for every literal {% static %} tag."""
+    for engine in engines.all():
+        for directory in getattr(engine, 'template_dirs', ()):
+            for template in sorted(Path(directory).rglob('*.html')):
+                for match in STATIC_TAG_RE.finditer(template.read_text(encoding='utf-8')):
+                    yield template, match.group('path')
+
+
+class Command(BaseCommand):
+    help = 'Fail if a template references a static file missing from the staticfiles manifest'
+
+    def handle(self, *args, **options):
+        if not isinstance(staticfiles_storage, ManifestFilesMixin):
+            raise CommandError('STORAGES["staticfiles"] is not a manifest storage; nothing to check.')
+
+        manifest, _ = staticfiles_storage.load_manifest()
+        if not manifest:
+            raise CommandError('The staticfiles manifest is missing or empty; run collectstatic first.')
+
+        missing = [
+            f'{template}: {path}'
+            for template, path in referenced_static_paths()
+            if path not in manifest
+        ]
+        if missing:
+            raise CommandError('Static files missing from the manifest:\n  ' + '\n  '.join(missing))
+        self.stdout.write(self.style.SUCCESS(f'All static references found in the manifest ({len(manifest)} files).'))
@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from task_manager.translations import catalogue_problems
+
+
+class Command(BaseCommand):
+    help = 'Fail if a translation catalogue has missing, fuzzy or out-of-date entries'
+
+    def handle(self, *args, **options):
+        # The source language needs no catalogue
+        languages = [code for code, _ in settings.LANGUAGES if code != settings.LANGUAGE_CODE]
+        problems = [problem for language in languages for problem in catalogue_problems(language)]
+        if problems:
+            raise CommandError('Incomplete translation catalogues:\n  ' + '\n  '.join(problems))
+        self.stdout.write(self.style.SUCCESS(f'Translation catalogues are complete ({", ".join(languages)}).'))
@@ -0,0 +1,81 @@
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# What each target imports in a fresh interpreter
+TARGETS = {
+    'setup': 'import django; django.setup()',
+    'urls': (
+        'import django; django.setup(); '
+        'from django.urls import get_resolver; get_resolver().url_patterns'
+    ),
+    'wsgi': 'import task_manager.wsgi',
+}
+
+# import time: self [us] | cumulative | imported package
+IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$')
+
+
+def parse_importtime(output):
+    """Return [(module, self µs, cumulative µs, depth)] from ``-X importtime`` output."""
+    modules = []
+    for line in output.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            modules.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return modules
+
+
+def profile_imports(code):
+    """Run ``code`` in a fresh interpreter with ``-X importtime`` and parse the report."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=settings.BASE_DIR,
+        env={**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'task_manager.settings')},
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode:
+        raise CommandError(f'Startup failed:\n{result.stderr[-2000:]}')
+    return parse_importtime(result.stderr)
+
+
+class Command(BaseCommand):
+    help = 'Report per-module import time of a cold start (python -X importtime) and check it against a budget'
+    # Profiling runs in a subprocess; no need to load the URLconf and views here
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('--target', choices=sorted(TARGETS), default='wsgi', help='What to start (default: wsgi).')
+        parser.add_argument('--top', type=int, default=15, help='Modules and packages to list.')
+        parser.add_argument(
+            '--budget-ms', type=float, default=settings.STARTUP_IMPORT_BUDGET_MS,
+            help='Fail when the total import time exceeds this (default: STARTUP_IMPORT_BUDGET_MS).',
+        )
+
+    def handle(self, *args, **options):
+        modules = profile_imports(TARGETS[options['target']])
+        total_ms = sum(cumulative for _, _, cumulative, depth in modules if depth == 0) / 1000
+
+        packages = defaultdict(int)
+        for module, self_us, _, _ in modules:
+            packages[module.partition('.')[0]] += self_us
+
+        top = options['top']
+        self.stdout.write('Slowest modules (self time, cumulative):')
+        for module, self_us, cumulative, _ in sorted(modules, key=lambda m: -m[1])[:top]:
+            self.stdout.write(f'  {self_us / 1000:8.1f} ms {cumulative / 1000:8.1f} ms  {module}')
+        self.stdout.write('Packages (self time of all their modules):')
+        for package, self_us in sorted(packages.items(), key=lambda p: -p[1])[:top]:
+            self.stdout.write(f'  {self_us / 1000:8.1f} ms  {package}')
+
+        summary = f'{options["target"]}: {len(modules)} modules imported in {total_ms:.0f} ms'
+        if total_ms > options['budget_ms']:
+            raise CommandError(f'{summary}, over the {options["budget_ms"]:.0f} ms budget.')
+        self.stdout.write(self.style.SUCCESS(f'{summary} (budget {options["budget_ms"]:.0f} ms).'))
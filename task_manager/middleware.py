@@ -0,0 +1,142 @@
+import re
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import brotli
+except ImportError:  # Installed without Brotli; fall back to gzip only
+    brotli = None
+
+COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/javascript', 'application/xml', 'image/svg+xml')
+
+
+def accepted_encodings(header):
+    """Return the codings from an Accept-Encoding header that have a non-zero q value."""
+    codings = set()
+    for item in header.split(','):
+        coding, _, params = item.strip().partition(';')
+        q = params.strip().removeprefix('q=')
+        try:
+            if params and float(q) <= 0:
+                continue
+        except ValueError:
+            continue
+        codings.add(coding.strip().lower())
+    return codings
+
+
+def brotli_sequence(sequence, quality):
+    compressor = brotli.Compressor(quality=quality)
+    for chunk in sequence:
+        # Flush after every chunk so streamed pages still render progressively
+        data = compressor.process(chunk) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+async def abrotli_sequence(sequence, quality):
+    compressor = brotli.Compressor(quality=quality)
+    async for chunk in sequence:
+        data = compressor.process(chunk) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """Compress responses with brotli or gzip, whichever the client prefers.
+
+    Brotli is used when the client accepts ``br``; gzip otherwise. HTML is
+    always gzipped: pages reflect user input next to secrets such as the
+    CSRF token, and only the gzip path has Django's BREACH padding. Responses
+    shorter than ``COMPRESSION_MIN_LENGTH``, already encoded or of a binary
+    content type are left alone, and so are downloads that support byte
+    ranges, whose ranges refer to the uncompressed bytes. Streaming
+    responses are compressed chunk by chunk.
+    """
+
+    def process_response(self, request, response):
+        if not response.streaming and len(response.content) < settings.COMPRESSION_MIN_LENGTH:
+            return response
+        if response.has_header('Content-Encoding') or response.has_header('Accept-Ranges'):
+            return response
+        if not response.get('Content-Type', '').startswith(COMPRESSIBLE_TYPES):
+            return response
+
+        accepted = accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if brotli is None or 'br' not in accepted or response['Content-Type'].startswith('text/html'):
+            return super().process_response(request, response)
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        quality = settings.COMPRESSION_BROTLI_QUALITY
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = abrotli_sequence(response.streaming_content, quality)
+            else:
+                response.streaming_content = brotli_sequence(response.streaming_content, quality)
+            del response.headers['Content-Length']
+        else:
+            compressed_content = brotli.compress(response.content, quality=quality)
+            if len(compressed_content) >= len(response.content):
+                return response
+            response.content = compressed_content
+            response.headers['Content-Length'] = str(len(response.content))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = 'br'
+        return response
+
+
+# Elements whose whitespace is significant and left untouched
+PRESERVE_RE = re.compile(r'(<(pre|textarea|script|style)\b.*?</\2\s*>)', re.IGNORECASE | re.DOTALL)
+# Whitespace runs that span a line break, i.e. template indentation
+INDENT_RE = re.compile(r'[ \t]*\n\s*')
+
+
+def minify_html(html):
+    """Collapse indentation and blank lines outside whitespace-sensitive elements.
+
+    Each whitespace run is replaced by a single newline, which browsers render
+    the same way, so the page looks exactly as before.
+    """
+    parts = PRESERVE_RE.split(html)
+    # split() yields text, whole preserved element, tag name, text, ...
+    out = []
+    for i in range(0, len(parts), 3):
+        out.append(INDENT_RE.sub('\n', parts[i]))
+        if i + 1 < len(parts):
+            out.append(parts[i + 1])
+    return ''.join(out).strip()
+
+
+class HtmlMinifyMiddleware(MiddlewareMixin):
+    """Strip template indentation from HTML responses when ``HTML_MINIFY`` is on.
+
+    Must be listed after CompressionMiddleware so it runs before it on the
+    way out. Streaming responses are passed through unchanged.
+    """
+
+    def __init__(self, get_response):
+        if not settings.HTML_MINIFY:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def process_response(self, request, response):
+        if (
+            response.streaming
+            or response.has_header('Content-Encoding')
+            or not response.get('Content-Type', '').startswith('text/html')
+        ):
+            return response
+        charset = response.charset
+        response.content = minify_html(response.content.decode(charset)).encode(charset)
+        if response.has_header('Content-Length'):
+            response.headers['Content-Length'] = str(len(response.content))
+        return response
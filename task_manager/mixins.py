@@ -0,0 +1,105 @@
+from itertools import batched
+
+from django.contrib import messages
+from django.contrib.auth.mixins import UserPassesTestMixin
+from django.core.exceptions import ImproperlyConfigured
+from django.http import StreamingHttpResponse
+from django.shortcuts import redirect
+from django.template import Context
+from django.template.context import make_context
+from django.template.loader import get_template, select_template
+from django.utils.safestring import mark_safe
+
+
+class OwnerRequiredMixin(UserPassesTestMixin):
+    """Only the owner of the object can access the view.
+
+    Ownership is a primary key comparison: ``owner_field`` names the attribute
+    holding the owner's pk, e.g. ``author_id`` for tasks. With the default
+    ``'pk'`` the object *is* the owner (user profiles) and the check is made
+    against the URL kwarg without touching the database.
+
+    The object fetched for the check is cached, so later ``get_object()``
+    calls made by the generic view don't query it again. Denied users get
+    ``permission_denied_message`` and are redirected to
+    ``permission_denied_url``.
+    """
+
+    owner_field = 'pk'
+    permission_denied_url = None
+
+    def get_object(self, queryset=None):
+        if queryset is not None:
+            return super().get_object(queryset)
+        if not hasattr(self, '_owned_object'):
+            self._owned_object = super().get_object()
+        return self._owned_object
+
+    def test_func(self):
+        # If user isn't authenticated, let LoginRequiredMixin handle redirect to login
+        if not self.request.user.is_authenticated:
+            return True
+        if self.owner_field == 'pk':
+            return str(self.kwargs.get(self.pk_url_kwarg)) == str(self.request.user.pk)
+        return getattr(self.get_object(), self.owner_field) == self.request.user.pk
+
+    def handle_no_permission(self):
+        # If not authenticated, delegate to standard behavior (login redirect)
+        if not self.request.user.is_authenticated:
+            return super().handle_no_permission()
+        messages.error(self.request, self.get_permission_denied_message())
+        return redirect(self.permission_denied_url)
+
+
+class StreamingListMixin:
+    """Stream a list page: the page chrome first, then the rows in chunks.
+
+    When ``get_streaming()`` is true the page template is rendered without
+    rows; it must output ``{{ rows_marker }}`` where they belong (it gets
+    ``streaming`` in its context to choose between that and the usual loop).
+    The list variable only tells whether there are any rows at all. Rows are
+    then read with ``.iterator()`` (a server-side cursor on PostgreSQL) and
+    rendered ``stream_chunk_size`` at a time with ``rows_template_name``, so
+    time to first byte and memory don't grow with the number of rows. The
+    context processors run once, for the page; the rows get its flattened
+    context.
+    """
+
+    rows_template_name = None
+    stream_chunk_size = 200
+    rows_marker = mark_safe('<!-- rows -->')
+
+    def get_streaming(self):
+        return False
+
+    def render_to_response(self, context, **response_kwargs):
+        if not self.get_streaming():
+            return super().render_to_response(context, **response_kwargs)
+
+        queryset = context['object_list']
+        name = self.get_context_object_name(queryset)
+        has_rows = queryset.exists()
+        context.update({'streaming': True, 'rows_marker': self.rows_marker, 'object_list': has_rows, name: has_rows})
+        if not has_rows:
+            # Nothing to stream; the template shows its empty state
+            return super().render_to_response(context, **response_kwargs)
+
+        page_template = select_template(self.get_template_names()).template
+        page_context = make_context(context, self.request)
+        with page_context.bind_template(page_template):
+            page = page_template.render(page_context)
+            flat_context = page_context.flatten()
+        if self.rows_marker not in page:
+            raise ImproperlyConfigured(f'{self.get_template_names()} does not render {{{{ rows_marker }}}}.')
+        head, tail = page.split(self.rows_marker, 1)
+        rows_template = get_template(self.rows_template_name).template
+
+        def stream():
+            yield head
+            for chunk in batched(queryset.iterator(chunk_size=self.stream_chunk_size), self.stream_chunk_size):
+                rows_context = Context({**flat_context, name: chunk}, autoescape=rows_template.engine.autoescape)
+                yield rows_template.render(rows_context)
+            yield tail
+
+        response_kwargs.setdefault('content_type', self.content_type)
+        return StreamingHttpResponse(stream(), **response_kwargs)
@@ -10,17 +10,21 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+from importlib.util import find_spec
 from pathlib import Path
 import os
-from dotenv import load_dotenv
 import dj_database_url
 
-# Load environment variables from .env file
-load_dotenv()
-
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Load environment variables from .env file (development); deployments set
+# them directly, so don't import python-dotenv or search for the file there.
+if (BASE_DIR / '.env').exists():
+    from dotenv import load_dotenv
+
+    load_dotenv(BASE_DIR / '.env')
+
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/6.0/howto/deployment/checklist/
 
@@ -44,30 +48,48 @@ SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
 # Application definition
 
 INSTALLED_APPS = [
-    'django.contrib.admin',  # Админка уже включена
+    # Admin modules are discovered in urls.py, so commands that never load
+    # the URLconf (workers) don't import them
+    'django.contrib.admin.apps.SimpleAdminConfig',
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'django_bootstrap5',
+    'task_manager',
     'users',
     'statuses',
+    'labels',
     'tasks',  # добавлено
+    'jobs',
+    'audit',
+    'notifications',
+    'webhooks',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',  # Для статических файлов в продакшене
+    'task_manager.middleware.CompressionMiddleware',
+    'task_manager.middleware.HtmlMinifyMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',  # Основной middleware для аутентификации
+    'audit.middleware.AuditMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Dynamic responses are compressed with brotli or gzip (always gzip for HTML,
+# which gets Django's BREACH padding); static files are precompressed by
+# collectstatic instead. HTML_MINIFY strips template indentation first.
+COMPRESSION_MIN_LENGTH = int(os.getenv('COMPRESSION_MIN_LENGTH', '512'))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv('COMPRESSION_BROTLI_QUALITY', '5'))
+HTML_MINIFY = os.getenv('HTML_MINIFY', 'False') == 'True'
+
 ROOT_URLCONF = 'task_manager.urls'
 
 TEMPLATES = [
@@ -80,6 +102,8 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'task_manager.context_processors.static_assets',
+                'tasks.context_processors.my_work',
             ],
         },
     },
@@ -89,6 +113,10 @@ WSGI_APPLICATION = 'task_manager.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
+# Connections are kept open for CONN_MAX_AGE (600 s), one per gunicorn worker
+# thread: WEB_CONCURRENCY * GUNICORN_THREADS per instance, (cores + 1) * 4 by
+# default (see gunicorn.conf.py), plus run_worker's --concurrency. Keep the sum
+# over all instances below the database's max_connections.
 
 DATABASES = {
     'default': dj_database_url.config(
@@ -98,6 +126,43 @@ DATABASES = {
     )
 }
 
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+# Set REDIS_URL to share the cache between gunicorn workers; otherwise every
+# process keeps its own in-memory cache.
+
+REDIS_URL = os.getenv('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Sessions
+# https://docs.djangoproject.com/en/6.0/topics/http/sessions/
+# SESSION_BACKEND is one of: signed_cookies, cached_db, cache, file, db.
+# Signed cookies need no storage at all. cached_db is only safe with a shared
+# cache (REDIS_URL): with per-process caches a logout in one worker would not
+# be seen by the others. Expired rows of db-backed engines are removed by
+# `manage.py clearsessions` (make clearsessions).
+
+SESSION_BACKEND = os.getenv('SESSION_BACKEND', 'cached_db' if REDIS_URL else 'signed_cookies')
+SESSION_ENGINE = f'django.contrib.sessions.backends.{SESSION_BACKEND}'
+SESSION_FILE_PATH = os.getenv('SESSION_FILE_PATH') or None
+
+# Flash messages travel in a cookie instead of the session, so views calling
+# messages.success() don't cause a session write (and read) per round trip.
+MESSAGE_STORAGE = 'django.contrib.messages.storage.cookie.CookieStorage'
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -116,6 +181,35 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing
+# https://docs.djangoproject.com/en/6.0/topics/auth/passwords/
+# New passwords use PASSWORD_HASHER; the remaining hashers stay listed so older
+# hashes still verify and are transparently re-hashed on the next login.
+# Argon2 (from the argon2-cffi dependency) is the default; scrypt is the
+# fallback for environments installed without it.
+
+PASSWORD_HASHER_CHOICES = {
+    'argon2': 'users.hashers.TunedArgon2PasswordHasher',
+    'scrypt': 'users.hashers.TunedScryptPasswordHasher',
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+}
+PASSWORD_HASHER = os.getenv('PASSWORD_HASHER', 'argon2' if find_spec('argon2') else 'scrypt')
+
+PASSWORD_HASHERS = [PASSWORD_HASHER_CHOICES[PASSWORD_HASHER]] + [
+    hasher for name, hasher in PASSWORD_HASHER_CHOICES.items() if name != PASSWORD_HASHER
+] + [
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+
+# Tuned for ~40 ms (argon2) / ~130 ms (scrypt) per hash instead of ~600 ms
+# for Django's default PBKDF2 (see `manage.py bench_login`).
+PASSWORD_ARGON2_TIME_COST = int(os.getenv('PASSWORD_ARGON2_TIME_COST', '2'))
+PASSWORD_ARGON2_MEMORY_COST = int(os.getenv('PASSWORD_ARGON2_MEMORY_COST', '19456'))  # KiB
+PASSWORD_ARGON2_PARALLELISM = int(os.getenv('PASSWORD_ARGON2_PARALLELISM', '1'))
+PASSWORD_SCRYPT_WORK_FACTOR = int(os.getenv('PASSWORD_SCRYPT_WORK_FACTOR', str(2 ** 15)))
+PASSWORD_SCRYPT_BLOCK_SIZE = int(os.getenv('PASSWORD_SCRYPT_BLOCK_SIZE', '8'))
+PASSWORD_SCRYPT_PARALLELISM = int(os.getenv('PASSWORD_SCRYPT_PARALLELISM', '1'))
+
 # Internationalization
 # https://docs.djangoproject.com/en/6.0/topics/i18n/
 
@@ -141,6 +235,37 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 STATIC_ROOT = BASE_DIR / "staticfiles"
+STATICFILES_DIRS = [BASE_DIR / 'static']
+
+# Uploaded files (task attachments). They are not served from a public URL:
+# downloads go through a view that checks the user is logged in, and can
+# be handed to the web server with FILE_DOWNLOAD_OFFLOAD = 'x-sendfile'
+# (Apache, lighttpd) or 'x-accel-redirect' (nginx, with an internal
+# location at FILE_DOWNLOAD_ACCEL_PREFIX aliased to MEDIA_ROOT).
+MEDIA_ROOT = Path(os.getenv('MEDIA_ROOT', BASE_DIR / 'media'))
+ATTACHMENT_MAX_SIZE = int(os.getenv('ATTACHMENT_MAX_SIZE', str(2 * 2**30)))
+FILE_DOWNLOAD_OFFLOAD = os.getenv('FILE_DOWNLOAD_OFFLOAD', '')
+FILE_DOWNLOAD_ACCEL_PREFIX = os.getenv('FILE_DOWNLOAD_ACCEL_PREFIX', '/protected-media/')
+
+# collectstatic writes content-hashed copies of every file plus a manifest,
+# and pre-compresses them (gzip and brotli). WhiteNoise serves the precompressed variants and marks hashed
+# files as `Cache-Control: public, max-age=315360000, immutable`; unhashed
+# URLs get WHITENOISE_MAX_AGE. `manage.py check_static_manifest` fails the
+# build if a template references a file missing from the manifest.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+    },
+}
+WHITENOISE_MAX_AGE = int(os.getenv('WHITENOISE_MAX_AGE', '3600'))
+
+# Bootstrap is vendored under static/vendor/bootstrap. With BOOTSTRAP_CSS_SUBSET
+# pages link a stylesheet purged down to the classes our templates use, built
+# by `manage.py build_bootstrap_subset` before collectstatic.
+BOOTSTRAP_CSS_SUBSET = os.getenv('BOOTSTRAP_CSS_SUBSET', 'False') == 'True'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -151,3 +276,73 @@ LOGOUT_REDIRECT_URL = 'home'
 
 # Настройки для админки
 ADMIN_URL = os.getenv('ADMIN_URL', 'admin/')
+
+# `manage.py profile_startup` fails when a cold start spends longer than this
+# importing modules
+STARTUP_IMPORT_BUDGET_MS = int(os.getenv('STARTUP_IMPORT_BUDGET_MS', '500'))
+
+# Send the task list page chrome immediately and stream the rows in chunks
+# from a server-side cursor instead of rendering the whole page in memory
+TASK_LIST_STREAMING = os.getenv('TASK_LIST_STREAMING', 'False') == 'True'
+
+# Seconds the navbar's "my work" count is cached per user; changes to the
+# user's tasks drop it sooner (in this process, or everywhere with REDIS_URL)
+MY_WORK_COUNT_CACHE_TIMEOUT = int(os.getenv('MY_WORK_COUNT_CACHE_TIMEOUT', '300'))
+
+# The PostgreSQL-only INCLUDE columns of covering indexes are left out on
+# SQLite, which is fine for development and tests
+SILENCED_SYSTEM_CHECKS = ['models.W040']
+
+# A background job re-spaces the rank keys of a board column once one of
+# them gets longer than the first; a key longer than the second is never
+# stored, the column is re-spaced at once instead (see tasks/ranking.py).
+# The rank column holds up to 255 characters.
+TASK_RANK_REBALANCE_LENGTH = int(os.getenv('TASK_RANK_REBALANCE_LENGTH', '24'))
+TASK_RANK_MAX_LENGTH = int(os.getenv('TASK_RANK_MAX_LENGTH', '64'))
+
+# Background jobs (database-backed queue, see jobs/queue.py)
+JOBS_WORKER_CONCURRENCY = int(os.getenv('JOBS_WORKER_CONCURRENCY', '2'))
+JOBS_POLL_INTERVAL = float(os.getenv('JOBS_POLL_INTERVAL', '1.0'))
+JOBS_MAX_ATTEMPTS = int(os.getenv('JOBS_MAX_ATTEMPTS', '3'))
+JOBS_RETRY_BACKOFF = int(os.getenv('JOBS_RETRY_BACKOFF', '10'))  # seconds, doubled on every retry
+JOBS_RETRY_BACKOFF_MAX = int(os.getenv('JOBS_RETRY_BACKOFF_MAX', '3600'))
+# Lease on a running job in seconds; its worker renews it every third of that,
+# so only jobs of a worker that died are requeued once it expires
+JOBS_STALE_TIMEOUT = int(os.getenv('JOBS_STALE_TIMEOUT', '300'))
+
+# Email. Locally messages are printed by the console backend; use
+# django.core.mail.backends.filebased.EmailBackend to keep them in
+# EMAIL_FILE_PATH, or smtp.EmailBackend with the EMAIL_HOST settings
+EMAIL_BACKEND = os.getenv('EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
+EMAIL_FILE_PATH = os.getenv('EMAIL_FILE_PATH', str(BASE_DIR / 'sent_emails'))
+EMAIL_HOST = os.getenv('EMAIL_HOST', 'localhost')
+EMAIL_PORT = int(os.getenv('EMAIL_PORT', '25'))
+EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER', '')
+EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD', '')
+EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS', 'False') == 'True'
+DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', 'Task Manager <noreply@localhost>')
+
+# Scheme and host that links in emails point to
+SITE_URL = os.getenv('SITE_URL', 'http://localhost:8000').rstrip('/')
+
+# Digest emails are sent over one mail connection in batches of this many
+# recipients (see notifications/digests.py)
+NOTIFICATION_DIGEST_BATCH_SIZE = int(os.getenv('NOTIFICATION_DIGEST_BATCH_SIZE', '100'))
+
+# Outgoing webhooks (see webhooks/delivery.py): events per POST, POSTs in
+# flight in all and per endpoint, request timeout (seconds), events per
+# delivery run, and attempts before an event is given up on, retried after
+# WEBHOOK_RETRY_BACKOFF seconds, doubled every time
+WEBHOOK_BATCH_SIZE = int(os.getenv('WEBHOOK_BATCH_SIZE', '100'))
+WEBHOOK_WORKERS = int(os.getenv('WEBHOOK_WORKERS', '8'))
+WEBHOOK_ENDPOINT_CONCURRENCY = int(os.getenv('WEBHOOK_ENDPOINT_CONCURRENCY', '2'))
+WEBHOOK_TIMEOUT = int(os.getenv('WEBHOOK_TIMEOUT', '10'))
+WEBHOOK_EVENTS_PER_RUN = int(os.getenv('WEBHOOK_EVENTS_PER_RUN', '1000'))
+WEBHOOK_MAX_ATTEMPTS = int(os.getenv('WEBHOOK_MAX_ATTEMPTS', '8'))
+WEBHOOK_RETRY_BACKOFF = int(os.getenv('WEBHOOK_RETRY_BACKOFF', '10'))
+WEBHOOK_RETRY_BACKOFF_MAX = int(os.getenv('WEBHOOK_RETRY_BACKOFF_MAX', '3600'))
+
+# Audit log (see audit/): monthly partitions created ahead of time on
+# PostgreSQL by `manage.py create_audit_partitions` on deploy and by a
+# monthly job on the jobs queue in between
+AUDIT_PARTITIONS_AHEAD = int(os.getenv('AUDIT_PARTITIONS_AHEAD', '3'))
@@ -0,0 +1,40 @@
+"""Settings for the test suite, picked by `manage.py test`.
+
+Same as production settings except where that makes tests slow: cheap
+password hashes (tests only need to verify, not resist cracking), an
+in-memory SQLite database (TEST_DATABASE_URL selects another one, e.g.
+PostgreSQL for the backend-specific tests), no WhiteNoise or manifest
+lookups since tests never run collectstatic, and templates compiled once
+per process. The cache is a dummy, so nothing cached leaks from one test
+into the next; tests of caching override CACHES.
+"""
+import os
+
+import dj_database_url
+
+from task_manager.settings import *  # noqa: F403
+from task_manager.settings import MIDDLEWARE, STORAGES, TEMPLATES
+
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+CACHES = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+
+if os.getenv('TEST_DATABASE_URL'):
+    DATABASES = {'default': dj_database_url.parse(os.environ['TEST_DATABASE_URL'])}
+else:
+    DATABASES = {'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}}
+
+MIDDLEWARE = [name for name in MIDDLEWARE if name != 'whitenoise.middleware.WhiteNoiseMiddleware']
+STORAGES = {**STORAGES, 'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'}}
+
+TEMPLATES = [{
+    **TEMPLATES[0],
+    'APP_DIRS': False,
+    'OPTIONS': {
+        **TEMPLATES[0]['OPTIONS'],
+        'loaders': [(
+            'django.template.loaders.cached.Loader',
+            ['django.template.loaders.filesystem.Loader', 'django.template.loaders.app_directories.Loader'],
+        )],
+    },
+}]
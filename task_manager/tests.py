@@ -1,22 +1,46 @@
-from django.test import TestCase, Client
+import gzip
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import skipUnless
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import translation
 from django.contrib.auth.models import User
 
 from statuses.models import Status
+from task_manager import middleware
+from task_manager.csspurge import purge_css, used_classes
+from task_manager.downloads import parse_range, serve_file
+from task_manager.middleware import CompressionMiddleware, HtmlMinifyMiddleware, minify_html
+from task_manager.translations import catalogue_problems, preload_catalogs, read_po
+from task_manager.warmup import load_templates, run_in_each_thread, warm_up
+from task_manager.management.commands.profile_startup import parse_importtime
 from tasks.models import Task
 
 class TasksURLsTestCase(TestCase):
-    def setUp(self):
-        self.client = Client()
-        self.author = User.objects.create_user(username='author', password='pass12345')
-        self.executor = User.objects.create_user(username='executor', password='pass12345')
-        self.status = Status.objects.create(name='New')
-        self.task = Task.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='author', password='pass12345')
+        cls.executor = User.objects.create_user(username='executor', password='pass12345')
+        cls.status = Status.objects.create(name='New')
+        cls.task = Task.objects.create(
             name='Initial',
             description='Desc',
-            status=self.status,
-            author=self.author,
-            executor=self.executor,
+            status=cls.status,
+            author=cls.author,
+            executor=cls.executor,
         )
 
     def test_list_requires_login(self):
@@ -100,3 +124,373 @@ class TasksURLsTestCase(TestCase):
         self.assertEqual(resp.status_code, 200)
         self.assertEqual(resp.context['task'].id, self.task.id)
 
+
+
+class SessionAndMessagesStorageTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='author', password='pass12345')
+        cls.status = Status.objects.create(name='New')
+        cls.task = Task.objects.create(name='Initial', status=cls.status, author=cls.author)
+
+    def setUp(self):
+        self.client.login(username='author', password='pass12345')
+
+    def test_messages_are_stored_in_cookie(self):
+        resp = self.client.post(reverse('tasks:update', args=[self.task.id]), {
+            'name': 'Updated',
+            'status': self.status.id,
+        })
+        self.assertEqual(resp.status_code, 302)
+        self.assertIn(CookieStorage.cookie_name, resp.cookies)
+
+    @override_settings(SESSION_ENGINE='django.contrib.sessions.backends.signed_cookies')
+    def test_edit_round_trip_does_not_touch_session_table(self):
+        self.client.login(username='author', password='pass12345')
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.post(reverse('tasks:update', args=[self.task.id]), {
+                'name': 'Updated',
+                'status': self.status.id,
+            }, follow=True)
+        self.assertContains(resp, 'Updated')
+        self.assertFalse([q for q in ctx.captured_queries if 'django_session' in q['sql']])
+
+
+MANIFEST_STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage'},
+}
+
+
+class StaticManifestCheckTests(TestCase):
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        root = Path(self.tmp.name)
+        (root / 'static').mkdir()
+        (root / 'templates').mkdir()
+        (root / 'static' / 'staticfiles.json').write_text(json.dumps({
+            'version': '1.1',
+            'paths': {'js/autocomplete.js': 'js/autocomplete.0123456789ab.js'},
+        }))
+        self.templates_dir = root / 'templates'
+        self.settings = override_settings(
+            STATIC_ROOT=root / 'static',
+            STORAGES=MANIFEST_STORAGES,
+            TEMPLATES=[{
+                'BACKEND': 'django.template.backends.django.DjangoTemplates',
+                'DIRS': [self.templates_dir],
+            }],
+        )
+        self.settings.enable()
+        self.addCleanup(self.settings.disable)
+
+    def test_passes_when_all_references_are_in_manifest(self):
+        (self.templates_dir / 'ok.html').write_text("{% load static %}<script src=\"{% static 'js/autocomplete.js' %}\"></script>")
+        out = StringIO()
+        call_command('check_static_manifest', stdout=out)
+        self.assertIn('All static references', out.getvalue())
+
+    def test_fails_on_missing_reference(self):
+        (self.templates_dir / 'broken.html').write_text("{% load static %}{% static 'css/missing.css' %}")
+        with self.assertRaisesMessage(CommandError, 'css/missing.css'):
+            call_command('check_static_manifest')
+
+
+class SelfHostedBootstrapTests(TestCase):
+    def test_pages_use_vendored_bootstrap(self):
+        response = self.client.get(reverse('login'))
+        self.assertContains(response, '/static/vendor/bootstrap/css/bootstrap.min.css')
+        self.assertContains(response, '/static/vendor/bootstrap/js/bootstrap.min.js')
+        self.assertNotContains(response, 'cdn.jsdelivr.net')
+
+    @override_settings(BOOTSTRAP_CSS_SUBSET=True)
+    def test_subset_stylesheet_when_enabled(self):
+        response = self.client.get(reverse('login'))
+        self.assertContains(response, '/static/vendor/bootstrap/css/bootstrap.subset.min.css')
+
+
+class CssPurgeTests(TestCase):
+    CSS = (
+        '@charset "UTF-8";/*! banner */:root{--bs-blue:#0d6efd}'
+        '.btn{color:red}.card,.btn-primary{color:blue}.unused{color:green}'
+        '.btn:not(.unused){margin:0}.alert-danger{color:red}'
+        '@media (min-width:576px){.unused{a:b}.container{max-width:540px}}'
+        '@keyframes spin{to{transform:rotate(360deg)}}'
+    )
+
+    def test_keeps_only_used_rules(self):
+        css = purge_css(self.CSS, {'btn', 'btn-primary', 'container'}, ('alert-',))
+        self.assertEqual(
+            css,
+            '@charset "UTF-8";/*! banner */:root{--bs-blue:#0d6efd}'
+            '.btn{color:red}.btn-primary{color:blue}'
+            '.btn:not(.unused){margin:0}.alert-danger{color:red}'
+            '@media (min-width:576px){.container{max-width:540px}}'
+            '@keyframes spin{to{transform:rotate(360deg)}}',
+        )
+
+    def test_drops_empty_media_blocks(self):
+        self.assertNotIn('@media', purge_css(self.CSS, set()))
+
+    def test_used_classes_from_templates(self):
+        with TemporaryDirectory() as tmp:
+            template = Path(tmp) / 'page.html'
+            template.write_text(
+                '<div class="card {% if x %}text-muted{% endif %} alert-{{ message.tags }}">'
+                "<span class='badge'></span>"
+            )
+            classes, prefixes = used_classes([template])
+        self.assertTrue({'card', 'text-muted', 'badge'} <= classes)
+        self.assertIn('alert-', prefixes)
+
+
+@override_settings(COMPRESSION_MIN_LENGTH=100)
+class CompressionMiddlewareTests(SimpleTestCase):
+    BODY = b'<tr><td>task</td></tr>\n' * 50
+
+    def compress(self, accept_encoding, response=None):
+        request = RequestFactory().get('/', headers={'accept-encoding': accept_encoding})
+        response = response or HttpResponse(self.BODY, content_type='application/json')
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_gzip(self):
+        response = self.compress('gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), self.BODY)
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    @skipUnless(middleware.brotli, 'Brotli is not installed')
+    def test_brotli_preferred_when_accepted(self):
+        response = self.compress('gzip, deflate, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(middleware.brotli.decompress(response.content), self.BODY)
+        self.assertEqual(response['Content-Length'], str(len(response.content)))
+
+    @skipUnless(middleware.brotli, 'Brotli is not installed')
+    def test_html_is_gzipped_with_breach_padding_even_when_brotli_is_accepted(self):
+        response = self.compress('gzip, br', HttpResponse(self.BODY))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), self.BODY)
+
+    def test_brotli_refused_with_zero_quality(self):
+        response = self.compress('br;q=0, gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+
+    @skipUnless(middleware.brotli, 'Brotli is not installed')
+    def test_streaming_brotli(self):
+        streaming = StreamingHttpResponse(iter([self.BODY, self.BODY]), content_type='application/json')
+        response = self.compress('br', streaming)
+        body = b''.join(response.streaming_content)
+        self.assertEqual(middleware.brotli.decompress(body), self.BODY * 2)
+        self.assertFalse(response.has_header('Content-Length'))
+
+    def test_short_and_binary_responses_are_untouched(self):
+        self.assertFalse(self.compress('gzip', HttpResponse(b'short')).has_header('Content-Encoding'))
+        image = HttpResponse(self.BODY, content_type='image/png')
+        self.assertFalse(self.compress('gzip', image).has_header('Content-Encoding'))
+
+    def test_identity(self):
+        self.assertFalse(self.compress('identity').has_header('Content-Encoding'))
+
+    def test_range_responses_are_untouched(self):
+        # Byte ranges refer to the uncompressed file
+        response = HttpResponse(self.BODY, content_type='text/plain')
+        response['Accept-Ranges'] = 'bytes'
+        self.assertFalse(self.compress('gzip', response).has_header('Content-Encoding'))
+
+
+class FileDownloadTests(SimpleTestCase):
+    DATA = bytes(range(256)) * 40
+
+    def setUp(self):
+        directory = TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / 'file.bin'
+        self.path.write_bytes(self.DATA)
+
+    def download(self, **headers):
+        request = RequestFactory().get('/', headers=headers)
+        response = serve_file(request, self.path, 'report.pdf', etag='abc', storage_name='attachments/1/file')
+        self.addCleanup(response.close)
+        return response
+
+    def test_parse_range(self):
+        self.assertEqual(parse_range('bytes=0-99', 1000), (0, 99))
+        self.assertEqual(parse_range('bytes=900-', 1000), (900, 999))
+        self.assertEqual(parse_range('bytes=-100', 1000), (900, 999))
+        self.assertEqual(parse_range('bytes=990-2000', 1000), (990, 999))
+        self.assertEqual(parse_range('bytes=-5000', 1000), (0, 999))
+        for ignored in (None, '', 'bytes=0-1,5-6', 'items=0-1', 'bytes=-'):
+            self.assertIsNone(parse_range(ignored, 1000))
+        for unsatisfiable in ('bytes=1000-', 'bytes=5-4', 'bytes=-0'):
+            with self.assertRaises(ValueError):
+                parse_range(unsatisfiable, 1000)
+
+    def test_whole_file(self):
+        response = self.download()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.DATA)
+        self.assertEqual(response['Content-Length'], str(len(self.DATA)))
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(response['ETag'], '"abc"')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="report.pdf"')
+
+    def test_range(self):
+        response = self.download(range='bytes=100-299')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b''.join(response.streaming_content), self.DATA[100:300])
+        self.assertEqual(response['Content-Range'], f'bytes 100-299/{len(self.DATA)}')
+        self.assertEqual(response['Content-Length'], '200')
+
+    def test_unsatisfiable_range(self):
+        response = self.download(range=f'bytes={len(self.DATA)}-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(self.DATA)}')
+
+    def test_if_range(self):
+        self.assertEqual(self.download(range='bytes=0-9', if_range='"abc"').status_code, 206)
+        # The file changed since the client's copy: send all of it
+        self.assertEqual(self.download(range='bytes=0-9', if_range='"old"').status_code, 200)
+
+    @override_settings(FILE_DOWNLOAD_OFFLOAD='x-accel-redirect', FILE_DOWNLOAD_ACCEL_PREFIX='/protected-media/')
+    def test_x_accel_redirect(self):
+        response = self.download(range='bytes=0-9')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/attachments/1/file')
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="report.pdf"')
+
+    @override_settings(FILE_DOWNLOAD_OFFLOAD='x-sendfile')
+    def test_x_sendfile(self):
+        self.assertEqual(self.download()['X-Sendfile'], str(self.path))
+
+
+class HtmlMinifyTests(SimpleTestCase):
+    def test_collapses_indentation(self):
+        html = '<ul>\n    <li>One</li>\n\n    <li>Two</li>\n</ul>\n'
+        self.assertEqual(minify_html(html), '<ul>\n<li>One</li>\n<li>Two</li>\n</ul>')
+
+    def test_keeps_whitespace_sensitive_elements(self):
+        html = '<div>\n  <pre>  a\n    b</pre>\n  <textarea>\n  x</textarea>\n</div>'
+        self.assertEqual(minify_html(html), '<div>\n<pre>  a\n    b</pre>\n<textarea>\n  x</textarea>\n</div>')
+
+    @override_settings(HTML_MINIFY=True)
+    def test_middleware_minifies_html(self):
+        response = HttpResponse('<p>\n    text\n</p>')
+        response = HtmlMinifyMiddleware(lambda request: response)(RequestFactory().get('/'))
+        self.assertEqual(response.content, b'<p>\ntext\n</p>')
+
+    @override_settings(HTML_MINIFY=False)
+    def test_disabled_by_setting(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            HtmlMinifyMiddleware(lambda request: HttpResponse())
+
+
+PO = """#, fuzzy
+msgid ""
+msgstr ""
+"Content-Type: text/plain; charset=UTF-8\\n"
+
+#: templates/a.html:1
+msgid "Tasks"
+msgstr "Задачи"
+
+msgid ""
+"Long "
+"text"
+msgstr ""
+"Длинный "
+"текст"
+
+#, fuzzy
+#| msgid "Edit"
+msgid "Edit task"
+msgstr "Изменить"
+
+msgid "Delete"
+msgstr ""
+
+#~ msgid "Old"
+#~ msgstr "Старое"
+"""
+
+
+class TranslationCatalogueTests(SimpleTestCase):
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = Path(self.tmp.name)
+        catalogue = self.root / 'locale' / 'ru' / 'LC_MESSAGES'
+        catalogue.mkdir(parents=True)
+        (catalogue / 'django.po').write_text(PO, encoding='utf-8')
+        (self.root / 'templates').mkdir()
+        (self.root / 'templates' / 'a.html').write_text('{% trans "Tasks" %}{% translate \'New\' %}')
+        (self.root / 'views.py').write_text("from django.utils.translation import gettext_lazy as _\nmessage = _('Saved')\n")
+
+    def test_read_po(self):
+        entries = read_po(self.root / 'locale' / 'ru' / 'LC_MESSAGES' / 'django.po')
+        self.assertEqual(
+            [(entry['msgid'], entry['msgstr']) for entry in entries],
+            [('Tasks', ['Задачи']), ('Long text', ['Длинный текст']), ('Edit task', ['Изменить']), ('Delete', [''])],
+        )
+        self.assertIn('fuzzy', entries[2]['flags'])
+
+    def test_catalogue_problems(self):
+        with override_settings(LOCALE_PATHS=[self.root / 'locale']):
+            problems = catalogue_problems('ru', base_dir=self.root)
+        self.assertEqual(len(problems), 4)
+        for text in ('fuzzy translation for "Edit task"', 'missing translation for "Delete"',
+                     '"New" from templates/a.html', '"Saved" from views.py'):
+            self.assertTrue(any(text in problem for problem in problems), text)
+
+    def test_missing_catalogue(self):
+        with override_settings(LOCALE_PATHS=[self.root / 'nowhere']):
+            self.assertEqual(catalogue_problems('ru'), ['ru: no django.po in LOCALE_PATHS'])
+
+    def test_project_catalogues_are_complete(self):
+        out = StringIO()
+        call_command('check_translations', stdout=out)
+        self.assertIn('complete', out.getvalue())
+
+    def test_preload_catalogs(self):
+        preload_catalogs()
+        self.assertTrue({'en', 'ru'} <= set(translation.trans_real._translations))
+
+
+class WarmupTests(TestCase):
+    def test_warm_up_runs_every_step(self):
+        timings = warm_up()
+        self.assertEqual(list(timings), ['connections', 'urls', 'templates', 'caches'])
+
+    def test_project_templates_compile(self):
+        self.assertGreater(load_templates(), 10)
+
+    def test_run_in_each_thread(self):
+        idents = set()
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            run_in_each_thread(executor, 3, lambda: idents.add(threading.get_ident()))
+        self.assertEqual(len(idents), 3)
+
+
+class StartupProfileTests(TestCase):
+    def test_parse_importtime(self):
+        output = (
+            'import time: self [us] | cumulative | imported package\n'
+            'import time:       120 |        120 |   django.utils.version\n'
+            'import time:       588 |        708 | django\n'
+        )
+        self.assertEqual(parse_importtime(output), [('django.utils.version', 120, 120, 1), ('django', 588, 708, 0)])
+
+    def test_reports_and_checks_budget(self):
+        out = StringIO()
+        with self.assertRaisesMessage(CommandError, 'over the 1 ms budget'):
+            call_command('profile_startup', '--target', 'setup', '--top', '3', '--budget-ms', '1', stdout=out)
+        self.assertIn('Slowest modules', out.getvalue())
+        self.assertIn('django', out.getvalue())
+
+    def test_admin_modules_are_discovered_by_the_urlconf(self):
+        from django.contrib import admin
+
+        self.client.get(reverse('home'))
+        self.assertTrue(admin.site.is_registered(Task))
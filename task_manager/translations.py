@@ -0,0 +1,112 @@
+"""Translation catalogue helpers: completeness checks and worker preloading."""
+import ast
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import translation
+
+TRANS_TAG_RE = re.compile(r"""{%\s*(?:trans|translate)\s+(["'])(?P<msgid>.*?)\1""")
+GETTEXT_FUNCTIONS = {'_', 'gettext', 'gettext_lazy', 'gettext_noop'}
+SKIP_DIRS = {'migrations', 'tests', 'locale', 'static', 'staticfiles', 'venv', '.venv', 'node_modules'}
+
+
+def read_po(path):
+    """Parse a .po file into a list of entries: dicts with msgid, msgstr (list) and flags.
+
+    Entries are separated by blank lines, as makemessages writes them.
+    Obsolete (``#~``) entries and the header are skipped.
+    """
+    entries, entry, field = [], None, None
+    for line in Path(path).read_text(encoding='utf-8').splitlines() + ['']:
+        line = line.strip()
+        if line.startswith('#~'):
+            continue
+        if not line:
+            if entry and entry['msgid']:
+                entries.append(entry)
+            entry = field = None
+            continue
+        if entry is None:
+            entry = {'msgid': '', 'msgstr': [], 'flags': set()}
+        if line.startswith('#,'):
+            entry['flags'].update(flag.strip() for flag in line[2:].split(','))
+        elif line.startswith('"'):
+            if field == 'msgid':
+                entry['msgid'] += ast.literal_eval(line)
+            elif field == 'msgstr':
+                entry['msgstr'][-1] += ast.literal_eval(line)
+        elif not line.startswith('#'):
+            keyword, _, value = line.partition(' ')
+            if keyword == 'msgid':
+                entry['msgid'], field = ast.literal_eval(value), 'msgid'
+            elif keyword.startswith('msgstr'):
+                entry['msgstr'].append(ast.literal_eval(value))
+                field = 'msgstr'
+            else:  # msgctxt, msgid_plural
+                field = None
+    return entries
+
+
+def source_messages(base_dir=None):
+    """Yield (file, msgid) for literal strings marked for translation in the project.
+
+    Covers ``{% trans %}``/``{% translate %}`` tags in templates and calls to
+    ``_``/``gettext``/``gettext_lazy``/``gettext_noop`` with a string literal
+    in Python modules.
+    """
+    base_dir = Path(base_dir or settings.BASE_DIR)
+    for path in sorted(base_dir.rglob('*')):
+        if SKIP_DIRS.intersection(path.relative_to(base_dir).parts) or not path.is_file():
+            continue
+        if path.suffix == '.html':
+            for match in TRANS_TAG_RE.finditer(path.read_text(encoding='utf-8')):
+                yield path, match.group('msgid')
+        elif path.suffix == '.py':
+            for node in ast.walk(ast.parse(path.read_text(encoding='utf-8'))):
+                if (
+                    isinstance(node, ast.Call)
+                    and getattr(node.func, 'id', getattr(node.func, 'attr', None)) in GETTEXT_FUNCTIONS
+                    and node.args
+                    and isinstance(node.args[0], ast.Constant)
+                    and isinstance(node.args[0].value, str)
+                ):
+                    yield path, node.args[0].value
+
+
+def catalogue_problems(language, base_dir=None):
+    """Return a list of human-readable problems with ``language``'s django.po."""
+    base_dir = Path(base_dir or settings.BASE_DIR)
+    for locale_path in settings.LOCALE_PATHS:
+        po = Path(locale_path) / language / 'LC_MESSAGES' / 'django.po'
+        if po.exists():
+            break
+    else:
+        return [f'{language}: no django.po in LOCALE_PATHS']
+
+    problems = []
+    entries = read_po(po)
+    for entry in entries:
+        if 'fuzzy' in entry['flags']:
+            problems.append(f'{po}: fuzzy translation for "{entry["msgid"]}"')
+        elif not all(entry['msgstr']):
+            problems.append(f'{po}: missing translation for "{entry["msgid"]}"')
+    known = {entry['msgid'] for entry in entries}
+    for path, msgid in source_messages(base_dir):
+        if msgid not in known:
+            problems.append(f'{po}: "{msgid}" from {path.relative_to(base_dir)} is not in the catalogue')
+            known.add(msgid)
+    return problems
+
+
+def preload_catalogs():
+    """Load and merge the catalogues for every language in LANGUAGES.
+
+    Django builds a language's merged catalogue (project + all installed apps)
+    on the first request that uses it and caches it per process; doing it at
+    worker start keeps that cost out of the first request in each language.
+    """
+    for code, _ in settings.LANGUAGES:
+        # activate() loads and caches the catalogue
+        with translation.override(code):
+            pass
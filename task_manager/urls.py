@@ -25,6 +25,8 @@ def home(request):
     return render(request, 'home.html')
 
 
+admin.autodiscover()
+
 urlpatterns = [
     path('', home, name='home'),
     path(settings.ADMIN_URL, admin.site.urls),  # use configurable admin URL
@@ -32,5 +34,8 @@ urlpatterns = [
     path('logout/', auth_views.LogoutView.as_view(), name='logout'),
     path('users/', include(('users.urls', 'users'), namespace='users')),
     path('statuses/', include(('statuses.urls', 'statuses'), namespace='statuses')),
+    path('labels/', include(('labels.urls', 'labels'), namespace='labels')),
     path('tasks/', include(('tasks.urls', 'tasks'), namespace='tasks')),
+    path('jobs/', include(('jobs.urls', 'jobs'), namespace='jobs')),
+    path('notifications/', include(('notifications.urls', 'notifications'), namespace='notifications')),
 ]
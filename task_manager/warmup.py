@@ -0,0 +1,90 @@
+"""Warm up a freshly started worker process before it serves requests.
+
+Called from the gunicorn ``post_worker_init`` hook (see gunicorn.conf.py),
+so the first requests after a deploy or a worker recycle don't pay for
+opening database connections, building URL resolvers, compiling templates
+or loading translation catalogues and the staticfiles manifest.
+"""
+import threading
+import time
+from pathlib import Path
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.db import connections
+from django.template import TemplateDoesNotExist, TemplateSyntaxError, engines
+from django.urls import get_resolver
+
+from task_manager.translations import preload_catalogs
+
+
+def open_connections():
+    for alias in connections:
+        connections[alias].ensure_connection()
+
+
+def load_url_resolvers():
+    resolver = get_resolver()
+    # Building the reverse dictionaries populates the whole URLconf tree
+    resolver.reverse_dict
+
+
+def load_templates():
+    """Compile the project's templates into the cached template loaders."""
+    count = 0
+    for engine in engines.all():
+        for directory in engine.dirs:
+            for path in sorted(Path(directory).rglob('*.html')):
+                try:
+                    engine.get_template(path.relative_to(directory).as_posix())
+                except (TemplateDoesNotExist, TemplateSyntaxError):
+                    continue
+                count += 1
+    return count
+
+
+def fill_caches():
+    preload_catalogs()
+    # The storage is created, and a manifest storage reads staticfiles.json, on first use
+    staticfiles_storage.location
+
+
+def warm_up(executor=None, threads=1):
+    """Run every warm-up step; return {step name: seconds taken}.
+
+    Database connections are per thread: pass the worker's thread pool as
+    ``executor`` to open them in its ``threads`` request threads instead of
+    the calling one.
+    """
+    if executor is None:
+        connect = open_connections
+    else:
+        def connect():
+            run_in_each_thread(executor, threads, open_connections)
+
+    timings = {}
+    for name, step in (
+        ('connections', connect),
+        ('urls', load_url_resolvers),
+        ('templates', load_templates),
+        ('caches', fill_caches),
+    ):
+        start = time.perf_counter()
+        step()
+        timings[name] = time.perf_counter() - start
+    return timings
+
+
+def run_in_each_thread(executor, threads, func, timeout=10):
+    """Run ``func`` once in each of the ``threads`` threads of ``executor``.
+
+    A barrier keeps every task blocked until all of them have started, which
+    forces the pool to use ``threads`` distinct threads.
+    """
+    barrier = threading.Barrier(threads, timeout=timeout)
+
+    def task():
+        barrier.wait()
+        func()
+
+    for future in [executor.submit(task) for _ in range(threads)]:
+        future.result(timeout=timeout)
@@ -0,0 +1,40 @@
+from django import forms
+from django.core.exceptions import ValidationError
+from django.urls import reverse
+
+
+class AutocompleteSelect(forms.Select):
+    """Select for a ModelChoiceField that never renders the whole queryset.
+
+    Only the empty choice and the currently selected object are rendered as
+    <option>s; static/js/autocomplete.js fetches other candidates from the
+    JSON endpoint named by ``lookup_url`` while the user types. Submitted
+    values are still validated by ModelChoiceField with a single pk lookup.
+    """
+
+    def __init__(self, lookup_url, attrs=None):
+        super().__init__(attrs)
+        self.lookup_url = lookup_url
+
+    class Media:
+        js = ('js/autocomplete.js',)
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs)
+        attrs['data-autocomplete-url'] = reverse(self.lookup_url)
+        return attrs
+
+    def optgroups(self, name, value, attrs=None):
+        field = self.choices.field
+        selected = [v for v in value if v not in ('', None)]
+        options = []
+        if field.empty_label is not None:
+            options.append(self.create_option(name, '', field.empty_label, not selected, 0))
+        try:
+            objects = list(field.queryset.filter(pk__in=selected)) if selected else []
+        except (ValueError, TypeError, ValidationError):
+            # Garbage in the submitted data; the field reports the error itself
+            objects = []
+        for index, obj in enumerate(objects, start=len(options)):
+            options.append(self.create_option(name, obj.pk, field.label_from_instance(obj), True, index))
+        return [(None, options, 0)]
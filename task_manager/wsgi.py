@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'task_manager.settings')
 
 application = get_wsgi_application()
+
+# Load every language's catalogue now rather than on the first request using it
+from task_manager.translations import preload_catalogs  # noqa: E402
+
+preload_catalogs()
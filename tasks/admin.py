@@ -1,10 +1,19 @@
 from django.contrib import admin
+
+from task_manager.admin_helpers import AutocompleteFilter, LargeTableAdmin
 from .models import Task
 
 # Register your models here.
 
 @admin.register(Task)
-class TaskAdmin(admin.ModelAdmin):
+class TaskAdmin(LargeTableAdmin):
     list_display = ('id', 'name', 'status', 'author', 'executor', 'created_at')
-    list_filter = ('status', 'author', 'executor')
+    list_select_related = ('status', 'author', 'executor')
+    list_filter = (
+        ('status', AutocompleteFilter),
+        ('author', AutocompleteFilter),
+        ('executor', AutocompleteFilter),
+        ('labels', AutocompleteFilter),
+    )
     search_fields = ('name', 'description')
+    autocomplete_fields = ('status', 'author', 'executor')
@@ -0,0 +1,10 @@
+from .my_work import my_work_count
+
+
+def my_work(request):
+    """``my_work_count`` for the navbar, looked up only when a template uses it."""
+    def count():
+        user = getattr(request, 'user', None)
+        return my_work_count(user.pk) if user is not None and user.is_authenticated else 0
+
+    return {'my_work_count': count}
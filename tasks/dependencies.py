@@ -0,0 +1,106 @@
+"""Queries over the graph of blocking dependencies between tasks.
+
+Each walk of the graph is a single recursive CTE, so a chain hundreds of
+tasks deep costs one round trip instead of one query per level. The
+recursive step joins on ``task_id``, which the (task, blocked_by) unique
+index covers. Every walk uses UNION, not UNION ALL, so it ends even if a
+cycle got into the table some other way. The critical path also tracks
+depth, and MAX_DEPTH bounds it.
+"""
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef
+from django.db.models.expressions import RawSQL
+from django.utils.translation import gettext_lazy as _
+
+from .models import Task, TaskDependency
+
+MAX_DEPTH = 10000
+# pg_advisory_xact_lock() key serialising dependency inserts
+LOCK_KEY = 0x7461736b
+
+TABLE = TaskDependency._meta.db_table
+
+# Every task that transitively blocks %s
+BLOCKERS_SQL = (
+    f'WITH RECURSIVE blockers(id) AS ('
+    f'SELECT blocked_by_id FROM {TABLE} WHERE task_id = %s '
+    f'UNION SELECT d.blocked_by_id FROM {TABLE} d JOIN blockers b ON d.task_id = b.id'
+    f') SELECT id FROM blockers'
+)
+
+# (blocker, the task it blocks, distance from %s) for every path, deduplicated per distance
+PATHS_SQL = (
+    f'WITH RECURSIVE paths(id, via, depth) AS ('
+    f'SELECT blocked_by_id, task_id, 1 FROM {TABLE} WHERE task_id = %s '
+    f'UNION SELECT d.blocked_by_id, d.task_id, p.depth + 1 FROM {TABLE} d '
+    f'JOIN paths p ON d.task_id = p.id WHERE p.depth < %s'
+    f') SELECT id, via, depth FROM paths'
+)
+
+# Whether %s is %s or one of its transitive blockers; stops at the first match on PostgreSQL
+REACHES_SQL = (
+    f'WITH RECURSIVE blockers(id) AS ('
+    f'SELECT %s '
+    f'UNION SELECT d.blocked_by_id FROM {TABLE} d JOIN blockers b ON d.task_id = b.id'
+    f') SELECT 1 FROM blockers WHERE id = %s LIMIT 1'
+)
+
+
+def is_blocked():
+    """Annotation telling whether a task waits for open blockers: one probe of the (task, blocked_by) index per row."""
+    return Exists(TaskDependency.objects.filter(task=OuterRef('pk'), blocked_by__is_open=True))
+
+
+def blockers(task_id):
+    """Queryset of every task ``task_id`` waits for, directly or not."""
+    return Task.objects.filter(pk__in=RawSQL(BLOCKERS_SQL, [task_id]))
+
+
+def critical_path(task_id):
+    """Return the ids on the longest chain of blockers of ``task_id``.
+
+    The first id is the task that has to be done first. The last id is a
+    direct blocker of ``task_id``. The list is empty when nothing blocks it.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(PATHS_SQL, [task_id, MAX_DEPTH])
+        rows = cursor.fetchall()
+    if not rows:
+        return []
+    # Any (id, depth) row was reached from its ``via`` at depth - 1, so
+    # walking back from the deepest row retraces a longest chain
+    via = {(blocker, depth): blocked for blocker, blocked, depth in rows}
+    blocker, _blocked, depth = max(rows, key=lambda row: row[2])
+    path = [blocker]
+    while depth > 1:
+        blocker = via[(blocker, depth)]
+        depth -= 1
+        path.append(blocker)
+    return path
+
+
+def would_create_cycle(task_id, blocker_id):
+    """Whether making ``blocker_id`` block ``task_id`` would close a cycle."""
+    with connection.cursor() as cursor:
+        cursor.execute(REACHES_SQL, [blocker_id, task_id])
+        return cursor.fetchone() is not None
+
+
+def add_dependency(task, blocker):
+    """Record that ``task`` is blocked by ``blocker``; return the TaskDependency.
+
+    Raises ValidationError when that would make a task (transitively) block
+    itself. On PostgreSQL the check and the insert hold a transaction-level
+    advisory lock, so two concurrent inserts can't each close half a cycle.
+    """
+    if task.pk == blocker.pk:
+        raise ValidationError(_("A task can't block itself."))
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT pg_advisory_xact_lock(%s)', [LOCK_KEY])
+        if would_create_cycle(task.pk, blocker.pk):
+            raise ValidationError(_('%(blocker)s already waits for this task.'), params={'blocker': blocker})
+        dependency, _created = TaskDependency.objects.get_or_create(task=task, blocked_by=blocker)
+    return dependency
@@ -0,0 +1,45 @@
+"""CSV export of the task list, run as a job for the user who asked for it.
+
+The file is written to the default storage under ``exports/`` and its name
+returned as the job's ``{'file': ...}`` result, which the job page offers for
+download to the same user.
+"""
+import csv
+import tempfile
+
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+from .models import Task
+
+CHUNK_SIZE = 1000
+
+COLUMNS = ('id', 'name', 'status', 'author', 'executor', 'due_date', 'priority', 'labels', 'created_at')
+
+
+def export_tasks(label_id=None):
+    """Job: write the tasks (of label ``label_id``, if given) to a CSV file."""
+    tasks = Task.objects.select_related('status', 'author', 'executor').prefetch_related('labels').order_by('pk')
+    if label_id is not None:
+        tasks = tasks.filter(labels=label_id)
+    count = 0
+    with tempfile.TemporaryFile('w+', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(COLUMNS)
+        for task in tasks.iterator(chunk_size=CHUNK_SIZE):
+            writer.writerow([
+                task.pk,
+                task.name,
+                task.status.name,
+                task.author.username,
+                task.executor.username if task.executor else '',
+                task.due_date.isoformat() if task.due_date else '',
+                task.get_priority_display(),
+                ', '.join(label.name for label in task.labels.all()),
+                task.created_at.isoformat(),
+            ])
+            count += 1
+        file.seek(0)
+        name = default_storage.save(f'exports/tasks-{timezone.now():%Y%m%d-%H%M%S}.csv', File(file))
+    return {'file': name, 'tasks': count}
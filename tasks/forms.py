@@ -0,0 +1,96 @@
+from django import forms
+from django.conf import settings
+from django.template.defaultfilters import filesizeformat
+from django.db.models import Count
+from django.utils.translation import gettext_lazy as _
+
+from labels.models import Label
+from task_manager.widgets import AutocompleteSelect
+from .dependencies import add_dependency
+from .models import Task, TaskComment, TaskUpload
+
+
+class TaskForm(forms.ModelForm):
+    class Meta:
+        model = Task
+        fields = ('name', 'description', 'status', 'executor', 'due_date', 'priority', 'labels')
+        widgets = {
+            'status': AutocompleteSelect('statuses:lookup'),
+            'executor': AutocompleteSelect('users:lookup'),
+            'due_date': forms.DateInput(attrs={'type': 'date'}),
+        }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['priority'].required = False
+
+    def clean_priority(self):
+        # Left out or empty means the default
+        return self.cleaned_data['priority'] or Task.Priority.NORMAL
+
+
+class TaskCommentForm(forms.ModelForm):
+    class Meta:
+        model = TaskComment
+        fields = ('text',)
+        widgets = {'text': forms.Textarea(attrs={'rows': 3})}
+
+
+class TaskDependencyForm(forms.Form):
+    blocked_by = forms.ModelChoiceField(
+        Task.objects.all(), label=_('Blocked by'), widget=AutocompleteSelect('tasks:lookup'),
+    )
+
+    def __init__(self, *args, task=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.task = task
+
+    def save(self):
+        """Add the dependency; a cycle is reported as an error on ``blocked_by``."""
+        try:
+            return add_dependency(self.task, self.cleaned_data['blocked_by'])
+        except forms.ValidationError as error:
+            self.add_error('blocked_by', error)
+            return None
+
+
+class TaskAttachmentForm(forms.Form):
+    file = forms.FileField(label=_('File'))
+
+
+class TaskUploadForm(forms.ModelForm):
+    """Starts a resumable upload: the file's name and size in bytes."""
+
+    class Meta:
+        model = TaskUpload
+        fields = ('name', 'size')
+
+    def clean_size(self):
+        size = self.cleaned_data['size']
+        if size < 1:
+            raise forms.ValidationError(_('The file is empty.'))
+        if size > settings.ATTACHMENT_MAX_SIZE:
+            raise forms.ValidationError(
+                _('The file is larger than %(max)s.') % {'max': filesizeformat(settings.ATTACHMENT_MAX_SIZE)}
+            )
+        return size
+
+
+class TaskFilterForm(forms.Form):
+    label = forms.ModelChoiceField(
+        # Task counts come with the choices in one grouped query
+        queryset=Label.objects.annotate(task_count=Count('tasks')),
+        required=False,
+        label=_('Label'),
+        empty_label=_('All labels'),
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['label'].label_from_instance = lambda label: f'{label.name} ({label.task_count})'
+
+    def filter(self, queryset):
+        if self.is_valid() and self.cleaned_data['label']:
+            # Joins the through table only, on its (label, task) index
+            queryset = queryset.filter(labels=self.cleaned_data['label'])
+        return queryset
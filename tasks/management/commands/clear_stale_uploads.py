@@ -0,0 +1,22 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from tasks.models import TaskUpload
+
+
+class Command(BaseCommand):
+    help = 'Delete resumable attachment uploads, and their partial files, abandoned for a while'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=24, help='Age of the uploads to delete (default: 24).')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['hours'])
+        # One by one, so post_delete removes each partial file
+        deleted = 0
+        for upload in TaskUpload.objects.filter(created_at__lt=cutoff).iterator():
+            upload.delete()
+            deleted += 1
+        self.stdout.write(f'Deleted {deleted} stale uploads.')
@@ -0,0 +1,42 @@
+# Generated by Django 6.0 on 2026-10-19 16:05
+
+from django.db import migrations, models
+
+from tasks.ranking import BATCH_SIZE, spread_ranks
+
+
+def rank_existing_tasks(apps, schema_editor):
+    """Rank every column's tasks in the order they were created."""
+    Task = apps.get_model('tasks', 'Task')
+    for status_id in Task.objects.order_by().values_list('status_id', flat=True).distinct():
+        pks = list(Task.objects.filter(status_id=status_id).order_by('created_at', 'pk').values_list('pk', flat=True))
+        tasks = [Task(pk=pk, rank=rank) for pk, rank in zip(pks, spread_ranks(len(pks)))]
+        Task.objects.bulk_update(tasks, ['rank'], batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0006_board'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='task',
+            options={'ordering': ('status_id', 'rank', 'pk')},
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='tasks_task_status_created_idx',
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='rank',
+            field=models.CharField(default='', editable=False, max_length=128),
+        ),
+        migrations.RunPython(rank_existing_tasks, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['status', 'rank'], name='tasks_task_status_rank_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-19 18:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0008_due_date_priority'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='task',
+            name='rank',
+            field=models.CharField(default='', editable=False, max_length=255),
+        ),
+    ]
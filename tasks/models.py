@@ -1,16 +1,210 @@
-from django.db import models
+import uuid
+
+from django.db import models, transaction
+from django.db.models import F
 from django.contrib.auth import get_user_model
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
 
 User = get_user_model()
 
 class Task(models.Model):
+    class Priority(models.IntegerChoices):
+        LOW = 1, _('Low')
+        NORMAL = 2, _('Normal')
+        HIGH = 3, _('High')
+        URGENT = 4, _('Urgent')
+
     name = models.CharField(max_length=255)
     description = models.TextField(blank=True)
     status = models.ForeignKey('statuses.Status', on_delete=models.PROTECT, related_name='tasks')
     author = models.ForeignKey(User, on_delete=models.PROTECT, related_name='authored_tasks')
     executor = models.ForeignKey(User, on_delete=models.PROTECT, related_name='executed_tasks', blank=True, null=True)
+    due_date = models.DateField(_('Due date'), blank=True, null=True)
+    priority = models.PositiveSmallIntegerField(_('Priority'), choices=Priority, default=Priority.NORMAL)
+    # Copy of "the status isn't closed", so the partial indexes below can be
+    # limited to open tasks (kept in sync by save() and tasks/signals.py)
+    is_open = models.BooleanField(default=True, editable=False)
+    labels = models.ManyToManyField(
+        'labels.Label', through='TaskLabel', related_name='tasks', blank=True, verbose_name=_('Labels'),
+    )
+    blocked_by = models.ManyToManyField(
+        'self', through='TaskDependency', symmetrical=False, related_name='blocks', blank=True,
+        verbose_name=_('Blocked by'),
+    )
+    # Kept up to date by TaskComment.save()/delete() so lists don't count comments
+    comments_count = models.PositiveIntegerField(default=0, editable=False)
+    # Position within the status column (see tasks/ranking.py)
+    rank = models.CharField(max_length=255, default='', editable=False)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        # status_id, not status: ordering by the relation would join statuses to sort by name
+        ordering = ('status_id', 'rank', 'pk')
+        indexes = [
+            models.Index(fields=('status', 'rank'), name='tasks_task_status_rank_idx'),
+            # "My work": open tasks of an executor in page order. The included
+            # columns are the rest of what the page reads, for an index-only
+            # scan (PostgreSQL; other databases ignore INCLUDE).
+            models.Index(
+                fields=('executor', 'due_date', '-priority', 'id'),
+                include=('name', 'status'),
+                condition=models.Q(is_open=True),
+                name='tasks_task_open_executor_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return self.name
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # So that reassigning a task can refresh the previous executor's "my work" count
+        if 'executor_id' in field_names:
+            instance._loaded_executor_id = values[field_names.index('executor_id')]
+        return instance
+
+    @property
+    def is_overdue(self):
+        return self.is_open and self.due_date is not None and self.due_date < timezone.localdate()
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'status' in update_fields:
+            self.is_open = not self.status.is_closed
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'is_open'}
+        if self.rank:
+            return super().save(*args, **kwargs)
+        from .ranking import check_rank, rank_at_end
+
+        # New tasks go to the end of their column
+        self.rank = rank_at_end(self.status_id)
+        super().save(*args, **kwargs)
+        check_rank(self)
+
+
+class TaskLabel(models.Model):
+    """A label on a task.
+
+    The unique (task, label) constraint serves prefetching a task's labels and
+    the (label, task) index filtering tasks by label, so neither direction
+    needs the single-column foreign key indexes. Labels in use can't be
+    deleted.
+    """
+
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, db_index=False)
+    label = models.ForeignKey('labels.Label', on_delete=models.PROTECT, db_index=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=('task', 'label'), name='tasks_tasklabel_task_label_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=('label', 'task'), name='tasks_tasklabel_label_task_idx'),
+        ]
+
+
+class TaskDependency(models.Model):
+    """``task`` can't be done before ``blocked_by``.
+
+    The unique (task, blocked_by) constraint is the index the recursive
+    queries in tasks/dependencies.py follow towards blockers, and the
+    (blocked_by, task) index the other way. Use ``add_dependency()`` to
+    create rows: it refuses dependencies that would close a cycle.
+    """
+
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='dependencies', db_index=False)
+    blocked_by = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='dependents', db_index=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=('task', 'blocked_by'), name='tasks_dependency_task_blocker_uniq'),
+            models.CheckConstraint(condition=~models.Q(task=models.F('blocked_by')), name='tasks_dependency_not_self'),
+        ]
+        indexes = [
+            models.Index(fields=('blocked_by', 'task'), name='tasks_dependency_blocker_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.task_id} blocked by {self.blocked_by_id}'
+
+
+class TaskComment(models.Model):
+    """A comment on a task.
+
+    Creating or deleting one instance updates ``Task.comments_count``
+    atomically with F(); queryset.delete() doesn't (cascades from a deleted
+    task don't need to).
+    """
+
+    # The (task, created_at) index covers lookups by task
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='comments', db_index=False)
+    author = models.ForeignKey(User, on_delete=models.PROTECT, related_name='task_comments')
+    text = models.TextField(_('Comment'))
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=('task', 'created_at'), name='tasks_comment_task_created_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.author}: {self.text[:50]}'
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        with transaction.atomic(using=self._state.db):
+            super().save(*args, **kwargs)
+            if adding:
+                Task.objects.filter(pk=self.task_id).update(comments_count=F('comments_count') + 1)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic(using=self._state.db):
+            result = super().delete(*args, **kwargs)
+            Task.objects.filter(pk=self.task_id).update(comments_count=F('comments_count') - 1)
+        return result
+
+
+class TaskAttachment(models.Model):
+    """A file attached to a task; the file is removed from storage with the row (see tasks/signals.py)."""
+
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='attachments')
+    uploaded_by = models.ForeignKey(User, on_delete=models.PROTECT, related_name='task_attachments')
+    file = models.FileField(max_length=255)
+    # The client's file name, used for display and downloads only
+    name = models.CharField(_('Name'), max_length=255)
+    size = models.BigIntegerField()
+    sha256 = models.CharField(max_length=64)
 
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
         return self.name
+
+
+class TaskUpload(models.Model):
+    """A resumable attachment upload in progress (see tasks/uploads.py)."""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='uploads')
+    uploaded_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='task_uploads')
+    name = models.CharField(max_length=255)
+    size = models.BigIntegerField()
+    received = models.BigIntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f'{self.name} ({self.received}/{self.size})'
+
+    @property
+    def storage_name(self):
+        return f'uploads/{self.pk.hex}'
+
+    @property
+    def is_complete(self):
+        return self.received >= self.size
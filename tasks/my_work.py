@@ -0,0 +1,37 @@
+"""Open tasks assigned to a user, soonest due first, and their cached count.
+
+Both are answered from the partial (executor, due_date, -priority) index
+on open tasks. The count is shown in the navbar on every page, so it is
+cached per user and the cached value is dropped when one of the user's
+tasks changes hands, opens or closes. With the per-process
+LocMemCache another worker may show the old count until
+MY_WORK_COUNT_CACHE_TIMEOUT passes. A shared cache (REDIS_URL) doesn't
+have that problem.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+
+from .models import Task
+
+COUNT_CACHE_KEY = 'tasks:my-work-count:{}'
+
+
+def my_work(user_id):
+    """Queryset of the open tasks of ``user_id``, by due date (undated last) then priority."""
+    return (
+        Task.objects.filter(executor_id=user_id, is_open=True)
+        .order_by(F('due_date').asc(nulls_last=True), '-priority', 'pk')
+    )
+
+
+def my_work_count(user_id):
+    return cache.get_or_set(
+        COUNT_CACHE_KEY.format(user_id), lambda: my_work(user_id).count(), settings.MY_WORK_COUNT_CACHE_TIMEOUT,
+    )
+
+
+def forget_counts(user_ids):
+    keys = [COUNT_CACHE_KEY.format(user_id) for user_id in set(user_ids) if user_id is not None]
+    if keys:
+        cache.delete_many(keys)
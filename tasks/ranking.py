@@ -0,0 +1,151 @@
+"""Manual order of tasks within a status column, by fractional rank keys.
+
+Every task has a ``rank`` string; a column is sorted by it (the
+(status, rank) index). Moving a task gives it a key between its new
+neighbours', so a reorder writes one row instead of renumbering the
+column. Keys use the digits 0-9a-z, which sort the same byte-wise and
+under the usual locale collations, and never end in '0', so there is
+always a key before any other.
+
+Appending increments the last key instead of halving the gap to the end
+of the keyspace, so keys grow logarithmically with the column. Squeezing
+many tasks into the same gap makes keys longer; once one gets longer than
+TASK_RANK_REBALANCE_LENGTH its column is rebalanced to short, evenly
+spaced keys by a background job. A burst of moves can outrun the job, so a
+key longer than TASK_RANK_MAX_LENGTH is never handed out: the column is
+rebalanced on the spot, in the caller's transaction, and the key computed
+again.
+"""
+from django.conf import settings
+from django.db import transaction
+
+from jobs.queue import enqueue_once
+from .models import Task
+
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+BATCH_SIZE = 1000
+
+
+def rank_between(before, after):
+    """Return a key sorting strictly between ``before`` and ``after``.
+
+    ``before`` may be '' (the start of the column) and ``after`` None (the
+    end). Neither may end in '0'.
+    """
+    if after is not None:
+        # Keep the common prefix, reading a missing digit of ``before`` as 0
+        common = 0
+        while common < len(after) and (before[common] if common < len(before) else '0') == after[common]:
+            common += 1
+        if common:
+            return after[:common] + rank_between(before[common:], after[common:])
+    low = DIGITS.index(before[0]) if before else 0
+    high = DIGITS.index(after[0]) if after is not None else len(DIGITS)
+    if high - low > 1:
+        return DIGITS[(low + high + 1) // 2]
+    # Consecutive first digits
+    if after is not None and len(after) > 1:
+        return after[0]
+    return DIGITS[low] + rank_between(before[1:], None)
+
+
+def rank_increment(rank):
+    """Return the next key after ``rank`` at the same length, for appending.
+
+    The key is read as a base-36 number and incremented, skipping values
+    ending in '0'. Once every digit is 'z' the key is kept as a prefix and
+    followed by as many digits again ('z' -> 'z1', 'zz' -> 'zz01'), so each
+    overflow squares the number of keys left before the next one.
+    """
+    if not rank:
+        return rank_between('', None)
+    if rank.strip(DIGITS[-1]) == '':
+        return rank + DIGITS[0] * (len(rank) - 1) + DIGITS[1]
+    digits = [DIGITS.index(digit) for digit in rank]
+    while True:
+        position = len(digits) - 1
+        while digits[position] == len(DIGITS) - 1:
+            digits[position] = 0
+            position -= 1
+        digits[position] += 1
+        if digits[-1]:
+            return ''.join(DIGITS[digit] for digit in digits)
+
+
+def spread_ranks(count):
+    """Return ``count`` short increasing keys, evenly spaced with room at both ends."""
+    length = 1
+    while len(DIGITS) ** length < 2 * (count + 1):
+        length += 1
+    step = len(DIGITS) ** length // (count + 1)
+    ranks = []
+    for position in range(1, count + 1):
+        value, digits = step * position, []
+        for _ in range(length):
+            value, digit = divmod(value, len(DIGITS))
+            digits.append(DIGITS[digit])
+        # Dropping trailing zeros keeps the order of equal-length keys
+        ranks.append(''.join(reversed(digits)).rstrip('0'))
+    return ranks
+
+
+def max_rank_length():
+    """The longest key handed out, never more than the column holds."""
+    return min(settings.TASK_RANK_MAX_LENGTH, Task._meta.get_field('rank').max_length)
+
+
+def rank_after(status_id, after=None, exclude=None):
+    """Return a key placing a task right after ``after`` in the column, or first when it is None.
+
+    ``exclude`` is the pk of the task being moved, which isn't its own neighbour.
+    If the column has to be rebalanced first, ``after.rank`` is reloaded.
+    """
+    rank = _rank_after(status_id, after, exclude)
+    if len(rank) > max_rank_length():
+        rebalance_column(status_id)
+        if after is not None:
+            after.refresh_from_db(fields=['rank'])
+        rank = _rank_after(status_id, after, exclude)
+    return rank
+
+
+def _rank_after(status_id, after, exclude):
+    before = after.rank if after is not None else ''
+    following = Task.objects.filter(status_id=status_id, rank__gt=before).exclude(pk=exclude)
+    following = following.order_by('rank').values_list('rank', flat=True).first()
+    if following is None:
+        return rank_increment(before)
+    return rank_between(before, following)
+
+
+def rank_at_end(status_id, exclude=None):
+    """Return a key placing a task last in the column."""
+    rank = _rank_at_end(status_id, exclude)
+    if len(rank) > max_rank_length():
+        rebalance_column(status_id)
+        rank = _rank_at_end(status_id, exclude)
+    return rank
+
+
+def _rank_at_end(status_id, exclude):
+    last = Task.objects.filter(status_id=status_id).exclude(pk=exclude).order_by('-rank').values_list('rank', flat=True)
+    return rank_increment(last.first() or '')
+
+
+def check_rank(task):
+    """Schedule a rebalance of ``task``'s column if its key got too long."""
+    if len(task.rank) > settings.TASK_RANK_REBALANCE_LENGTH:
+        status_id = task.status_id
+        transaction.on_commit(lambda: enqueue_once(rebalance_column, args=[status_id]))
+
+
+def rebalance_column(status_id):
+    """Job: give the tasks of a column short, evenly spaced keys in their current order."""
+    with transaction.atomic():
+        # Locks the column so no key is computed from the old ones meanwhile (on PostgreSQL)
+        pks = list(
+            Task.objects.select_for_update().filter(status_id=status_id).order_by('rank', 'pk').values_list('pk', flat=True)
+        )
+        tasks = [Task(pk=pk, rank=rank) for pk, rank in zip(pks, spread_ranks(len(pks)))]
+        Task.objects.bulk_update(tasks, ['rank'], batch_size=BATCH_SIZE)
+    return len(tasks)
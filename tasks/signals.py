@@ -0,0 +1,49 @@
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from statuses.models import Status
+from .models import Task, TaskAttachment, TaskUpload
+from .my_work import forget_counts
+
+
+@receiver(post_delete, sender=TaskAttachment)
+def delete_attachment_file(sender, instance, **kwargs):
+    # Only once the row is gone for good
+    transaction.on_commit(lambda: instance.file.delete(save=False))
+
+
+@receiver(post_delete, sender=TaskUpload)
+def delete_partial_upload(sender, instance, **kwargs):
+    name = instance.storage_name
+    transaction.on_commit(lambda: default_storage.delete(name))
+
+
+@receiver(post_save, sender=Task)
+def forget_my_work_counts(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not {'executor', 'status', 'is_open'} & set(update_fields):
+        return
+    # The previous executor's too, when the task was reassigned
+    user_ids = [instance.executor_id, getattr(instance, '_loaded_executor_id', None)]
+    instance._loaded_executor_id = instance.executor_id
+    transaction.on_commit(lambda: forget_counts(user_ids))
+
+
+@receiver(post_delete, sender=Task)
+def forget_deleted_task_count(sender, instance, **kwargs):
+    user_ids = [instance.executor_id]
+    transaction.on_commit(lambda: forget_counts(user_ids))
+
+
+@receiver(post_save, sender=Status)
+def sync_open_tasks(sender, instance, created=False, **kwargs):
+    """Open or close the status's tasks when the status is (re)opened or closed."""
+    if created:
+        return
+    changed = Task.objects.filter(status=instance, is_open=instance.is_closed)
+    # Without the default ordering, which would defeat distinct()
+    user_ids = list(changed.order_by().values_list('executor_id', flat=True).distinct())
+    if user_ids:
+        changed.update(is_open=not instance.is_closed)
+        transaction.on_commit(lambda: forget_counts(user_ids))
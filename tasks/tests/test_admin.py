@@ -0,0 +1,94 @@
+from unittest import skipUnless
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+
+from labels.models import Label
+from statuses.models import Status
+from task_manager.admin_helpers import EstimatedCountPaginator, estimate_count
+from tasks.models import Task
+
+
+class TaskAdminTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'pass12345')
+        cls.status = Status.objects.create(name='New')
+        cls.users = [User.objects.create_user(f'user{i}', password='pass12345') for i in range(30)]
+        Task.objects.bulk_create(
+            Task(name=f'Task {i}', status=cls.status, author=user, executor=user) for i, user in enumerate(cls.users)
+        )
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def test_changelist_queries_do_not_grow_with_rows_or_users(self):
+        url = reverse('admin:tasks_task_changelist')
+        # session user, count, tasks joined with status/author/executor
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Task 29')
+
+    def test_filters_are_autocomplete_boxes(self):
+        response = self.client.get(reverse('admin:tasks_task_changelist'))
+        self.assertContains(response, 'id="autocomplete-filter-author"')
+        self.assertContains(response, 'js/admin_autocomplete_filter.js')
+        # no link per user in the sidebar
+        self.assertNotContains(response, f'author__id__exact={self.users[0].pk}')
+
+    def test_selected_filter_value_is_rendered(self):
+        user = self.users[5]
+        response = self.client.get(reverse('admin:tasks_task_changelist'), {'author__id__exact': user.pk})
+        self.assertContains(response, f'<option value="{user.pk}" selected>{user.username}</option>', html=True)
+        self.assertContains(response, 'Task 5')
+        self.assertNotContains(response, 'Task 6<')
+
+    def test_label_filter(self):
+        label = Label.objects.create(name='bug')
+        Task.objects.get(name='Task 3').labels.add(label)
+        response = self.client.get(reverse('admin:tasks_task_changelist'), {'labels__id__exact': label.pk})
+        self.assertContains(response, 'id="autocomplete-filter-labels"')
+        self.assertContains(response, 'Task 3')
+        self.assertNotContains(response, 'Task 4<')
+
+    def test_status_autocomplete(self):
+        response = self.client.get(reverse('admin:autocomplete'), {
+            'app_label': 'tasks', 'model_name': 'task', 'field_name': 'status', 'term': 'Ne',
+        })
+        self.assertEqual(response.json()['results'], [{'id': str(self.status.pk), 'text': 'New'}])
+
+
+class EstimatedCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = get_user_model().objects.create_user('u1')
+        status = Status.objects.create(name='New')
+        Task.objects.bulk_create(Task(name=f'Task {i}', status=status, author=user) for i in range(3))
+
+    def test_exact_count_without_estimate(self):
+        if connection.vendor != 'postgresql':
+            self.assertIsNone(estimate_count(Task.objects.all()))
+        self.assertEqual(EstimatedCountPaginator(Task.objects.order_by('pk'), 10).count, 3)
+
+    def test_large_estimates_replace_count(self):
+        paginator = EstimatedCountPaginator(Task.objects.order_by('pk'), 10)
+        with patch('task_manager.admin_helpers.estimate_count', return_value=2_000_000):
+            with self.assertNumQueries(0):
+                self.assertEqual(paginator.count, 2_000_000)
+
+    def test_small_estimates_fall_back_to_count(self):
+        paginator = EstimatedCountPaginator(Task.objects.order_by('pk'), 10)
+        with patch('task_manager.admin_helpers.estimate_count', return_value=50):
+            self.assertEqual(paginator.count, 3)
+
+    @skipUnless(connection.vendor == 'postgresql', 'planner statistics are PostgreSQL-only')
+    def test_postgresql_estimates(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {Task._meta.db_table}')
+        self.assertIsNotNone(estimate_count(Task.objects.all()))
+        self.assertIsNotNone(estimate_count(Task.objects.filter(name='Task 1')))
@@ -0,0 +1,23 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from statuses.models import Status
+from tasks.models import Task, TaskUpload
+
+
+class ClearStaleUploadsTests(TestCase):
+    def test_deletes_old_uploads_only(self):
+        user = get_user_model().objects.create_user(username='u1', password='pass12345')
+        task = Task.objects.create(name='Task A', status=Status.objects.create(name='New'), author=user)
+        stale = TaskUpload.objects.create(task=task, uploaded_by=user, name='a.bin', size=10)
+        TaskUpload.objects.filter(pk=stale.pk).update(created_at=timezone.now() - timedelta(days=2))
+        fresh = TaskUpload.objects.create(task=task, uploaded_by=user, name='b.bin', size=10)
+        out = StringIO()
+        call_command('clear_stale_uploads', stdout=out)
+        self.assertEqual(list(TaskUpload.objects.all()), [fresh])
+        self.assertIn('Deleted 1 stale uploads.', out.getvalue())
@@ -0,0 +1,61 @@
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from statuses.models import Status
+from tasks.dependencies import add_dependency, blockers, critical_path, would_create_cycle
+from tasks.models import Task, TaskDependency
+
+
+class TaskDependencyGraphTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username='u1', password='pass12345')
+        cls.status = Status.objects.create(name='New')
+
+    def make_tasks(self, count):
+        return Task.objects.bulk_create(
+            Task(name=f'Task {i}', status=self.status, author=self.user) for i in range(count)
+        )
+
+    def link(self, *pairs):
+        TaskDependency.objects.bulk_create(TaskDependency(task=task, blocked_by=blocker) for task, blocker in pairs)
+
+    def test_deep_chain_in_one_query_each(self):
+        # chain[i] is blocked by chain[i + 1]
+        chain = self.make_tasks(300)
+        self.link(*zip(chain, chain[1:]))
+        with self.assertNumQueries(1):
+            self.assertEqual({task.pk for task in blockers(chain[0].pk)}, {task.pk for task in chain[1:]})
+        with self.assertNumQueries(1):
+            self.assertEqual(critical_path(chain[0].pk), [task.pk for task in reversed(chain[1:])])
+        with self.assertNumQueries(1):
+            self.assertTrue(would_create_cycle(chain[-1].pk, chain[0].pk))
+        self.assertFalse(would_create_cycle(chain[0].pk, chain[-1].pk))
+
+    def test_critical_path_is_the_longest_chain(self):
+        a, b, c, d, e = self.make_tasks(5)
+        # a waits for b and for e; b waits for c, which waits for d
+        self.link((a, b), (a, e), (b, c), (c, d), (e, d))
+        self.assertEqual(critical_path(a.pk), [d.pk, c.pk, b.pk])
+        self.assertEqual(set(blockers(a.pk)), {b, c, d, e})
+        self.assertEqual(critical_path(d.pk), [])
+        self.assertFalse(blockers(d.pk).exists())
+
+    def test_add_dependency_refuses_cycles(self):
+        a, b, c = self.make_tasks(3)
+        add_dependency(a, b)
+        add_dependency(b, c)
+        with self.assertRaisesMessage(ValidationError, 'Task 0 already waits for this task.'):
+            add_dependency(c, a)
+        with self.assertRaisesMessage(ValidationError, "A task can't block itself."):
+            add_dependency(a, a)
+        # Adding an existing dependency again is a no-op
+        self.assertEqual(add_dependency(a, b), TaskDependency.objects.get(task=a, blocked_by=b))
+        self.assertEqual(TaskDependency.objects.count(), 2)
+
+    def test_walks_end_on_existing_cycles(self):
+        a, b = self.make_tasks(2)
+        self.link((a, b), (b, a))
+        self.assertEqual(set(blockers(a.pk)), {a, b})
+        self.assertTrue(would_create_cycle(a.pk, b.pk))
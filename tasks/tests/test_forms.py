@@ -0,0 +1,48 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from statuses.models import Status
+from tasks.forms import TaskForm
+from tasks.models import Task
+
+User = get_user_model()
+
+
+class TaskFormTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='author', password='pass')
+        cls.users = User.objects.bulk_create([User(username=f'user{i}') for i in range(50)])
+        cls.status = Status.objects.create(name='Open')
+        cls.task = Task.objects.create(name='T', status=cls.status, author=cls.author, executor=cls.users[0])
+
+    def test_unbound_form_renders_no_user_options(self):
+        html = str(TaskForm()['executor'])
+        self.assertIn('data-autocomplete-url="/users/lookup/"', html)
+        self.assertEqual(html.count('<option'), 1)  # the empty choice only
+
+    def test_bound_instance_renders_selected_option_only(self):
+        form = TaskForm(instance=self.task)
+        with self.assertNumQueries(1):
+            html = str(form['executor'])
+        self.assertIn('user0', html)
+        self.assertNotIn('user1<', html)
+        self.assertEqual(html.count('<option'), 2)
+
+    def test_validation_uses_pk_lookup(self):
+        form = TaskForm(data={'name': 'N', 'status': self.status.pk, 'executor': self.users[5].pk})
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertTrue(form.is_valid(), form.errors)
+        # Field cleaning plus model FK validation: only primary key lookups, no table scans
+        self.assertTrue(ctx.captured_queries)
+        for query in ctx.captured_queries:
+            self.assertRegex(query['sql'], r'"id" = \d+ LIMIT')
+        self.assertEqual(form.cleaned_data['executor'], self.users[5])
+
+    def test_invalid_pk_is_rejected_and_rerendered(self):
+        form = TaskForm(data={'name': 'N', 'status': self.status.pk, 'executor': 'abc'})
+        self.assertFalse(form.is_valid())
+        self.assertIn('executor', form.errors)
+        self.assertEqual(str(form['executor']).count('<option'), 1)
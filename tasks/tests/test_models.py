@@ -4,7 +4,7 @@ from django.db.models.deletion import ProtectedError
 from django.test import TestCase
 
 from statuses.models import Status
-from tasks.models import Task
+from tasks.models import Task, TaskComment
 
 User = get_user_model()
 
@@ -90,3 +90,31 @@ class TaskModelTests(TestCase):
     def test_created_at_auto_now_add(self):
         t = Task.objects.create(name='Timestamp', description='', status=self.status, author=self.author)
         self.assertIsNotNone(t.created_at)
+
+
+class TaskCommentCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='author', password='pass')
+        cls.status = Status.objects.create(name='Open')
+        cls.task = Task.objects.create(name='T', status=cls.status, author=cls.author)
+
+    def test_count_follows_creates_and_deletes(self):
+        comments = [TaskComment.objects.create(task=self.task, author=self.author, text=f'c{i}') for i in range(3)]
+        comments[0].text = 'edited'
+        comments[0].save()
+        comments[1].delete()
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.comments_count, 2)
+
+    def test_count_is_updated_in_the_database_not_in_memory(self):
+        stale = Task.objects.get(pk=self.task.pk)
+        TaskComment.objects.create(task=self.task, author=self.author, text='a')
+        TaskComment.objects.create(task=stale, author=self.author, text='b')
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.comments_count, 2)
+
+    def test_deleting_task_deletes_comments(self):
+        TaskComment.objects.create(task=self.task, author=self.author, text='a')
+        self.task.delete()
+        self.assertFalse(TaskComment.objects.exists())
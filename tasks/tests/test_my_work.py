@@ -0,0 +1,152 @@
+import datetime
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from statuses.models import Status
+from tasks.models import Task
+from tasks.my_work import my_work, my_work_count
+
+User = get_user_model()
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'my-work-tests'}}
+
+
+class MyWorkTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='u1', password='pass12345')
+        cls.other = User.objects.create_user(username='u2', password='pass12345')
+        cls.todo = Status.objects.create(name='Todo')
+        cls.done = Status.objects.create(name='Done', is_closed=True)
+        cls.today = timezone.localdate()
+
+    def add(self, name, executor=None, status=None, **fields):
+        return Task.objects.create(
+            name=name, status=status or self.todo, author=self.other, executor=executor or self.user, **fields,
+        )
+
+    def test_open_tasks_by_due_date_then_priority(self):
+        self.add('Undated')
+        self.add('Later', due_date=self.today + datetime.timedelta(days=3))
+        self.add('Soon, low', due_date=self.today, priority=Task.Priority.LOW)
+        self.add('Soon, urgent', due_date=self.today, priority=Task.Priority.URGENT)
+        self.add('Finished', status=self.done, due_date=self.today)
+        self.add('Not mine', executor=self.other, due_date=self.today)
+        self.assertEqual(
+            [task.name for task in my_work(self.user.pk)], ['Soon, urgent', 'Soon, low', 'Later', 'Undated'],
+        )
+
+    def test_tasks_follow_their_status_closing_and_reopening(self):
+        task = self.add('Task')
+        self.assertTrue(task.is_open)
+        self.todo.is_closed = True
+        self.todo.save()
+        task.refresh_from_db()
+        self.assertFalse(task.is_open)
+        self.assertFalse(my_work(self.user.pk).exists())
+        self.todo.is_closed = False
+        self.todo.save()
+        self.assertEqual(list(my_work(self.user.pk)), [task])
+
+    def test_moving_a_task_to_a_closed_status_closes_it(self):
+        task = self.add('Task')
+        task.status = self.done
+        task.save(update_fields=['status'])
+        task.refresh_from_db()
+        self.assertFalse(task.is_open)
+
+    def test_view_lists_my_open_tasks_and_overdue_ones(self):
+        self.add('Overdue', due_date=self.today - datetime.timedelta(days=1))
+        self.add('Upcoming', due_date=self.today + datetime.timedelta(days=1))
+        self.add('Finished', status=self.done)
+        self.client.login(username='u1', password='pass12345')
+        resp = self.client.get(reverse('tasks:my_work'))
+        self.assertEqual([task.name for task in resp.context['tasks']], ['Overdue', 'Upcoming'])
+        resp = self.client.get(reverse('tasks:my_work'), {'overdue': '1'})
+        self.assertEqual([task.name for task in resp.context['tasks']], ['Overdue'])
+
+    def test_view_requires_login(self):
+        resp = self.client.get(reverse('tasks:my_work'))
+        self.assertEqual(resp.status_code, 302)
+
+    def test_navbar_shows_the_count(self):
+        self.add('One')
+        self.add('Two')
+        self.client.login(username='u1', password='pass12345')
+        resp = self.client.get(reverse('statuses:list'))
+        self.assertContains(resp, '<span class="badge rounded-pill text-bg-primary">2</span>', html=True)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class MyWorkCountCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='u1', password='pass12345')
+        cls.other = User.objects.create_user(username='u2', password='pass12345')
+        cls.status = Status.objects.create(name='Todo')
+
+    def setUp(self):
+        cache.clear()
+        self.task = Task.objects.create(name='Task', status=self.status, author=self.user, executor=self.user)
+
+    def test_count_is_cached(self):
+        self.assertEqual(my_work_count(self.user.pk), 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(my_work_count(self.user.pk), 1)
+
+    def test_pages_do_not_count_once_cached(self):
+        self.client.login(username='u1', password='pass12345')
+        self.client.get(reverse('statuses:list'))
+        # user, statuses
+        with self.assertNumQueries(2):
+            self.client.get(reverse('statuses:list'))
+
+    def test_reassigning_refreshes_both_counts(self):
+        my_work_count(self.user.pk), my_work_count(self.other.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            task = Task.objects.get(pk=self.task.pk)
+            task.executor = self.other
+            task.save()
+        self.assertEqual((my_work_count(self.user.pk), my_work_count(self.other.pk)), (0, 1))
+
+    def test_new_and_deleted_tasks_refresh_the_count(self):
+        my_work_count(self.user.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            Task.objects.create(name='More', status=self.status, author=self.user, executor=self.user)
+        self.assertEqual(my_work_count(self.user.pk), 2)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.delete()
+        self.assertEqual(my_work_count(self.user.pk), 1)
+
+    def test_closing_the_status_refreshes_the_count(self):
+        my_work_count(self.user.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.status.is_closed = True
+            self.status.save()
+        self.assertEqual(my_work_count(self.user.pk), 0)
+
+    def test_unrelated_updates_keep_the_count(self):
+        my_work_count(self.user.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.name = 'Renamed'
+            self.task.save(update_fields=['name'])
+        with self.assertNumQueries(0):
+            my_work_count(self.user.pk)
+
+
+@skipUnless(connection.vendor == 'postgresql', 'INCLUDE and index-only scans are PostgreSQL features')
+class MyWorkPlanTests(TestCase):
+    def test_answered_by_an_index_only_scan(self):
+        user = User.objects.create_user(username='u1', password='pass12345')
+        with connection.cursor() as cursor:
+            # A handful of rows would otherwise be read with a sequential scan
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute('SET LOCAL enable_bitmapscan = off')
+        queryset = my_work(user.pk).only('name', 'due_date', 'priority', 'status')
+        self.assertIn('Index Only Scan using tasks_task_open_executor_idx', queryset.explain())
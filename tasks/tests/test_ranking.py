@@ -0,0 +1,134 @@
+import random
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from jobs.models import Job
+from statuses.models import Status
+from tasks.models import Task
+from tasks.ranking import (
+    DIGITS, check_rank, rank_after, rank_between, rank_increment, rebalance_column, spread_ranks,
+)
+
+
+class RankKeyTests(SimpleTestCase):
+    def assertBetween(self, before, after):
+        rank = rank_between(before, after)
+        self.assertLess(before, rank)
+        if after is not None:
+            self.assertLess(rank, after)
+        self.assertFalse(rank.endswith('0'), rank)
+        return rank
+
+    def test_between(self):
+        self.assertEqual(rank_between('', None), 'i')
+        self.assertBetween('a', 'b')
+        self.assertBetween('a', 'a1')
+        self.assertBetween('az', 'b')
+        self.assertBetween('zz', None)
+        self.assertBetween('', '01')
+        self.assertBetween('', '001')
+
+    def test_random_inserts_keep_order(self):
+        rng = random.Random(7)
+        ranks = []
+        for _ in range(2000):
+            index = rng.randint(0, len(ranks))
+            before = ranks[index - 1] if index else ''
+            after = ranks[index] if index < len(ranks) else None
+            ranks.insert(index, self.assertBetween(before, after))
+        self.assertEqual(ranks, sorted(ranks))
+        self.assertEqual(len(set(ranks)), len(ranks))
+
+    def test_repeated_inserts_at_one_spot_grow_slowly(self):
+        before, after = 'a', 'b'
+        for _ in range(100):
+            after = self.assertBetween(before, after)
+        # About one more digit per five halvings of the 36-digit alphabet
+        self.assertLess(len(after), 30)
+
+    def test_increment(self):
+        self.assertEqual(rank_increment(''), 'i')
+        self.assertEqual(rank_increment('i'), 'j')
+        self.assertEqual(rank_increment('a9'), 'aa')
+        # Carrying would end in '0'
+        self.assertEqual(rank_increment('az'), 'b1')
+        self.assertEqual(rank_increment('z'), 'z1')
+        self.assertEqual(rank_increment('zz'), 'zz01')
+
+    def test_appends_grow_logarithmically(self):
+        ranks = ['i']
+        for _ in range(50000):
+            ranks.append(rank_increment(ranks[-1]))
+            self.assertFalse(ranks[-1].endswith('0'), ranks[-1])
+        self.assertEqual(ranks, sorted(set(ranks)))
+        self.assertLessEqual(len(ranks[-1]), 8)
+
+    def test_spread(self):
+        for count in (0, 1, 17, 36, 1000):
+            ranks = spread_ranks(count)
+            self.assertEqual(len(ranks), count)
+            self.assertEqual(ranks, sorted(set(ranks)))
+            self.assertTrue(all(rank and not rank.endswith('0') and set(rank) <= set(DIGITS) for rank in ranks))
+        self.assertLessEqual(max(map(len, spread_ranks(1000))), 3)
+
+
+class ColumnRankTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username='u1', password='pass12345')
+        cls.status = Status.objects.create(name='New')
+
+    def column(self):
+        return list(Task.objects.filter(status=self.status).values_list('name', flat=True))
+
+    def test_new_tasks_go_last(self):
+        for name in ('a', 'b', 'c'):
+            Task.objects.create(name=name, status=self.status, author=self.user)
+        self.assertEqual(self.column(), ['a', 'b', 'c'])
+
+    def test_a_thousand_new_tasks_need_no_rebalance(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(1000):
+                Task.objects.create(name=f'{i:04}', status=self.status, author=self.user)
+        self.assertFalse(Job.objects.exists())
+        self.assertEqual(self.column(), [f'{i:04}' for i in range(1000)])
+        self.assertLessEqual(max(len(rank) for rank in Task.objects.values_list('rank', flat=True)), 4)
+
+    @override_settings(TASK_RANK_REBALANCE_LENGTH=4)
+    def test_long_keys_schedule_one_rebalance(self):
+        first = Task.objects.create(name='first', status=self.status, author=self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            # Every task goes right after the first one
+            for i in range(30):
+                task = Task(name=f'{i}', status=self.status, author=self.user, rank=rank_after(self.status.pk, first))
+                task.save()
+                check_rank(task)
+        order = self.column()
+        self.assertEqual(order, ['first'] + [str(i) for i in reversed(range(30))])
+        self.assertGreater(max(len(rank) for rank in Task.objects.values_list('rank', flat=True)), 4)
+        job = Job.objects.get()
+        self.assertEqual((job.name, job.args), ('tasks.ranking.rebalance_column', [self.status.pk]))
+
+        self.assertEqual(rebalance_column(self.status.pk), 31)
+        self.assertEqual(self.column(), order)
+        self.assertLessEqual(max(len(rank) for rank in Task.objects.values_list('rank', flat=True)), 2)
+
+    @override_settings(TASK_RANK_MAX_LENGTH=4)
+    def test_keys_past_the_limit_rebalance_the_column_at_once(self):
+        first = Task.objects.create(name='first', status=self.status, author=self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(30):
+                rank = rank_after(self.status.pk, first)
+                Task.objects.create(name=f'{i}', status=self.status, author=self.user, rank=rank)
+        self.assertEqual(self.column(), ['first'] + [str(i) for i in reversed(range(30))])
+        self.assertLessEqual(max(len(rank) for rank in Task.objects.values_list('rank', flat=True)), 4)
+        # Without a job: keys this short don't reach TASK_RANK_REBALANCE_LENGTH
+        self.assertFalse(Job.objects.exists())
+
+    @override_settings(TASK_RANK_MAX_LENGTH=4)
+    def test_appending_after_a_key_at_the_limit_rebalances_the_column(self):
+        Task.objects.create(name='a', status=self.status, author=self.user, rank='zzzz')
+        Task.objects.create(name='b', status=self.status, author=self.user)
+        self.assertEqual(self.column(), ['a', 'b'])
+        self.assertEqual(list(Task.objects.values_list('rank', flat=True)), ['i', 'j'])
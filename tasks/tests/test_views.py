@@ -1,10 +1,24 @@
-from django.test import TestCase, Client
+import hashlib
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, Client, override_settings
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from django.contrib.messages import get_messages
+from django.contrib.messages.constants import ERROR
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
 from django.conf import settings
+from unittest.mock import patch
 
-from tasks.models import Task
+from jobs.models import Job
+from jobs.queue import claim_next, run_job
+from labels.models import Label
+from tasks.models import Task, TaskAttachment, TaskComment, TaskDependency, TaskUpload
+from tasks.uploads import complete_upload, receive_chunk
 from statuses.models import Status
 
 
@@ -85,6 +99,14 @@ class TaskViewsTests(TestCase):
         for field in ('name', 'description', 'status', 'executor'):
             self.assertIn(field, form.fields)
 
+    def test_create_form_does_not_render_every_user(self):
+        User = get_user_model()
+        User.objects.bulk_create([User(username=f'bulk{i}') for i in range(100)])
+        self.client.login(username='u1', password='pass12345')
+        resp = self.client.get(reverse('tasks:create'))
+        self.assertNotContains(resp, 'bulk1')
+        self.assertContains(resp, 'js/autocomplete.js')
+
     def test_update_get_ok_and_form_context(self):
         self.client.login(username='u1', password='pass12345')
         resp = self.client.get(reverse('tasks:update', args=[self.task.pk]))
@@ -182,6 +204,20 @@ class TaskViewsTests(TestCase):
         self.assertRedirects(resp_post, reverse('tasks:list'))
         self.assertTrue(Task.objects.filter(pk=self.task.pk).exists())
 
+    def test_delete_get_fetches_task_once(self):
+        self.client.login(username='u1', password='pass12345')
+        # request.user + the task + the navbar's "my work" count; the author
+        # check compares author_id without loading the author
+        with self.assertNumQueries(3):
+            resp = self.client.get(reverse('tasks:delete', args=[self.task.pk]))
+        self.assertEqual(resp.status_code, 200)
+
+    def test_delete_denied_for_non_author_fetches_task_once(self):
+        self.client.login(username='u2', password='pass12345')
+        with self.assertNumQueries(2):
+            resp = self.client.get(reverse('tasks:delete', args=[self.task.pk]))
+        self.assertRedirects(resp, reverse('tasks:list'), fetch_redirect_response=False)
+
     def test_author_can_delete_own_task(self):
         """Author can delete their own task"""
         self.client.login(username='u1', password='pass12345')
@@ -254,3 +290,639 @@ class TaskViewsTests(TestCase):
         resp3 = self.client.post(reverse('tasks:delete', args=[temp.pk]), follow=True)
         msgs3 = list(get_messages(resp3.wsgi_request))
         self.assertTrue(len(msgs3) >= 1)
+
+
+class TaskListLabelsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(username='u1', password='pass12345')
+        cls.status = Status.objects.create(name='New')
+        cls.bug, cls.feature = Label.objects.bulk_create([Label(name='bug'), Label(name='feature')])
+        cls.tasks = Task.objects.bulk_create(
+            Task(name=f'Task {i}', status=cls.status, author=cls.user) for i in range(6)
+        )
+        for task in cls.tasks[:4]:
+            task.labels.add(cls.bug)
+        cls.tasks[0].labels.add(cls.feature)
+
+    def setUp(self):
+        self.client.login(username='u1', password='pass12345')
+
+    def test_labels_do_not_add_queries_per_row(self):
+        # user, the label filter choices with counts, tasks, their labels, the navbar count
+        with self.assertNumQueries(5):
+            resp = self.client.get(reverse('tasks:list'))
+        self.assertContains(resp, '>bug</span>', count=4)
+        self.assertContains(resp, '>feature</span>', count=1)
+        Task.objects.bulk_create(Task(name=f'More {i}', status=self.status, author=self.user) for i in range(20))
+        with self.assertNumQueries(5):
+            self.client.get(reverse('tasks:list'))
+
+    def test_filter_by_label(self):
+        resp = self.client.get(reverse('tasks:list'), {'label': self.feature.pk})
+        self.assertEqual(list(resp.context['tasks']), [self.tasks[0]])
+
+    def test_filter_choices_show_task_counts(self):
+        resp = self.client.get(reverse('tasks:list'))
+        self.assertContains(resp, 'bug (4)')
+        self.assertContains(resp, 'feature (1)')
+
+    def test_unknown_label_is_ignored(self):
+        resp = self.client.get(reverse('tasks:list'), {'label': 999})
+        self.assertEqual(resp.context['tasks'].count(), 6)
+
+    def test_create_with_labels(self):
+        resp = self.client.post(reverse('tasks:create'), {
+            'name': 'Labelled', 'status': self.status.pk, 'labels': [self.bug.pk, self.feature.pk],
+        })
+        self.assertRedirects(resp, reverse('tasks:list'))
+        task = Task.objects.get(name='Labelled')
+        self.assertEqual(set(task.labels.all()), {self.bug, self.feature})
+
+    def test_detail_shows_labels(self):
+        resp = self.client.get(reverse('tasks:detail', args=[self.tasks[0].pk]))
+        self.assertContains(resp, '>bug</span>')
+        self.assertContains(resp, '>feature</span>')
+
+
+class TaskExportTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.media_root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, cls.media_root)
+        cls.enterClassContext(override_settings(MEDIA_ROOT=cls.media_root))
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(username='u1', password='pass12345')
+        cls.other = User.objects.create_user(username='u2', password='pass12345')
+        cls.status = Status.objects.create(name='New')
+        cls.bug = Label.objects.create(name='bug')
+        cls.tasks = Task.objects.bulk_create(
+            Task(name=f'Task {i}', status=cls.status, author=cls.user) for i in range(3)
+        )
+        cls.tasks[0].labels.add(cls.bug)
+
+    def setUp(self):
+        self.client.login(username='u1', password='pass12345')
+
+    def export(self, data):
+        resp = self.client.post(reverse('tasks:export'), data)
+        job = Job.objects.get()
+        self.assertRedirects(resp, reverse('jobs:detail', args=[job.pk]))
+        run_job(claim_next())
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.SUCCEEDED)
+        return job
+
+    def test_export_runs_as_a_job_of_the_user(self):
+        job = self.export({'label': ''})
+        self.assertEqual((job.created_by, job.result['tasks']), (self.user, 3))
+        resp = self.client.get(reverse('jobs:list'))
+        self.assertEqual(list(resp.context['jobs']), [job])
+        self.assertContains(self.client.get(reverse('jobs:detail', args=[job.pk])), reverse('jobs:file', args=[job.pk]))
+
+        resp = self.client.get(reverse('jobs:file', args=[job.pk]))
+        self.assertEqual(resp.status_code, 200)
+        rows = b''.join(resp.streaming_content).decode().splitlines()
+        self.assertEqual(rows[0], 'id,name,status,author,executor,due_date,priority,labels,created_at')
+        self.assertEqual([row.split(',')[1] for row in rows[1:]], ['Task 0', 'Task 1', 'Task 2'])
+
+        self.client.login(username='u2', password='pass12345')
+        self.assertEqual(self.client.get(reverse('jobs:file', args=[job.pk])).status_code, 404)
+
+    def test_export_of_a_label(self):
+        job = self.export({'label': self.bug.pk})
+        self.assertEqual(job.result['tasks'], 1)
+        resp = self.client.get(reverse('jobs:file', args=[job.pk]))
+        self.assertIn(b'Task 0', b''.join(resp.streaming_content))
+
+    def test_export_requires_post(self):
+        self.assertEqual(self.client.get(reverse('tasks:export')).status_code, 405)
+        self.assertFalse(Job.objects.exists())
+
+
+class TaskCommentsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(username='u1', password='pass12345')
+        cls.status = Status.objects.create(name='New')
+        cls.task = Task.objects.create(name='Task A', status=cls.status, author=cls.user)
+
+    def setUp(self):
+        self.client.login(username='u1', password='pass12345')
+
+    def add_comments(self, count):
+        for i in range(count):
+            TaskComment.objects.create(task=self.task, author=self.user, text=f'Comment {i}')
+
+    def test_post_comment(self):
+        url = reverse('tasks:comment_create', args=[self.task.pk])
+        resp = self.client.post(url, {'text': 'Looks good'})
+        self.assertRedirects(resp, reverse('tasks:detail', args=[self.task.pk]) + '#comments')
+        self.assertEqual(self.task.comments.get().author, self.user)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.comments_count, 1)
+
+    def test_empty_comment_is_rejected(self):
+        resp = self.client.post(reverse('tasks:comment_create', args=[self.task.pk]), {'text': ''}, follow=True)
+        self.assertFalse(TaskComment.objects.exists())
+        self.assertTrue(any(m.level == ERROR for m in get_messages(resp.wsgi_request)))
+
+    def test_comment_requires_login_and_post(self):
+        url = reverse('tasks:comment_create', args=[self.task.pk])
+        self.assertEqual(self.client.get(url).status_code, 405)
+        self.client.logout()
+        resp = self.client.post(url, {'text': 'x'})
+        self.assertRedirects(resp, f"{reverse('login')}?next={url}")
+
+    def test_comment_on_missing_task(self):
+        resp = self.client.post(reverse('tasks:comment_create', args=[999]), {'text': 'x'})
+        self.assertEqual(resp.status_code, 404)
+
+    def test_detail_queries_do_not_grow_with_comments(self):
+        self.add_comments(30)
+        # user, task with status/author/executor, labels, attachments, first
+        # page of comments with authors, the navbar count
+        with self.assertNumQueries(6):
+            resp = self.client.get(reverse('tasks:detail', args=[self.task.pk]))
+        self.assertContains(resp, 'Comment 29')
+        self.assertNotContains(resp, 'Comment 9<')
+        self.assertContains(resp, '<span class="badge text-bg-secondary">30</span>', html=True)
+
+    def test_older_comments_load_page_by_page(self):
+        self.add_comments(5)
+        with patch('tasks.views.TaskDetailView.comments_page_size', 2):
+            seen, cursor = [], None
+            while True:
+                resp = self.client.get(reverse('tasks:comments', args=[self.task.pk]), {'after': cursor} if cursor else {})
+                seen += [comment.text for comment in resp.context['comments']]
+                cursor = resp.context['next_comments_cursor']
+                if cursor is None:
+                    break
+                self.assertContains(resp, f'data-load-more-url="{reverse("tasks:comments", args=[self.task.pk])}?after={cursor}"')
+        self.assertEqual(seen, [f'Comment {i}' for i in reversed(range(5))])
+        self.assertNotContains(resp, '<html')
+
+    def test_list_shows_comment_count_without_counting(self):
+        self.add_comments(3)
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(reverse('tasks:list'))
+        self.assertContains(resp, '<td>3</td>', html=True)
+        self.assertFalse([q for q in ctx.captured_queries if 'tasks_taskcomment' in q['sql']])
+
+
+class TaskHistoryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(username='u1', password='pass12345')
+        cls.new = Status.objects.create(name='New')
+        cls.done = Status.objects.create(name='Done')
+        cls.task = Task.objects.create(name='Task A', status=cls.new, author=cls.user)
+
+    def setUp(self):
+        self.client.login(username='u1', password='pass12345')
+
+    def test_update_shows_up_in_history(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('tasks:update', args=[self.task.pk]), {
+                'name': 'Task A', 'status': self.done.pk,
+            })
+        resp = self.client.get(reverse('tasks:history', args=[self.task.pk]))
+        self.assertEqual(resp.status_code, 200)
+        self.assertContains(resp, 'New &rarr; Done', html=False)
+        self.assertEqual(resp.context['history'][0].actor, self.user)
+
+    def test_history_is_paginated(self):
+        for i in range(3):
+            self.task.name = f'Name {i}'
+            with self.captureOnCommitCallbacks(execute=True):
+                self.task.save()
+        with patch('tasks.views.TaskHistoryView.history_page_size', 2):
+            first = self.client.get(reverse('tasks:history', args=[self.task.pk]))
+            cursor = first.context['next_cursor']
+            self.assertContains(first, f'?before={cursor}')
+            second = self.client.get(reverse('tasks:history', args=[self.task.pk]), {'before': cursor})
+        self.assertEqual(len(second.context['history']), 1)
+        self.assertIsNone(second.context['next_cursor'])
+        self.assertContains(second, 'Name 0')
+
+    def test_empty_history(self):
+        resp = self.client.get(reverse('tasks:history', args=[self.task.pk]))
+        self.assertContains(resp, 'No changes recorded yet.')
+
+    def test_history_requires_login(self):
+        self.client.logout()
+        url = reverse('tasks:history', args=[self.task.pk])
+        resp = self.client.get(url)
+        self.assertRedirects(resp, f"{reverse('login')}?next={url}")
+
+
+def count_context_processor(request):
+    count_context_processor.calls += 1
+    return {}
+
+
+@override_settings(TASK_LIST_STREAMING=True)
+class TaskListStreamingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(username='u1', password='pass12345')
+        cls.status = Status.objects.create(name='New')
+        Task.objects.bulk_create(
+            Task(name=f'Task {i}', status=cls.status, author=cls.user, executor=cls.user) for i in range(5)
+        )
+
+    def setUp(self):
+        self.client.login(username='u1', password='pass12345')
+
+    def test_rows_are_streamed_in_chunks(self):
+        with patch('tasks.views.TaskListView.stream_chunk_size', 2):
+            resp = self.client.get(reverse('tasks:list'))
+            self.assertTrue(resp.streaming)
+            parts = [part.decode() for part in resp.streaming_content]
+        # page head, three chunks of rows (2 + 2 + 1), page tail
+        self.assertEqual(len(parts), 5)
+        self.assertIn('<tbody>', parts[0])
+        self.assertNotIn('Task 0', parts[0])
+        self.assertEqual([part.count('<tr>') for part in parts[1:4]], [2, 2, 1])
+        self.assertIn('</html>', parts[-1])
+
+    def test_context_processors_run_once(self):
+        templates = [{
+            **settings.TEMPLATES[0],
+            'OPTIONS': {
+                'context_processors': [
+                    *settings.TEMPLATES[0]['OPTIONS']['context_processors'],
+                    f'{__name__}.count_context_processor',
+                ],
+            },
+        }]
+        count_context_processor.calls = 0
+        with override_settings(TEMPLATES=templates), patch('tasks.views.TaskListView.stream_chunk_size', 2):
+            content = b''.join(self.client.get(reverse('tasks:list')).streaming_content).decode()
+        # Once for the page, not again for each of the three chunks of rows
+        self.assertEqual(count_context_processor.calls, 1)
+        self.assertEqual(content.count('<tr>'), 6)
+
+    def test_same_rows_as_regular_rendering(self):
+        streamed = b''.join(self.client.get(reverse('tasks:list')).streaming_content).decode()
+        with override_settings(TASK_LIST_STREAMING=False):
+            regular = self.client.get(reverse('tasks:list')).content.decode()
+        for i in range(5):
+            self.assertIn(f'Task {i}</a>', streamed)
+        self.assertEqual(streamed.count('<tr>'), regular.count('<tr>'))
+
+    def test_rows_have_related_objects_preloaded(self):
+        resp = self.client.get(reverse('tasks:list'))
+        # exists() check, then one query for the rows and one for their labels per chunk
+        with self.assertNumQueries(2):
+            b''.join(resp.streaming_content)
+
+    def test_labels_are_prefetched_per_chunk(self):
+        label = Label.objects.create(name='bug')
+        for task in Task.objects.all():
+            task.labels.add(label)
+        with patch('tasks.views.TaskListView.stream_chunk_size', 2):
+            resp = self.client.get(reverse('tasks:list'))
+            # the rows, then the labels of each of the three chunks
+            with self.assertNumQueries(4):
+                content = b''.join(resp.streaming_content).decode()
+        self.assertEqual(content.count('>bug</span>'), 5)
+
+    def test_empty_list(self):
+        Task.objects.all().delete()
+        resp = self.client.get(reverse('tasks:list'))
+        self.assertContains(resp, 'No tasks yet.')
+
+
+class TaskAttachmentsTests(TestCase):
+    DATA = bytes(range(256)) * 100
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.media_root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, cls.media_root)
+        cls.enterClassContext(override_settings(MEDIA_ROOT=cls.media_root))
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(username='u1', password='pass12345')
+        cls.other = User.objects.create_user(username='u2', password='pass12345')
+        cls.status = Status.objects.create(name='New')
+        cls.task = Task.objects.create(name='Task A', status=cls.status, author=cls.user)
+
+    def setUp(self):
+        self.client.login(username='u1', password='pass12345')
+        # Files outlive the rolled back rows
+        self.addCleanup(lambda: [shutil.rmtree(path) for path in Path(self.media_root).iterdir()])
+
+    def stored_files(self):
+        return sorted(path.relative_to(self.media_root).as_posix() for path in Path(self.media_root).rglob('*') if path.is_file())
+
+    def attach(self, data=DATA, name='report.pdf', client=None):
+        return (client or self.client).post(
+            reverse('tasks:attachment_create', args=[self.task.pk]), {'file': SimpleUploadedFile(name, data)},
+        )
+
+    def put_chunk(self, url, data, start, size):
+        return self.client.put(
+            url, data, content_type='application/octet-stream',
+            headers={'content-range': f'bytes {start}-{start + len(data) - 1}/{size}'},
+        )
+
+    def test_multipart_upload_is_streamed_to_storage(self):
+        resp = self.attach()
+        self.assertRedirects(resp, reverse('tasks:detail', args=[self.task.pk]) + '#attachments')
+        attachment = self.task.attachments.get()
+        self.assertEqual((attachment.name, attachment.size, attachment.uploaded_by), ('report.pdf', len(self.DATA), self.user))
+        self.assertEqual(attachment.sha256, hashlib.sha256(self.DATA).hexdigest())
+        self.assertTrue(attachment.file.name.startswith(f'attachments/{self.task.pk}/'))
+        self.assertEqual(Path(attachment.file.path).read_bytes(), self.DATA)
+        self.assertEqual(self.stored_files(), [attachment.file.name])
+
+    def test_multipart_upload_checks_csrf_token(self):
+        client = Client(enforce_csrf_checks=True)
+        client.login(username='u1', password='pass12345')
+        resp = self.attach(client=client)
+        self.assertEqual(resp.status_code, 403)
+        self.assertFalse(TaskAttachment.objects.exists())
+        self.assertEqual(self.stored_files(), [])
+
+    @override_settings(ATTACHMENT_MAX_SIZE=1000)
+    def test_multipart_upload_over_max_size(self):
+        resp = self.attach()
+        self.assertFalse(TaskAttachment.objects.exists())
+        self.assertEqual(self.stored_files(), [])
+        self.assertEqual([m.level for m in get_messages(resp.wsgi_request)], [ERROR])
+
+    def test_multipart_upload_requires_login(self):
+        self.client.logout()
+        resp = self.attach()
+        self.assertEqual(resp.status_code, 302)
+        self.assertEqual(self.stored_files(), [])
+
+    def test_chunked_upload_resumes_from_offset(self):
+        resp = self.client.post(reverse('tasks:upload_create', args=[self.task.pk]), {'name': 'big.bin', 'size': len(self.DATA)})
+        self.assertEqual(resp.status_code, 201)
+        url = resp.json()['url']
+        size = len(self.DATA)
+
+        resp = self.put_chunk(url, self.DATA[:10000], 0, size)
+        self.assertEqual(resp.json(), {'offset': 10000})
+        # A chunk that doesn't start at the offset is refused with the offset to resume from
+        resp = self.put_chunk(url, self.DATA[20000:], 20000, size)
+        self.assertEqual(resp.status_code, 409)
+        self.assertEqual(resp.json(), {'offset': 10000})
+        self.assertEqual(self.client.get(url).json(), {'offset': 10000, 'size': size})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            resp = self.put_chunk(url, self.DATA[10000:], 10000, size)
+        self.assertEqual(resp.status_code, 201)
+        attachment = self.task.attachments.get()
+        self.assertEqual(resp.json()['url'], reverse('tasks:attachment', args=[self.task.pk, attachment.pk]))
+        self.assertEqual(attachment.sha256, hashlib.sha256(self.DATA).hexdigest())
+        self.assertEqual(Path(attachment.file.path).read_bytes(), self.DATA)
+        self.assertFalse(TaskUpload.objects.exists())
+        self.assertEqual(self.stored_files(), [attachment.file.name])
+
+    def test_chunk_overtaken_by_another_request_is_refused(self):
+        upload = TaskUpload.objects.create(task=self.task, uploaded_by=self.user, name='a.bin', size=100)
+        url = reverse('tasks:upload', args=[self.task.pk, upload.pk])
+        self.put_chunk(url, b'a' * 10, 0, 100)
+
+        def receive_then_lose_the_race(*args):
+            received = receive_chunk(*args)
+            # Another request appended the same range while this one was reading
+            TaskUpload.objects.filter(pk=upload.pk).update(received=20)
+            return received
+
+        with patch('tasks.views.receive_chunk', side_effect=receive_then_lose_the_race):
+            resp = self.put_chunk(url, b'b' * 10, 10, 100)
+        self.assertEqual((resp.status_code, resp.json()), (409, {'offset': 20}))
+        # The chunk's part file is gone and the upload's file untouched
+        self.assertEqual(self.stored_files(), [upload.storage_name])
+        self.assertEqual(Path(self.media_root, upload.storage_name).read_bytes(), b'a' * 10)
+
+    def test_completing_an_upload_that_rolls_back_keeps_its_file(self):
+        upload = TaskUpload.objects.create(task=self.task, uploaded_by=self.user, name='a.bin', size=3, received=3)
+        storage_name = upload.storage_name
+        path = Path(self.media_root, storage_name)
+        path.parent.mkdir(parents=True)
+        path.write_bytes(b'abc')
+        with self.captureOnCommitCallbacks(execute=True), self.assertRaises(RuntimeError), transaction.atomic():
+            complete_upload(upload)
+            raise RuntimeError
+        self.assertFalse(TaskAttachment.objects.exists())
+        self.assertEqual(TaskUpload.objects.get().storage_name, storage_name)
+        self.assertEqual(self.stored_files(), [storage_name])
+
+    def test_chunked_upload_validation(self):
+        url = reverse('tasks:upload_create', args=[self.task.pk])
+        self.assertEqual(self.client.post(url, {'name': 'empty.txt', 'size': 0}).status_code, 400)
+        with override_settings(ATTACHMENT_MAX_SIZE=100):
+            self.assertIn('size', self.client.post(url, {'name': 'big.bin', 'size': 101}).json()['errors'])
+
+        upload = TaskUpload.objects.create(task=self.task, uploaded_by=self.user, name='a.bin', size=100)
+        upload_url = reverse('tasks:upload', args=[self.task.pk, upload.pk])
+        self.assertEqual(self.client.put(upload_url, b'x').status_code, 400)
+        self.assertEqual(self.put_chunk(upload_url, b'x' * 10, 95, 100).status_code, 400)
+        self.assertEqual(self.put_chunk(upload_url, b'x' * 10, 0, 200).status_code, 400)
+        # Someone else's upload
+        self.client.login(username='u2', password='pass12345')
+        self.assertEqual(self.client.get(upload_url).status_code, 404)
+
+    def test_download_with_range(self):
+        self.attach()
+        attachment = self.task.attachments.get()
+        url = reverse('tasks:attachment', args=[self.task.pk, attachment.pk])
+        resp = self.client.get(url)
+        self.assertEqual(b''.join(resp.streaming_content), self.DATA)
+        self.assertEqual(resp['Content-Disposition'], 'attachment; filename="report.pdf"')
+        self.assertEqual(resp['ETag'], f'"{attachment.sha256}"')
+        resp = self.client.get(url, headers={'range': 'bytes=-100'})
+        self.assertEqual(resp.status_code, 206)
+        self.assertEqual(b''.join(resp.streaming_content), self.DATA[-100:])
+        self.assertEqual(self.client.get(reverse('tasks:attachment', args=[999, attachment.pk])).status_code, 404)
+
+    def test_detail_lists_attachments(self):
+        self.attach()
+        resp = self.client.get(reverse('tasks:detail', args=[self.task.pk]))
+        self.assertContains(resp, 'report.pdf')
+        self.assertContains(resp, reverse('tasks:attachment_delete', args=[self.task.pk, self.task.attachments.get().pk]))
+
+    def test_delete_removes_file(self):
+        self.attach()
+        attachment = self.task.attachments.get()
+        url = reverse('tasks:attachment_delete', args=[self.task.pk, attachment.pk])
+
+        self.client.login(username='u2', password='pass12345')
+        self.client.post(url)
+        self.assertTrue(TaskAttachment.objects.exists())
+
+        self.client.login(username='u1', password='pass12345')
+        with self.captureOnCommitCallbacks(execute=True):
+            resp = self.client.post(url)
+        self.assertRedirects(resp, reverse('tasks:detail', args=[self.task.pk]) + '#attachments')
+        self.assertFalse(TaskAttachment.objects.exists())
+        self.assertEqual(self.stored_files(), [])
+
+    def test_deleting_task_removes_files(self):
+        task = Task.objects.create(name='Task B', status=self.status, author=self.user)
+        self.client.post(reverse('tasks:attachment_create', args=[task.pk]), {'file': SimpleUploadedFile('a.txt', b'abc')})
+        TaskUpload.objects.create(task=task, uploaded_by=self.user, name='b.bin', size=100)
+        with self.captureOnCommitCallbacks(execute=True):
+            task.delete()
+        self.assertEqual(self.stored_files(), [])
+
+
+class TaskDependenciesTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(username='u1', password='pass12345')
+        cls.status = Status.objects.create(name='New')
+        cls.design, cls.build, cls.ship = Task.objects.bulk_create(
+            Task(name=name, status=cls.status, author=cls.user) for name in ('Design', 'Build', 'Ship')
+        )
+
+    def setUp(self):
+        self.client.login(username='u1', password='pass12345')
+
+    def add(self, task, blocker):
+        return self.client.post(reverse('tasks:dependency_create', args=[task.pk]), {'blocked_by': blocker.pk}, follow=True)
+
+    def test_add_and_remove_dependency(self):
+        resp = self.add(self.ship, self.build)
+        self.assertRedirects(resp, reverse('tasks:dependencies', args=[self.ship.pk]))
+        self.assertEqual(list(self.ship.blocked_by.all()), [self.build])
+        self.client.post(reverse('tasks:dependency_delete', args=[self.ship.pk, self.build.pk]))
+        self.assertFalse(TaskDependency.objects.exists())
+
+    def test_cycle_is_refused(self):
+        self.add(self.ship, self.build)
+        self.add(self.build, self.design)
+        resp = self.add(self.design, self.ship)
+        self.assertEqual(TaskDependency.objects.count(), 2)
+        self.assertEqual([str(m) for m in get_messages(resp.wsgi_request)], ['Ship already waits for this task.'])
+
+    def test_tab_shows_critical_path(self):
+        TaskDependency.objects.bulk_create([
+            TaskDependency(task=self.ship, blocked_by=self.build),
+            TaskDependency(task=self.build, blocked_by=self.design),
+        ])
+        resp = self.client.get(reverse('tasks:dependencies', args=[self.ship.pk]))
+        self.assertEqual(resp.context['critical_path'], [self.design, self.build])
+        self.assertEqual(set(resp.context['all_blockers']), {self.design, self.build})
+        self.assertContains(resp, reverse('tasks:dependency_delete', args=[self.ship.pk, self.build.pk]))
+        resp = self.client.get(reverse('tasks:dependencies', args=[self.design.pk]))
+        self.assertEqual(list(resp.context['blocks']), [self.build])
+        self.assertContains(resp, 'Nothing blocks this task.')
+
+    def test_list_marks_blocked_tasks_in_the_same_query(self):
+        TaskDependency.objects.create(task=self.ship, blocked_by=self.build)
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(reverse('tasks:list'))
+        self.assertEqual({task.name for task in resp.context['tasks'] if task.is_blocked}, {'Ship'})
+        self.assertContains(resp, 'text-bg-warning', count=1)
+        self.assertEqual(len([q for q in ctx.captured_queries if 'tasks_taskdependency' in q['sql']]), 1)
+
+    def test_done_blockers_do_not_block(self):
+        TaskDependency.objects.create(task=self.ship, blocked_by=self.build)
+        self.build.status = Status.objects.create(name='Done', is_closed=True)
+        self.build.save()
+        resp = self.client.get(reverse('tasks:list'))
+        self.assertFalse(any(task.is_blocked for task in resp.context['tasks']))
+
+    def test_lookup(self):
+        resp = self.client.get(reverse('tasks:lookup'), {'q': 'bu'})
+        self.assertEqual(resp.json(), {'results': [{'id': self.build.pk, 'text': 'Build'}]})
+        resp = self.client.get(reverse('tasks:lookup'), {'q': str(self.ship.pk)})
+        self.assertEqual(resp.json()['results'], [{'id': self.ship.pk, 'text': 'Ship'}])
+
+
+class TaskBoardTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(username='u1', password='pass12345')
+        cls.todo = Status.objects.create(name='1 To do')
+        cls.done = Status.objects.create(name='2 Done')
+        Status.objects.create(name='3 Empty')
+        cls.tasks = [Task.objects.create(name=f'Todo {i}', status=cls.todo, author=cls.user) for i in range(5)]
+        cls.finished = Task.objects.create(name='Finished', status=cls.done, author=cls.user)
+
+    def setUp(self):
+        self.client.login(username='u1', password='pass12345')
+
+    def column(self, resp, status):
+        return next(column for column in resp.context['columns'] if column['status'] == status)
+
+    def test_columns_come_from_one_windowed_query(self):
+        with patch('tasks.views.TaskBoardView.column_size', 2):
+            # user, statuses, the first tasks of every column, the navbar count
+            with self.assertNumQueries(4):
+                resp = self.client.get(reverse('tasks:board'))
+        self.assertEqual([column['status'].name for column in resp.context['columns']], ['1 To do', '2 Done', '3 Empty'])
+        todo = self.column(resp, self.todo)
+        self.assertEqual([task.name for task in todo['tasks']], ['Todo 0', 'Todo 1'])
+        self.assertIsNotNone(todo['next_cursor'])
+        self.assertEqual([task.name for task in self.column(resp, self.done)['tasks']], ['Finished'])
+        self.assertIsNone(self.column(resp, self.done)['next_cursor'])
+        self.assertContains(resp, f'{reverse("tasks:board_column", args=[self.todo.pk])}?after={todo["next_cursor"]}')
+
+    def test_column_loads_page_by_page(self):
+        with patch('tasks.views.TaskBoardView.column_size', 2):
+            seen, cursor = [], None
+            while True:
+                resp = self.client.get(reverse('tasks:board_column', args=[self.todo.pk]), {'after': cursor} if cursor else {})
+                seen += [task.name for task in resp.context['tasks']]
+                cursor = resp.context['next_cursor']
+                if cursor is None:
+                    break
+        self.assertEqual(seen, [f'Todo {i}' for i in range(5)])
+        self.assertNotContains(resp, '<html')
+
+    def column_order(self, status):
+        return list(Task.objects.filter(status=status).values_list('name', flat=True))
+
+    def test_move_to_the_end_of_another_column(self):
+        url = reverse('tasks:move', args=[self.tasks[0].pk])
+        resp = self.client.post(url, {'status': self.done.pk}, content_type='application/json')
+        self.tasks[0].refresh_from_db()
+        self.assertEqual(resp.json(), {'id': self.tasks[0].pk, 'status': self.done.pk, 'rank': self.tasks[0].rank})
+        self.assertEqual(self.column_order(self.done), ['Finished', 'Todo 0'])
+
+    def test_reorder_writes_one_row(self):
+        url = reverse('tasks:move', args=[self.tasks[4].pk])
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.post(url, {'status': self.todo.pk, 'after': self.tasks[1].pk}, content_type='application/json')
+        self.assertEqual(len([q for q in ctx.captured_queries if q['sql'].startswith('UPDATE')]), 1)
+        self.assertEqual(self.column_order(self.todo), ['Todo 0', 'Todo 1', 'Todo 4', 'Todo 2', 'Todo 3'])
+        self.client.post(url, {'status': self.todo.pk, 'after': None}, content_type='application/json')
+        self.assertEqual(self.column_order(self.todo), ['Todo 4', 'Todo 0', 'Todo 1', 'Todo 2', 'Todo 3'])
+        # The task to go after must be in the target column
+        resp = self.client.post(url, {'status': self.todo.pk, 'after': self.finished.pk}, content_type='application/json')
+        self.assertEqual(resp.status_code, 400)
+
+    def test_status_change_in_form_moves_task_to_the_end(self):
+        task = self.tasks[0]
+        self.client.post(reverse('tasks:update', args=[task.pk]), {'name': task.name, 'status': self.done.pk})
+        self.assertEqual(self.column_order(self.done), ['Finished', 'Todo 0'])
+
+    def test_move_rejects_bad_input(self):
+        url = reverse('tasks:move', args=[self.tasks[0].pk])
+        for body in ('not json', '[]', '{"status": "x"}', '{"status": 999}'):
+            resp = self.client.generic('POST', url, body, content_type='application/json')
+            self.assertEqual(resp.status_code, 400)
+        self.assertEqual(self.client.get(url).status_code, 405)
+        self.tasks[0].refresh_from_db()
+        self.assertEqual(self.tasks[0].status, self.todo)
@@ -0,0 +1,169 @@
+"""Task attachment uploads written straight to the default (filesystem) storage.
+
+Two ways in, neither of which holds a file in memory or in a temporary
+copy:
+
+* a multipart form post, parsed with ``AttachmentUploadHandler``, which
+  writes each chunk to the file's final place in storage and hashes it as
+  it streams past;
+* a resumable upload (``TaskUpload``) fed with ``Content-Range`` chunks.
+  ``receive_chunk`` reads each one from the client into a part file of its
+  own without any lock held, then ``append_chunk`` adds it to the upload's
+  file under the upload's row lock. A chunk cut short by a dropped
+  connection keeps what arrived, and the client resumes from the stored
+  offset. The hash can't be carried from one worker to another between
+  chunks, so the assembled file is hashed once when the last chunk
+  arrives, block by block.
+"""
+import hashlib
+import os
+import shutil
+import uuid
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, StopFutureHandlers, StopUpload
+
+BLOCK_SIZE = 64 * 2**10
+
+
+def attachment_name(task_id):
+    """Storage name for a new attachment; the client's file name is never part of the path."""
+    return f'attachments/{task_id}/{uuid.uuid4().hex}'
+
+
+def open_for_writing(name):
+    path = default_storage.path(name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return open(path, 'wb')
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        while block := file.read(BLOCK_SIZE):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class StoredUpload(UploadedFile):
+    """An uploaded file that is already in storage under ``storage_name``."""
+
+    def __init__(self, storage_name, name, content_type, size, charset, sha256):
+        super().__init__(None, name, content_type, size, charset)
+        self.storage_name = storage_name
+        self.sha256 = sha256
+
+    def close(self):
+        # Nothing is kept open; the handler closed the stored file
+        pass
+
+
+class AttachmentUploadHandler(FileUploadHandler):
+    """Stream uploaded files into storage, computing their SHA-256 on the way.
+
+    Install it on the request before ``request.POST``/``FILES`` is read.
+    Files larger than ``ATTACHMENT_MAX_SIZE`` are deleted and stop the upload
+    (``too_large`` is then set).
+    """
+
+    chunk_size = BLOCK_SIZE
+
+    def __init__(self, request, task_id):
+        super().__init__(request)
+        self.task_id = task_id
+        # Not ``file``: the multipart parser closes handlers' ``file`` on errors
+        self.destination = None
+        self.too_large = False
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.storage_name = attachment_name(self.task_id)
+        self.destination = open_for_writing(self.storage_name)
+        self.digest = hashlib.sha256()
+        self.received = 0
+        raise StopFutureHandlers
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > settings.ATTACHMENT_MAX_SIZE:
+            self.too_large = True
+            self.upload_interrupted()
+            raise StopUpload(connection_reset=True)
+        self.digest.update(raw_data)
+        self.destination.write(raw_data)
+
+    def file_complete(self, file_size):
+        self.destination.close()
+        self.destination = None
+        return StoredUpload(
+            self.storage_name, self.file_name, self.content_type, file_size, self.charset, self.digest.hexdigest(),
+        )
+
+    def upload_interrupted(self):
+        if self.destination is not None:
+            self.destination.close()
+            self.destination = None
+            default_storage.delete(self.storage_name)
+
+
+def receive_chunk(upload, stream, length):
+    """Save up to ``length`` bytes read from ``stream`` to a new part file of ``upload``.
+
+    Returns the part's storage name and the number of bytes written, which
+    is short of ``length`` if the stream ends early. The caller deletes the
+    part once it has been appended.
+    """
+    name = f'{upload.storage_name}.{uuid.uuid4().hex}.part'
+    written = 0
+    with open_for_writing(name) as file:
+        while written < length:
+            block = stream.read(min(BLOCK_SIZE, length - written))
+            if not block:
+                break
+            file.write(block)
+            written += len(block)
+    return name, written
+
+
+def append_chunk(upload, part_name, start):
+    """Write the part file ``part_name`` to ``upload``'s file at ``start``, its current offset."""
+    path = default_storage.path(upload.storage_name)
+    with open(path, 'r+b' if os.path.exists(path) else 'w+b') as file, default_storage.open(part_name) as part:
+        # Drop anything past the recorded offset, e.g. from an append that failed halfway
+        file.seek(start)
+        file.truncate()
+        shutil.copyfileobj(part, file, BLOCK_SIZE)
+
+
+def move_file(path, destination):
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    os.replace(path, destination)
+
+
+def complete_upload(upload):
+    """Turn a fully received ``upload`` into a TaskAttachment and return it.
+
+    The file is moved to the attachment's name only once the new row is
+    committed, so a rollback leaves the upload as it was.
+    """
+    from .models import TaskAttachment
+
+    path = default_storage.path(upload.storage_name)
+    sha256 = file_sha256(path)
+    name = attachment_name(upload.task_id)
+    with transaction.atomic():
+        attachment = TaskAttachment.objects.create(
+            task_id=upload.task_id,
+            uploaded_by_id=upload.uploaded_by_id,
+            file=name,
+            name=upload.name,
+            size=upload.size,
+            sha256=sha256,
+        )
+        # Registered before upload.delete()'s callback, which deletes whatever is left at the upload's name
+        transaction.on_commit(lambda: move_file(path, default_storage.path(name)))
+        upload.delete()
+    return attachment
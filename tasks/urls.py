@@ -1,18 +1,56 @@
 from django.urls import path
 from .views import (
     TaskListView,
+    TaskExportView,
+    MyWorkView,
+    TaskBoardView,
+    TaskBoardColumnView,
+    TaskMoveView,
     TaskCreateView,
     TaskUpdateView,
     TaskDeleteView,
     TaskDetailView,
+    TaskHistoryView,
+    TaskDependenciesView,
+    TaskDependencyCreateView,
+    TaskDependencyDeleteView,
+    TaskLookupView,
+    TaskCommentsView,
+    TaskCommentCreateView,
+    TaskAttachmentCreateView,
+    TaskAttachmentDownloadView,
+    TaskAttachmentDeleteView,
+    TaskUploadCreateView,
+    TaskUploadView,
 )
 
 app_name = 'tasks'
 
 urlpatterns = [
     path('', TaskListView.as_view(), name='list'),                     # GET /tasks/
+    path('export/', TaskExportView.as_view(), name='export'),         # POST label=<id>
+    path('my/', MyWorkView.as_view(), name='my_work'),                # GET /tasks/my/?overdue=1
+    path('board/', TaskBoardView.as_view(), name='board'),            # GET /tasks/board/
+    path('board/<int:status_pk>/', TaskBoardColumnView.as_view(), name='board_column'),  # GET ?after=<cursor>
+    path('lookup/', TaskLookupView.as_view(), name='lookup'),          # GET /tasks/lookup/?q=
     path('create/', TaskCreateView.as_view(), name='create'),          # GET/POST /tasks/create/
     path('<int:pk>/update/', TaskUpdateView.as_view(), name='update'), # GET/POST /tasks/<pk>/update/
     path('<int:pk>/delete/', TaskDeleteView.as_view(), name='delete'), # GET/POST /tasks/<pk>/delete/
     path('<int:pk>/', TaskDetailView.as_view(), name='detail'),        # GET /tasks/<pk>/
+    path('<int:pk>/history/', TaskHistoryView.as_view(), name='history'),  # GET /tasks/<pk>/history/
+    path('<int:pk>/move/', TaskMoveView.as_view(), name='move'),      # POST {"status": <id>}
+    path('<int:pk>/dependencies/', TaskDependenciesView.as_view(), name='dependencies'),  # GET
+    path('<int:pk>/dependencies/create/', TaskDependencyCreateView.as_view(), name='dependency_create'),  # POST
+    path(
+        '<int:pk>/dependencies/<int:blocker_pk>/delete/', TaskDependencyDeleteView.as_view(), name='dependency_delete',
+    ),  # POST
+    path('<int:pk>/comments/', TaskCommentsView.as_view(), name='comments'),  # GET /tasks/<pk>/comments/
+    path('<int:pk>/comments/create/', TaskCommentCreateView.as_view(), name='comment_create'),  # POST
+    path('<int:pk>/attachments/', TaskAttachmentCreateView.as_view(), name='attachment_create'),  # POST (multipart)
+    path('<int:pk>/attachments/<int:attachment_pk>/', TaskAttachmentDownloadView.as_view(), name='attachment'),  # GET
+    path(
+        '<int:pk>/attachments/<int:attachment_pk>/delete/', TaskAttachmentDeleteView.as_view(), name='attachment_delete',
+    ),  # POST
+    path('<int:pk>/uploads/', TaskUploadCreateView.as_view(), name='upload_create'),  # POST
+    path('<int:pk>/uploads/<uuid:upload_pk>/', TaskUploadView.as_view(), name='upload'),  # GET/PUT (chunks)
 ]
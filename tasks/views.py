@@ -1,25 +1,447 @@
-from django.shortcuts import render, redirect
-from django.urls import reverse_lazy
-from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
+import json
+import re
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404, redirect
+from django.template.defaultfilters import filesizeformat
+from django.urls import reverse, reverse_lazy
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView, TemplateView
 from django.contrib import messages
 from django.utils.translation import gettext_lazy as _
 
-from .models import Task
+from audit.history import describe, history_page
+from audit.models import AuditEntry
+from jobs.queue import enqueue
+from notifications.digests import notify_task_change
+from task_manager.downloads import serve_file
+from statuses.models import Status
+from task_manager.keyset import keyset_page, make_cursor
+from task_manager.lookups import AutocompleteLookupView
+from task_manager.mixins import OwnerRequiredMixin, StreamingListMixin
+from .dependencies import blockers, critical_path, is_blocked
+from .exports import export_tasks
+from .forms import TaskAttachmentForm, TaskCommentForm, TaskDependencyForm, TaskFilterForm, TaskForm, TaskUploadForm
+from .models import Task, TaskAttachment, TaskComment, TaskDependency, TaskUpload
+from .my_work import my_work
+from .ranking import check_rank, rank_after, rank_at_end
+from .uploads import AttachmentUploadHandler, append_chunk, complete_upload, receive_chunk
+
+CONTENT_RANGE_RE = re.compile(r'^bytes (\d+)-(\d+)/(\d+)$')
 
-class TaskListView(LoginRequiredMixin, ListView):
+class TaskListView(LoginRequiredMixin, StreamingListMixin, ListView):
     model = Task
     template_name = 'tasks/list.html'
+    rows_template_name = 'tasks/_rows.html'
     context_object_name = 'tasks'
 
+    def get_queryset(self):
+        self.filter_form = TaskFilterForm(self.request.GET or None)
+        queryset = (
+            super().get_queryset()
+            .select_related('status', 'author', 'executor')
+            .prefetch_related('labels')
+            .annotate(is_blocked=is_blocked())
+        )
+        return self.filter_form.filter(queryset)
+
+    def get_context_data(self, **kwargs):
+        return super().get_context_data(filter_form=self.filter_form, **kwargs)
+
+    def get_streaming(self):
+        return settings.TASK_LIST_STREAMING
+
+class TaskExportView(LoginRequiredMixin, View):
+    """Start a CSV export of the listed tasks in a job and show its status page."""
+    http_method_names = ['post']
+
+    def post(self, request):
+        filter_form = TaskFilterForm(request.POST)
+        label = filter_form.cleaned_data['label'] if filter_form.is_valid() else None
+        job = enqueue(export_tasks, kwargs={'label_id': label.pk if label else None}, created_by=request.user)
+        messages.success(request, _('Export started, the file will be ready here'))
+        return redirect('jobs:detail', pk=job.pk)
+
+class TaskBoardView(LoginRequiredMixin, TemplateView):
+    """One column per status with its tasks in rank order; more load as a column is scrolled.
+
+    The first ``column_size`` tasks of every column come from one query that
+    numbers each status's tasks with ROW_NUMBER() and keeps the first rows
+    of each; one extra row per column tells whether there are more.
+    """
+    template_name = 'tasks/board.html'
+    column_size = 20
+
+    @staticmethod
+    def get_cards():
+        return Task.objects.select_related('executor').annotate(is_blocked=is_blocked())
+
+    def get_context_data(self, **kwargs):
+        ranked = self.get_cards().annotate(
+            position=Window(RowNumber(), partition_by=F('status_id'), order_by=(F('rank').asc(), F('pk').asc())),
+        ).filter(position__lte=self.column_size + 1).order_by('status_id', 'position')
+        cards = defaultdict(list)
+        for task in ranked:
+            cards[task.status_id].append(task)
+
+        columns = []
+        for status in Status.objects.all():
+            tasks = cards[status.pk]
+            next_cursor = make_cursor(tasks[self.column_size - 1], 'rank') if len(tasks) > self.column_size else None
+            columns.append({'status': status, 'tasks': tasks[:self.column_size], 'next_cursor': next_cursor})
+        return super().get_context_data(columns=columns, **kwargs)
+
+class TaskBoardColumnView(LoginRequiredMixin, TemplateView):
+    """The next cards of a board column, from the (status, rank) index."""
+    template_name = 'tasks/_board_cards.html'
+
+    def get_context_data(self, **kwargs):
+        status = get_object_or_404(Status, pk=self.kwargs['status_pk'])
+        tasks, next_cursor = keyset_page(
+            TaskBoardView.get_cards().filter(status=status),
+            'rank',
+            self.request.GET.get('after'),
+            TaskBoardView.column_size,
+            descending=False,
+        )
+        return super().get_context_data(status=status, tasks=tasks, next_cursor=next_cursor, **kwargs)
+
+class TaskMoveView(LoginRequiredMixin, View):
+    """Move a task on the board: POST ``{"status": <id>, "after": <task id or null>}`` as JSON.
+
+    The task goes right after the ``after`` task of the column, first when
+    it is null, and last when it is left out. Only the task's row is written.
+    """
+    http_method_names = ['post', 'options']
+
+    def post(self, request, pk):
+        try:
+            data = json.loads(request.body)
+            status_id = int(data['status'])
+            after_id = int(data['after']) if data.get('after') is not None else None
+        except (ValueError, TypeError, KeyError, AttributeError):
+            return JsonResponse({'error': 'Expected {"status": <id>, "after": <task id or null>}.'}, status=400)
+        status = Status.objects.filter(pk=status_id).first()
+        if status is None:
+            return JsonResponse({'error': 'Unknown status.'}, status=400)
+
+        with transaction.atomic():
+            task = get_object_or_404(Task.objects.select_for_update(), pk=pk)
+            if 'after' not in data:
+                rank = rank_at_end(status.pk, exclude=task.pk)
+            else:
+                after = None
+                if after_id is not None:
+                    after = Task.objects.filter(pk=after_id, status=status).exclude(pk=task.pk).first()
+                    if after is None:
+                        return JsonResponse({'error': 'The task to place it after is not in that column.'}, status=400)
+                rank = rank_after(status.pk, after, exclude=task.pk)
+            status_changed = task.status_id != status.pk
+            task.status = status
+            task.rank = rank
+            # save() rather than update(), so a status change is audited
+            task.save(update_fields=['status', 'rank'])
+            check_rank(task)
+            notify_task_change(task, request.user, status_changed=status_changed)
+        return JsonResponse({'id': task.pk, 'status': status.pk, 'rank': task.rank})
+
+class MyWorkView(LoginRequiredMixin, ListView):
+    """The user's open tasks, soonest due first; ``?overdue=1`` shows only those past their due date.
+
+    Reads only columns of the partial "open tasks by executor" index, in its
+    order, so PostgreSQL answers it with an index-only scan and stops after
+    ``limit`` entries.
+    """
+    template_name = 'tasks/my_work.html'
+    context_object_name = 'tasks'
+    limit = 100
+
+    def get_queryset(self):
+        self.today = timezone.localdate()
+        self.overdue = self.request.GET.get('overdue') == '1'
+        queryset = my_work(self.request.user.pk).select_related('status').only(
+            'name', 'due_date', 'priority', 'status__name',
+        )
+        if self.overdue:
+            queryset = queryset.filter(due_date__lt=self.today)
+        return queryset[:self.limit]
+
+    def get_context_data(self, **kwargs):
+        return super().get_context_data(today=self.today, overdue=self.overdue, **kwargs)
+
 class TaskDetailView(LoginRequiredMixin, DetailView):
+    """The task page with its attachments and latest comments; older comments load a page at a time."""
     model = Task
     template_name = 'tasks/detail.html'
     context_object_name = 'task'
+    comments_page_size = 20
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('status', 'author', 'executor')
+
+    def get_context_data(self, **kwargs):
+        return super().get_context_data(**self.get_tab_context(), **kwargs)
+
+    def get_tab_context(self):
+        # The newest comments first, from the (task, created_at) index
+        comments, next_cursor = keyset_page(
+            self.object.comments.select_related('author'),
+            'created_at',
+            self.request.GET.get('after'),
+            self.comments_page_size,
+        )
+        return {
+            'attachments': self.object.attachments.select_related('uploaded_by').order_by('created_at'),
+            'attachment_form': TaskAttachmentForm(),
+            'comments': comments,
+            'next_comments_cursor': next_cursor,
+            'comment_form': TaskCommentForm(),
+        }
+
+class TaskCommentsView(TaskDetailView):
+    """A page of comments, for the "show more" link on the task page."""
+    template_name = 'tasks/_comments.html'
+
+class TaskHistoryView(TaskDetailView):
+    """The history tab of the task page, newest changes first."""
+    history_page_size = 50
+
+    def get_tab_context(self):
+        entries, next_cursor = history_page(
+            AuditEntry.objects.filter(task_id=self.object.pk),
+            self.request.GET.get('before'),
+            self.history_page_size,
+        )
+        return {'tab': 'history', 'history': describe(entries), 'next_cursor': next_cursor}
+
+class TaskDependenciesView(TaskDetailView):
+    """The dependencies tab: direct blockers and dependents, every blocker and the critical path."""
+
+    def get_tab_context(self):
+        all_blockers = blockers(self.object.pk).select_related('status').order_by('name')
+        path = critical_path(self.object.pk)
+        in_path = Task.objects.select_related('status').in_bulk(path)
+        return {
+            'tab': 'dependencies',
+            'blocked_by': self.object.blocked_by.select_related('status').order_by('name'),
+            'blocks': self.object.blocks.select_related('status').order_by('name'),
+            'all_blockers': all_blockers,
+            'critical_path': [in_path[pk] for pk in path],
+            'dependency_form': TaskDependencyForm(task=self.object),
+        }
+
+class TaskLookupView(AutocompleteLookupView):
+    def search(self, query):
+        queryset = Task.objects.only('id', 'name').order_by('-id')
+        if query.isdigit():
+            return queryset.filter(pk=query)
+        return queryset.filter(name__istartswith=query)
+
+class TaskDependencyCreateView(LoginRequiredMixin, View):
+    # Dependencies are added from the task page
+    http_method_names = ['post', 'options']
+
+    def post(self, request, pk):
+        task = get_object_or_404(Task, pk=pk)
+        form = TaskDependencyForm(request.POST, task=task)
+        if form.is_valid() and form.save():
+            messages.success(request, _('Dependency added successfully'))
+        else:
+            for error in form.errors.get('blocked_by', [_('Choose a task')]):
+                messages.error(request, error)
+        return redirect('tasks:dependencies', pk=pk)
+
+class TaskDependencyDeleteView(LoginRequiredMixin, View):
+    http_method_names = ['post', 'options']
+
+    def post(self, request, pk, blocker_pk):
+        get_object_or_404(TaskDependency, task_id=pk, blocked_by_id=blocker_pk).delete()
+        messages.success(request, _('Dependency removed successfully'))
+        return redirect('tasks:dependencies', pk=pk)
+
+class TaskCommentCreateView(LoginRequiredMixin, CreateView):
+    model = TaskComment
+    form_class = TaskCommentForm
+    # Comments are posted from the task page
+    http_method_names = ['post', 'options']
+
+    def get_success_url(self):
+        return reverse('tasks:detail', args=[self.kwargs['pk']]) + '#comments'
+
+    def form_valid(self, form):
+        form.instance.task = get_object_or_404(Task, pk=self.kwargs['pk'])
+        form.instance.author = self.request.user
+        messages.success(self.request, _('Comment added successfully'))
+        return super().form_valid(form)
+
+    def form_invalid(self, form):
+        messages.error(self.request, _('Comment cannot be empty'))
+        return redirect(self.get_success_url())
+
+@method_decorator(csrf_exempt, name='dispatch')
+class TaskAttachmentCreateView(LoginRequiredMixin, View):
+    """Attach a file posted from the task page, streamed to storage while the form is parsed.
+
+    The CSRF middleware would read request.POST, and with it the whole file,
+    before the upload handler is installed, so the token is checked in
+    ``save()`` instead.
+    """
+    # Attachments are posted from the task page
+    http_method_names = ['post', 'options']
+
+    def post(self, request, pk):
+        task = get_object_or_404(Task, pk=pk)
+        request.upload_handlers = [AttachmentUploadHandler(request, task.pk)]
+        self.attachment = None
+        try:
+            return self.save(request, task)
+        finally:
+            # Files of a rejected post (bad CSRF token, invalid form) were stored all the same
+            for _name, files in request.FILES.lists():
+                for file in files:
+                    if self.attachment is None or file.storage_name != self.attachment.file.name:
+                        default_storage.delete(file.storage_name)
+
+    @method_decorator(csrf_protect)
+    def save(self, request, task):
+        success_url = reverse('tasks:detail', args=[task.pk]) + '#attachments'
+        form = TaskAttachmentForm(request.POST, request.FILES)
+        if not form.is_valid():
+            if request.upload_handlers[0].too_large:
+                messages.error(request, _('The file is larger than %(max)s.') % {
+                    'max': filesizeformat(settings.ATTACHMENT_MAX_SIZE),
+                })
+            else:
+                messages.error(request, _('Choose a file to attach'))
+            return redirect(success_url)
+        upload = form.cleaned_data['file']
+        self.attachment = TaskAttachment.objects.create(
+            task=task,
+            uploaded_by=request.user,
+            file=upload.storage_name,
+            name=upload.name,
+            size=upload.size,
+            sha256=upload.sha256,
+        )
+        messages.success(request, _('File attached successfully'))
+        return redirect(success_url)
+
+class TaskUploadCreateView(LoginRequiredMixin, View):
+    """Start a resumable upload; the response has the URL to PUT the chunks to."""
+    http_method_names = ['post', 'options']
+
+    def post(self, request, pk):
+        task = get_object_or_404(Task, pk=pk)
+        form = TaskUploadForm(request.POST)
+        if not form.is_valid():
+            return JsonResponse({'errors': form.errors}, status=400)
+        form.instance.task = task
+        form.instance.uploaded_by = request.user
+        upload = form.save()
+        return JsonResponse({'url': reverse('tasks:upload', args=[task.pk, upload.pk]), 'offset': 0}, status=201)
+
+class TaskUploadView(LoginRequiredMixin, View):
+    """A resumable upload: GET its offset, PUT the next chunk with a ``Content-Range`` header.
+
+    A chunk must start at the stored offset (409 with the offset otherwise),
+    so a client whose connection dropped asks for the offset and goes on from
+    there. The last chunk turns the upload into an attachment (201).
+    """
+    http_method_names = ['get', 'put', 'options']
+
+    def get_upload(self, queryset=TaskUpload.objects):
+        return get_object_or_404(
+            queryset, pk=self.kwargs['upload_pk'], task_id=self.kwargs['pk'], uploaded_by=self.request.user,
+        )
+
+    def get(self, request, pk, upload_pk):
+        upload = self.get_upload()
+        return JsonResponse({'offset': upload.received, 'size': upload.size})
+
+    def put(self, request, pk, upload_pk):
+        match = CONTENT_RANGE_RE.match(request.headers.get('Content-Range', ''))
+        if not match:
+            return JsonResponse({'error': 'A "Content-Range: bytes start-end/size" header is required.'}, status=400)
+        start, end, size = map(int, match.groups())
+        length = end - start + 1
+        if length < 1 or request.headers.get('Content-Length') != str(length):
+            return JsonResponse({'error': 'Content-Length does not match Content-Range.'}, status=400)
+
+        upload = self.get_upload()
+        if size != upload.size or end >= upload.size:
+            return JsonResponse({'error': 'The range is outside the file.'}, status=400)
+        if start != upload.received:
+            return JsonResponse({'offset': upload.received}, status=409)
+
+        # Read from the client with no lock held; the row lock is only taken
+        # to check the offset and append the chunk, so two requests never
+        # write to the file at once.
+        part_name, written = receive_chunk(upload, request, length)
+        try:
+            with transaction.atomic():
+                upload = self.get_upload(TaskUpload.objects.select_for_update())
+                if start != upload.received:
+                    return JsonResponse({'offset': upload.received}, status=409)
+                append_chunk(upload, part_name, start)
+                upload.received = start + written
+                upload.save(update_fields=['received'])
+        finally:
+            default_storage.delete(part_name)
+        if written < length:
+            return JsonResponse({'offset': upload.received, 'error': 'The chunk was cut short.'}, status=400)
+        if not upload.is_complete:
+            return JsonResponse({'offset': upload.received})
+        # No other chunk can be appended any more, so no lock is needed
+        attachment = complete_upload(upload)
+        return JsonResponse({
+            'offset': attachment.size,
+            'url': reverse('tasks:attachment', args=[pk, attachment.pk]),
+            'sha256': attachment.sha256,
+        }, status=201)
+
+class TaskAttachmentDownloadView(LoginRequiredMixin, View):
+    """Download an attachment, whole or as a byte range."""
+    http_method_names = ['get', 'head', 'options']
+
+    def get(self, request, pk, attachment_pk):
+        attachment = get_object_or_404(TaskAttachment, pk=attachment_pk, task_id=pk)
+        return serve_file(
+            request, attachment.file.path, attachment.name, etag=attachment.sha256, storage_name=attachment.file.name,
+        )
+
+class TaskAttachmentDeleteView(LoginRequiredMixin, OwnerRequiredMixin, DeleteView):
+    model = TaskAttachment
+    pk_url_kwarg = 'attachment_pk'
+    # Attachments are deleted from the task page
+    http_method_names = ['post', 'options']
+    # Only whoever uploaded the file can delete it
+    owner_field = 'uploaded_by_id'
+    permission_denied_message = _('Only the uploader can delete this file')
+    permission_denied_url = 'tasks:list'
+
+    def get_queryset(self):
+        return super().get_queryset().filter(task_id=self.kwargs['pk'])
+
+    def get_success_url(self):
+        return reverse('tasks:detail', args=[self.kwargs['pk']]) + '#attachments'
+
+    def form_valid(self, form):
+        messages.success(self.request, _('File deleted successfully'))
+        return super().form_valid(form)
 
 class TaskCreateView(LoginRequiredMixin, CreateView):
     model = Task
-    fields = ['name', 'description', 'status', 'executor']
+    form_class = TaskForm
     template_name = 'tasks/create.html'
     success_url = reverse_lazy('tasks:list')
     # Disallow PUT (tests expect 405)
@@ -28,42 +450,41 @@ class TaskCreateView(LoginRequiredMixin, CreateView):
     def form_valid(self, form):
         form.instance.author = self.request.user
         messages.success(self.request, _('Task created successfully'))
-        return super().form_valid(form)
+        response = super().form_valid(form)
+        notify_task_change(self.object, self.request.user, assigned=self.object.executor_id is not None)
+        return response
 
 class TaskUpdateView(LoginRequiredMixin, UpdateView):
     model = Task
-    fields = ['name', 'description', 'status', 'executor']
+    form_class = TaskForm
     template_name = 'tasks/update.html'
     success_url = reverse_lazy('tasks:list')
     # Disallow PUT (tests expect 405)
     http_method_names = ['get', 'post', 'head', 'options']
 
     def form_valid(self, form):
+        if 'status' in form.changed_data:
+            # To the end of the new column
+            form.instance.rank = rank_at_end(form.instance.status_id, exclude=form.instance.pk)
         messages.success(self.request, _('Task updated successfully'))
-        return super().form_valid(form)
-
-class AuthorRequiredMixin(UserPassesTestMixin):
-    """Only the task author can access the view (authenticated users only)."""
-
-    def test_func(self):
-        # If user isn't authenticated, let LoginRequiredMixin handle redirect to login
-        if not self.request.user.is_authenticated:
-            return True
-        task = self.get_object()
-        return task.author == self.request.user
-
-    def handle_no_permission(self):
-        # If not authenticated, delegate to standard behavior (login redirect)
-        if not self.request.user.is_authenticated:
-            return super().handle_no_permission()
-        messages.error(self.request, _('Only the author can delete this task'))
-        return redirect('tasks:list')
+        response = super().form_valid(form)
+        notify_task_change(
+            self.object,
+            self.request.user,
+            assigned='executor' in form.changed_data and self.object.executor_id is not None,
+            status_changed='status' in form.changed_data,
+        )
+        return response
 
-class TaskDeleteView(LoginRequiredMixin, AuthorRequiredMixin, DeleteView):
+class TaskDeleteView(LoginRequiredMixin, OwnerRequiredMixin, DeleteView):
     model = Task
     template_name = 'tasks/delete.html'
     success_url = reverse_lazy('tasks:list')
     http_method_names = ['get', 'post', 'head', 'options']
+    # Only the task author can delete it
+    owner_field = 'author_id'
+    permission_denied_message = _('Only the author can delete this task')
+    permission_denied_url = 'tasks:list'
 
     def post(self, request, *args, **kwargs):
         messages.success(request, _('Task deleted successfully'))
@@ -30,11 +30,12 @@ class UserRegistrationForm(UserCreationForm):
 class UserUpdateForm(forms.ModelForm):
     class Meta:
         model = User
-        fields = ('first_name', 'last_name', 'username')
+        fields = ('first_name', 'last_name', 'username', 'email')
         labels = {
             'first_name': _('First name'),
             'last_name': _('Last name'),
             'username': _('Username'),
+            'email': _('Email'),
         }
 
     def __init__(self, *args, **kwargs):
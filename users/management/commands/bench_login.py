@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from task_manager.benchmark import benchmark_database, measure, summary
+
+
+class Command(BaseCommand):
+    help = 'Measure login throughput (POST /login/) for each password hasher'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hasher',
+            action='append',
+            choices=sorted(settings.PASSWORD_HASHER_CHOICES),
+            help='Hasher to benchmark (repeatable). Defaults to all of them.',
+        )
+        parser.add_argument('--logins', type=int, default=20, help='Logins per hasher.')
+
+    def handle(self, *args, **options):
+        names = options['hasher'] or sorted(settings.PASSWORD_HASHER_CHOICES)
+        with benchmark_database():
+            for name in names:
+                hasher = settings.PASSWORD_HASHER_CHOICES[name]
+                try:
+                    with override_settings(PASSWORD_HASHERS=[hasher]):
+                        durations = self.bench(name, options['logins'])
+                except ValueError as exc:
+                    # Missing optional library, e.g. argon2-cffi
+                    raise CommandError(f'{name}: {exc}')
+                self.stdout.write(summary(name, durations))
+
+    def bench(self, name, logins):
+        username = f'bench-{name}'
+        get_user_model().objects.create_user(username=username, password='bench-pass-123')
+        client = Client()
+        url = reverse('login')
+        data = {'username': username, 'password': 'bench-pass-123'}
+
+        def login():
+            response = client.post(url, data)
+            if response.status_code != 302:
+                raise CommandError(f'{name}: login failed with status {response.status_code}')
+            client.cookies.clear()
+
+        return measure(login, logins)
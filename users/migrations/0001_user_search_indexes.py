@@ -0,0 +1,37 @@
+from django.db import migrations
+
+SEARCH_FIELDS = ('username', 'first_name', 'last_name')
+
+
+def create_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        # Trigram GIN indexes serve Django's icontains: UPPER(col::text) LIKE UPPER('%q%')
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        for field in SEARCH_FIELDS:
+            schema_editor.execute(
+                f'CREATE INDEX IF NOT EXISTS auth_user_{field}_trgm_idx '
+                f'ON auth_user USING gin (UPPER({field}::text) gin_trgm_ops)'
+            )
+    elif vendor == 'sqlite':
+        for field in SEARCH_FIELDS:
+            schema_editor.execute(
+                f'CREATE INDEX IF NOT EXISTS auth_user_{field}_lower_idx ON auth_user (LOWER({field}))'
+            )
+
+
+def drop_search_indexes(apps, schema_editor):
+    suffix = 'trgm' if schema_editor.connection.vendor == 'postgresql' else 'lower'
+    for field in SEARCH_FIELDS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS auth_user_{field}_{suffix}_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
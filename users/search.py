@@ -0,0 +1,40 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+# Columns covered by the search indexes created in users/migrations/0001_user_search_indexes.py
+SEARCH_FIELDS = ('username', 'first_name', 'last_name')
+
+
+def search_users(queryset, query):
+    """Filter ``queryset`` by username, first or last name.
+
+    PostgreSQL matches substrings (``icontains``), which the trigram indexes
+    on ``UPPER(field)`` serve. Elsewhere the match is a case-insensitive
+    prefix, written as a range on ``LOWER(field)`` so SQLite can use its
+    expression indexes. SQLite's LOWER() (like its LIKE) only folds ASCII,
+    so other queries are matched there with its REGEXP, which is Python's
+    Unicode-aware ``re``, at the cost of a scan.
+    """
+    if connection.vendor == 'postgresql':
+        condition = Q()
+        for field in SEARCH_FIELDS:
+            condition |= Q(**{f'{field}__icontains': query})
+        return queryset.filter(condition)
+
+    if connection.vendor == 'sqlite' and not query.isascii():
+        condition = Q()
+        for field in SEARCH_FIELDS:
+            condition |= Q(**{f'{field}__iregex': '^' + re.escape(query)})
+        return queryset.filter(condition)
+
+    prefix = query.lower()
+    condition = Q()
+    annotations = {}
+    for field in SEARCH_FIELDS:
+        alias = f'{field}_lower'
+        annotations[alias] = Lower(field)
+        condition |= Q(**{f'{alias}__gte': prefix, f'{alias}__lt': prefix + '\uffff'})
+    return queryset.alias(**annotations).filter(condition)
@@ -65,10 +65,11 @@ class UserRegistrationFormTests(TestCase):
 
 
 class UserUpdateFormTests(TestCase):
-    def setUp(self):
-        self.User = get_user_model()
-        self.u1 = self.User.objects.create_user(username='u1', password='pass12345', first_name='F1', last_name='L1')
-        self.u2 = self.User.objects.create_user(username='u2', password='pass12345', first_name='F2', last_name='L2')
+    @classmethod
+    def setUpTestData(cls):
+        cls.User = get_user_model()
+        cls.u1 = cls.User.objects.create_user(username='u1', password='pass12345', first_name='F1', last_name='L1')
+        cls.u2 = cls.User.objects.create_user(username='u2', password='pass12345', first_name='F2', last_name='L2')
 
     def test_valid_update(self):
         form = UserUpdateForm(
@@ -0,0 +1,56 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from users.hashers import TunedScryptPasswordHasher
+
+FAST_SCRYPT = {
+    'PASSWORD_SCRYPT_WORK_FACTOR': 2 ** 10,
+    'PASSWORD_SCRYPT_BLOCK_SIZE': 8,
+    'PASSWORD_SCRYPT_PARALLELISM': 1,
+}
+
+
+@override_settings(
+    PASSWORD_HASHERS=[
+        'users.hashers.TunedScryptPasswordHasher',
+        'django.contrib.auth.hashers.MD5PasswordHasher',
+    ],
+    **FAST_SCRYPT,
+)
+class PasswordHasherTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create(
+            username='legacy',
+            password=make_password('pass12345', hasher='md5'),
+        )
+
+    def test_new_passwords_use_preferred_hasher(self):
+        self.assertTrue(make_password('pass12345').startswith('scrypt$1024$'))
+
+    def test_tuned_parameters_come_from_settings(self):
+        with self.settings(PASSWORD_SCRYPT_WORK_FACTOR=2 ** 11):
+            hasher = TunedScryptPasswordHasher()
+            self.assertEqual(hasher.work_factor, 2 ** 11)
+            self.assertTrue(hasher.must_update(make_password('x', hasher=hasher).replace('$2048$', '$1024$')))
+
+    def test_login_rehashes_legacy_password(self):
+        resp = self.client.post(reverse('login'), {'username': 'legacy', 'password': 'pass12345'})
+        self.assertEqual(resp.status_code, 302)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('scrypt$1024$'))
+        self.assertTrue(self.user.check_password('pass12345'))
+
+    def test_failed_login_keeps_legacy_hash(self):
+        self.client.post(reverse('login'), {'username': 'legacy', 'password': 'wrong'})
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('md5$'))
+
+    def test_changed_cost_parameters_are_upgraded_on_login(self):
+        self.user.set_password('pass12345')
+        self.user.save()
+        with self.settings(PASSWORD_SCRYPT_WORK_FACTOR=2 ** 11):
+            self.client.post(reverse('login'), {'username': 'legacy', 'password': 'pass12345'})
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('scrypt$2048$'))
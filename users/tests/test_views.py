@@ -1,25 +1,29 @@
-from django.test import TestCase, Client
+from django.test import TestCase
 from django.urls import reverse
 from django.contrib.auth.models import User
 from django.contrib.messages import get_messages
 from django.utils.translation import gettext as _
+from django.db import connection
 from django.db.models import ProtectedError
 from unittest.mock import patch
 
+from users.search import search_users
+from users.views import UserListView, UserLookupView
+
 
 class UserCRUDTestCase(TestCase):
     """Test CRUD operations for users (C=Create/Register, R=Read/List, U=Update, D=Delete)"""
 
-    def setUp(self):
-        self.client = Client()
+    @classmethod
+    def setUpTestData(cls):
         # Create test users
-        self.user1 = User.objects.create_user(
+        cls.user1 = User.objects.create_user(
             username='testuser1',
             password='testpass123',
             first_name='Test',
             last_name='User'
         )
-        self.user2 = User.objects.create_user(
+        cls.user2 = User.objects.create_user(
             username='testuser2',
             password='testpass456',
             first_name='Another',
@@ -185,3 +189,101 @@ class UserCRUDTestCase(TestCase):
         # User is logged out in finally block
         self.assertNotIn('_auth_user_id', self.client.session)
 
+
+
+class UserListSearchTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.bulk_create([
+            User(username=f'user{i:02d}', first_name='First', last_name=f'Last{i:02d}')
+            for i in range(30)
+        ])
+        User.objects.create(username='jdoe', first_name='John', last_name='Doe')
+
+    def test_list_is_paginated(self):
+        response = self.client.get(reverse('users:list'))
+        self.assertTrue(response.context['is_paginated'])
+        self.assertEqual(len(response.context['users']), UserListView.paginate_by)
+        response = self.client.get(reverse('users:list'), {'page': 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'jdoe')
+
+    def test_list_loads_only_displayed_columns(self):
+        response = self.client.get(reverse('users:list'))
+        user = response.context['users'][0]
+        self.assertIn('password', user.get_deferred_fields())
+        self.assertIn('email', user.get_deferred_fields())
+
+    def test_search_by_username_and_names(self):
+        for query in ('jdo', 'JOHN', 'doe'):
+            response = self.client.get(reverse('users:list'), {'q': query})
+            self.assertEqual([u.username for u in response.context['users']], ['jdoe'], query)
+        self.assertEqual(response.context['query'], 'doe')
+
+    def test_search_folds_non_ascii_case(self):
+        User.objects.create(username='ivan', first_name='Иван', last_name='Ёлкин')
+        for query in ('иван', 'ИВ', 'ёлк'):
+            response = self.client.get(reverse('users:list'), {'q': query})
+            self.assertEqual([u.username for u in response.context['users']], ['ivan'], query)
+
+    def test_search_keeps_query_in_page_links(self):
+        response = self.client.get(reverse('users:list'), {'q': 'user'})
+        self.assertEqual(response.context['paginator'].count, 30)
+        self.assertContains(response, '?q=user&amp;page=2')
+
+    def test_search_uses_index(self):
+        queryset = search_users(User.objects.all(), 'jdo')
+        if connection.vendor == 'sqlite':
+            self.assertIn('auth_user_username_lower_idx', queryset.explain())
+
+
+class UserOwnershipQueryCountTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user1 = User.objects.create_user(username='testuser1', password='testpass123')
+        cls.user2 = User.objects.create_user(username='testuser2', password='testpass123')
+
+    def setUp(self):
+        self.client.login(username='testuser1', password='testpass123')
+
+    def test_update_own_profile_fetches_user_once(self):
+        # request.user + the edited user (previously fetched twice) + the navbar's "my work" count
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('users:update', args=[self.user1.id]))
+        self.assertEqual(response.status_code, 200)
+
+    def test_delete_own_profile_fetches_user_once(self):
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('users:delete', args=[self.user1.id]))
+        self.assertEqual(response.status_code, 200)
+
+    def test_foreign_profile_is_rejected_without_fetching_it(self):
+        # Only request.user is loaded; the ownership check compares primary keys
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('users:update', args=[self.user2.id]))
+        self.assertRedirects(response, reverse('users:list'), fetch_redirect_response=False)
+
+
+class UserLookupTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='alice', password='testpass123')
+        User.objects.create(username='bob', first_name='Alan')
+        User.objects.create(username='carol')
+
+    def test_requires_login(self):
+        response = self.client.get(reverse('users:lookup'), {'q': 'a'})
+        self.assertEqual(response.status_code, 302)
+
+    def test_prefix_search_returns_json(self):
+        self.client.login(username='alice', password='testpass123')
+        response = self.client.get(reverse('users:lookup'), {'q': 'al'})
+        self.assertEqual(response.status_code, 200)
+        texts = [item['text'] for item in response.json()['results']]
+        self.assertEqual(sorted(texts), ['alice', 'bob'])
+
+    def test_results_are_limited(self):
+        User.objects.bulk_create([User(username=f'x{i}') for i in range(30)])
+        self.client.login(username='alice', password='testpass123')
+        response = self.client.get(reverse('users:lookup'), {'q': 'x'})
+        self.assertEqual(len(response.json()['results']), UserLookupView.limit)
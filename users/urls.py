@@ -1,10 +1,11 @@
 from django.urls import path
-from .views import UserListView, UserCreateView, UserUpdateView, UserDeleteView
+from .views import UserListView, UserLookupView, UserCreateView, UserUpdateView, UserDeleteView
 
 app_name = 'users'
 
 urlpatterns = [
     path('', UserListView.as_view(), name='list'),
+    path('lookup/', UserLookupView.as_view(), name='lookup'),
     path('create/', UserCreateView.as_view(), name='create'),
     path('<int:pk>/update/', UserUpdateView.as_view(), name='update'),
     path('<int:pk>/delete/', UserDeleteView.as_view(), name='delete'),
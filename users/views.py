@@ -9,13 +9,38 @@ from django.views.generic import ListView, CreateView, UpdateView, DeleteView
 from django.contrib import messages
 from django.shortcuts import redirect
 
+from task_manager.lookups import AutocompleteLookupView
+from task_manager.mixins import OwnerRequiredMixin
 from .forms import UserRegistrationForm, UserUpdateForm
+from .search import search_users
 
 
 class UserListView(ListView):
     model = User
     template_name = 'users/list.html'
     context_object_name = 'users'
+    paginate_by = 25
+    ordering = ('id',)
+    # Only the columns rendered by users/list.html
+    only_fields = ('id', 'username', 'first_name', 'last_name', 'date_joined')
+
+    def get_queryset(self):
+        queryset = super().get_queryset().only(*self.only_fields)
+        self.query = self.request.GET.get('q', '').strip()
+        if self.query:
+            queryset = search_users(queryset, self.query)
+        return queryset
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['query'] = self.query
+        return context
+
+
+class UserLookupView(AutocompleteLookupView):
+    def search(self, query):
+        queryset = User.objects.only('id', 'username').order_by('id')
+        return search_users(queryset, query) if query else queryset
 
 
 class UserCreateView(SuccessMessageMixin, CreateView):
@@ -35,38 +60,24 @@ class UserCreateView(SuccessMessageMixin, CreateView):
         return self.render_to_response(self.get_context_data(form=form))
 
 
-class UserUpdateView(LoginRequiredMixin, SuccessMessageMixin, UpdateView):
+class UserUpdateView(LoginRequiredMixin, OwnerRequiredMixin, SuccessMessageMixin, UpdateView):
     model = User
     form_class = UserUpdateForm
     template_name = 'users/update.html'
     success_url = reverse_lazy('users:list')
     success_message = _('User successfully updated')
-
-    def dispatch(self, request, *args, **kwargs):
-        # If not authenticated, let LoginRequiredMixin redirect to login with ?next=
-        if not request.user.is_authenticated:
-            return super().dispatch(request, *args, **kwargs)
-        # Authenticated: allow only editing own profile
-        if self.get_object() != request.user:
-            messages.error(request, _('You can only edit your own profile'))
-            return redirect('users:list')
-        return super().dispatch(request, *args, **kwargs)
+    # Authenticated: allow only editing own profile
+    permission_denied_message = _('You can only edit your own profile')
+    permission_denied_url = 'users:list'
 
 
-class UserDeleteView(LoginRequiredMixin, DeleteView):
+class UserDeleteView(LoginRequiredMixin, OwnerRequiredMixin, DeleteView):
     model = User
     template_name = 'users/delete.html'
     success_url = reverse_lazy('users:list')
-
-    def dispatch(self, request, *args, **kwargs):
-        # If not authenticated, let LoginRequiredMixin redirect to login with ?next=
-        if not request.user.is_authenticated:
-            return super().dispatch(request, *args, **kwargs)
-        # Authenticated: allow only deleting own profile
-        if self.get_object() != request.user:
-            messages.error(request, _('You can only delete your own profile'))
-            return redirect('users:list')
-        return super().dispatch(request, *args, **kwargs)
+    # Authenticated: allow only deleting own profile
+    permission_denied_message = _('You can only delete your own profile')
+    permission_denied_url = 'users:list'
 
     def post(self, request, *args, **kwargs):
         user = self.get_object()
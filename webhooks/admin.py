@@ -0,0 +1,18 @@
+from django.contrib import admin
+
+from task_manager.admin_helpers import LargeTableAdmin
+from .models import WebhookEndpoint, WebhookEvent
+
+
+@admin.register(WebhookEndpoint)
+class WebhookEndpointAdmin(admin.ModelAdmin):
+    list_display = ('url', 'event_types', 'is_active', 'created_at')
+    list_filter = ('is_active',)
+
+
+@admin.register(WebhookEvent)
+class WebhookEventAdmin(LargeTableAdmin):
+    list_display = ('id', 'type', 'endpoint', 'status', 'attempts', 'next_attempt_at', 'created_at')
+    list_filter = ('status',)
+    list_select_related = ('endpoint',)
+    readonly_fields = ('endpoint', 'type', 'payload', 'attempts', 'last_error', 'created_at')
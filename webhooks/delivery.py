@@ -0,0 +1,195 @@
+"""Deliver webhook events: batched, signed, concurrent, retried with backoff.
+
+The ``deliver_events`` job claims the pending events that are due. It
+groups them per endpoint into POSTs of up to WEBHOOK_BATCH_SIZE events
+(``{"events": [...]}``, oldest first). The POSTs go out on a pool of
+WEBHOOK_WORKERS threads, with at most WEBHOOK_ENDPOINT_CONCURRENCY in
+flight to any one endpoint. The threads only do HTTP. Every database
+write happens in the job's own thread.
+
+A 2xx response delivers the batch and its events are deleted. After any
+other outcome, each event of the batch is retried after
+WEBHOOK_RETRY_BACKOFF seconds, doubled on every attempt up to
+WEBHOOK_RETRY_BACKOFF_MAX. After WEBHOOK_MAX_ATTEMPTS it is marked failed.
+
+Delivery is at least once and batches of one endpoint may arrive out of
+order. Receivers should use the event ids to drop duplicates and
+``created_at`` to order events.
+
+Each request carries ``X-Webhook-Timestamp`` (Unix time) and
+``X-Webhook-Signature: sha256=<hex>``. The signature is the HMAC-SHA256,
+keyed with the endpoint's secret, of ``<timestamp>.<body>``. See ``verify``.
+"""
+import hashlib
+import hmac
+import json
+import math
+import threading
+import time
+import urllib.request
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.db.models import Min
+from django.utils import timezone
+
+from jobs.queue import enqueue_once
+from .models import WebhookEvent
+
+SIGNATURE_HEADER = 'X-Webhook-Signature'
+TIMESTAMP_HEADER = 'X-Webhook-Timestamp'
+
+
+def sign(secret, timestamp, body):
+    message = f'{timestamp}.'.encode() + body
+    return 'sha256=' + hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()
+
+
+def verify(secret, headers, body, tolerance=300):
+    """Whether a request with ``headers`` and ``body`` was signed with ``secret`` in the last ``tolerance`` seconds."""
+    try:
+        timestamp = int(headers[TIMESTAMP_HEADER])
+    except (KeyError, TypeError, ValueError):
+        return False
+    if abs(time.time() - timestamp) > tolerance:
+        return False
+    return hmac.compare_digest(sign(secret, timestamp, body), headers.get(SIGNATURE_HEADER, ''))
+
+
+def post(url, secret, body):
+    """POST the signed ``body``; raise on errors, timeouts and non-2xx responses."""
+    timestamp = int(time.time())
+    request = urllib.request.Request(url, data=body, method='POST', headers={
+        'Content-Type': 'application/json',
+        'User-Agent': 'task-manager-webhooks',
+        TIMESTAMP_HEADER: str(timestamp),
+        SIGNATURE_HEADER: sign(secret, timestamp, body),
+    })
+    # urlopen raises HTTPError for 4xx/5xx
+    with urllib.request.urlopen(request, timeout=settings.WEBHOOK_TIMEOUT) as response:
+        response.read()
+        if not 200 <= response.status < 300:
+            raise OSError(f'HTTP {response.status}')
+
+
+def post_batches(batches):
+    """POST ``batches`` ({endpoint: deque of (events, body)}) and return [(events, error or None)].
+
+    Each endpoint gets its next batch when one of its POSTs finishes, so a
+    slow endpoint holds at most WEBHOOK_ENDPOINT_CONCURRENCY threads and
+    never keeps the others waiting.
+    """
+    total = sum(len(queue) for queue in batches.values())
+    results = []
+    if not total:
+        return results
+    lock = threading.Lock()
+    finished = threading.Event()
+
+    with ThreadPoolExecutor(settings.WEBHOOK_WORKERS, thread_name_prefix='webhook') as pool:
+        def start(endpoint, events, body):
+            future = pool.submit(post, endpoint.url, endpoint.secret, body)
+            future.add_done_callback(lambda future: finish(endpoint, events, future))
+
+        def finish(endpoint, events, future):
+            with lock:
+                results.append((events, future.exception()))
+                if len(results) == total:
+                    finished.set()
+                following = batches[endpoint].popleft() if batches[endpoint] else None
+            if following is not None:
+                start(endpoint, *following)
+
+        for endpoint, queue in batches.items():
+            for _ in range(settings.WEBHOOK_ENDPOINT_CONCURRENCY):
+                with lock:
+                    batch = queue.popleft() if queue else None
+                if batch is None:
+                    break
+                start(endpoint, *batch)
+        # Callbacks submit more work, so the pool must stay open until the last one
+        finished.wait()
+    return results
+
+
+def retry_delay(attempts):
+    delay = settings.WEBHOOK_RETRY_BACKOFF * 2 ** max(attempts - 1, 0)
+    return timedelta(seconds=min(delay, settings.WEBHOOK_RETRY_BACKOFF_MAX))
+
+
+def lease_duration(events):
+    """How long sending ``events`` may take, with POSTs of at most WEBHOOK_TIMEOUT seconds."""
+    per_endpoint = Counter(event.endpoint_id for event in events)
+    batches = [math.ceil(count / settings.WEBHOOK_BATCH_SIZE) for count in per_endpoint.values()]
+    # Each round of POSTs either keeps all WEBHOOK_WORKERS busy or sends
+    # WEBHOOK_ENDPOINT_CONCURRENCY batches of every endpoint left
+    rounds = math.ceil(sum(batches) / settings.WEBHOOK_WORKERS) + max(
+        (math.ceil(count / settings.WEBHOOK_ENDPOINT_CONCURRENCY) for count in batches), default=0,
+    )
+    # Plus one for building the bodies and writing the outcome
+    return timedelta(seconds=(rounds + 1) * settings.WEBHOOK_TIMEOUT)
+
+
+def claim_due_events(now):
+    """Return up to WEBHOOK_EVENTS_PER_RUN due events, hidden from other runs while they are sent.
+
+    On PostgreSQL rows another run has locked are skipped. Elsewhere two
+    runs may rarely send the same event twice.
+    """
+    due = (
+        WebhookEvent.objects.filter(status=WebhookEvent.Status.PENDING, next_attempt_at__lte=now)
+        .select_related('endpoint')
+        .order_by('endpoint_id', 'created_at', 'id')
+    )
+    with transaction.atomic():
+        if connection.features.has_select_for_update_skip_locked:
+            due = due.select_for_update(skip_locked=True, of=('self',))
+        events = list(due[:settings.WEBHOOK_EVENTS_PER_RUN])
+        # Long enough to send them all; a crashed run's events are retried after it
+        lease = now + lease_duration(events)
+        WebhookEvent.objects.filter(pk__in=[event.pk for event in events]).update(next_attempt_at=lease)
+    return events
+
+
+def deliver_events():
+    """Job: send the due events and schedule what is left; return the number delivered."""
+    now = timezone.now()
+    events = claim_due_events(now)
+
+    batches = defaultdict(deque)
+    by_endpoint = defaultdict(list)
+    for event in events:
+        by_endpoint[event.endpoint].append(event)
+    for endpoint, endpoint_events in by_endpoint.items():
+        for start in range(0, len(endpoint_events), settings.WEBHOOK_BATCH_SIZE):
+            batch = endpoint_events[start:start + settings.WEBHOOK_BATCH_SIZE]
+            body = json.dumps({'events': [event.as_json() for event in batch]}, cls=DjangoJSONEncoder).encode()
+            batches[endpoint].append((batch, body))
+
+    delivered, failed = [], []
+    for batch, error in post_batches(batches):
+        if error is None:
+            delivered.extend(event.pk for event in batch)
+            continue
+        for event in batch:
+            event.attempts += 1
+            event.last_error = f'{type(error).__name__}: {error}'
+            if event.attempts >= settings.WEBHOOK_MAX_ATTEMPTS:
+                event.status = WebhookEvent.Status.FAILED
+            else:
+                event.next_attempt_at = timezone.now() + retry_delay(event.attempts)
+            failed.append(event)
+    WebhookEvent.objects.filter(pk__in=delivered).delete()
+    WebhookEvent.objects.bulk_update(failed, ['attempts', 'last_error', 'status', 'next_attempt_at'], batch_size=500)
+
+    # Retries, and whatever didn't fit in this run
+    next_attempt = WebhookEvent.objects.filter(status=WebhookEvent.Status.PENDING).aggregate(
+        at=Min('next_attempt_at'),
+    )['at']
+    if next_attempt is not None:
+        enqueue_once(deliver_events, run_at=max(next_attempt, timezone.now()))
+    return len(delivered)
@@ -0,0 +1,69 @@
+"""Turn saves and deletes of tasks, statuses and users into webhook events.
+
+Events are stored once the transaction that made the change commits, so
+rolled back changes send nothing, one row per subscribed endpoint, and a
+delivery job is queued for them. The payload is taken when the change is
+made, so a deleted object's last values are sent.
+"""
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from jobs.queue import enqueue_once
+from .delivery import deliver_events
+from .models import WebhookEndpoint, WebhookEvent
+
+# Event name prefix and payload fields, per model. Foreign keys are sent as ids.
+SOURCES = {
+    'tasks.Task': (
+        'task',
+        ('id', 'name', 'description', 'status', 'author', 'executor', 'due_date', 'priority', 'created_at'),
+    ),
+    'statuses.Status': ('status', ('id', 'name', 'is_closed')),
+    settings.AUTH_USER_MODEL: ('user', ('id', 'username', 'first_name', 'last_name', 'is_active')),
+}
+
+
+def payload(instance):
+    _prefix, names = SOURCES[instance._meta.label]
+    fields = [instance._meta.get_field(name) for name in names]
+    return {field.name: getattr(instance, field.attname) for field in fields}
+
+
+def emit(instance, action):
+    prefix, _names = SOURCES[instance._meta.label]
+    event_type = f'{prefix}.{action}'
+    data = payload(instance)
+    transaction.on_commit(lambda: queue_event(event_type, data))
+
+
+def queue_event(event_type, data):
+    """Store an event for every active endpoint that wants ``event_type`` and queue their delivery."""
+    endpoints = [endpoint for endpoint in WebhookEndpoint.objects.filter(is_active=True) if endpoint.wants(event_type)]
+    if not endpoints:
+        return
+    WebhookEvent.objects.bulk_create(
+        WebhookEvent(endpoint=endpoint, type=event_type, payload=data) for endpoint in endpoints
+    )
+    enqueue_once(deliver_events)
+
+
+def send_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    # e.g. last_login on every login
+    if update_fields is not None and not set(update_fields) & set(SOURCES[sender._meta.label][1]):
+        return
+    emit(instance, 'created' if created else 'updated')
+
+
+def send_delete(sender, instance, **kwargs):
+    emit(instance, 'deleted')
+
+
+def connect():
+    for label in SOURCES:
+        model = apps.get_model(label)
+        post_save.connect(send_save, sender=model, dispatch_uid=f'webhooks_post_save_{label}')
+        post_delete.connect(send_delete, sender=model, dispatch_uid=f'webhooks_post_delete_{label}')
@@ -0,0 +1,78 @@
+import secrets
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+
+def new_secret():
+    return secrets.token_hex(32)
+
+
+class WebhookEndpoint(models.Model):
+    """A URL that is POSTed the events it subscribes to (see webhooks/delivery.py)."""
+
+    url = models.URLField(_('URL'), max_length=500)
+    secret = models.CharField(
+        _('Secret'), max_length=128, default=new_secret,
+        help_text=_('Key of the HMAC-SHA256 signature sent with every request.'),
+    )
+    event_types = models.JSONField(
+        _('Events'), default=list, blank=True, help_text=_('Event types to send, e.g. ["task.created"]; empty for all.'),
+    )
+    is_active = models.BooleanField(_('Active'), default=True)
+
+    created_at = models.DateTimeField(_('Created'), auto_now_add=True)
+
+    class Meta:
+        verbose_name = _('Webhook endpoint')
+        verbose_name_plural = _('Webhook endpoints')
+
+    def __str__(self):
+        return self.url
+
+    def wants(self, event_type):
+        return not self.event_types or event_type in self.event_types
+
+
+class WebhookEvent(models.Model):
+    """An event waiting to be delivered to an endpoint; deleted once it is.
+
+    Events that still fail after WEBHOOK_MAX_ATTEMPTS are kept as failed.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', _('Pending')
+        FAILED = 'failed', _('Failed')
+
+    endpoint = models.ForeignKey(WebhookEndpoint, on_delete=models.CASCADE, related_name='events', db_index=False)
+    # e.g. 'task.updated'
+    type = models.CharField(_('Type'), max_length=64)
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    status = models.CharField(_('Status'), max_length=16, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveIntegerField(_('Attempts'), default=0)
+    next_attempt_at = models.DateTimeField(_('Next attempt'), default=timezone.now)
+    last_error = models.TextField(_('Last error'), blank=True)
+
+    created_at = models.DateTimeField(_('Created'), default=timezone.now)
+
+    class Meta:
+        verbose_name = _('Webhook event')
+        verbose_name_plural = _('Webhook events')
+        indexes = [
+            # Delivery takes the pending events that are due, endpoint by endpoint
+            models.Index(
+                fields=('next_attempt_at', 'endpoint'),
+                condition=models.Q(status='pending'),
+                name='webhooks_event_due_idx',
+            ),
+            models.Index(fields=('endpoint', 'status'), name='webhooks_event_endpoint_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.type} #{self.pk} to {self.endpoint_id}'
+
+    def as_json(self):
+        """The event as it is sent."""
+        return {'id': self.pk, 'type': self.type, 'created_at': self.created_at, 'data': self.payload}
@@ -0,0 +1,84 @@
+"""A local webhook receiver for tests and benchmarks.
+
+    with StubReceiver(secret=endpoint.secret) as receiver:
+        WebhookEndpoint.objects.create(url=receiver.url, secret=receiver.secret)
+        ...
+        receiver.events  # every event received, in arrival order
+
+It checks signatures (``bad_signatures`` counts the ones that didn't
+verify), can answer the first ``fail`` requests with 500 and wait ``delay``
+seconds before answering, and records the most requests it had in flight
+at once (``max_in_flight``).
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .delivery import verify
+
+
+class StubReceiver:
+    def __init__(self, secret='', fail=0, delay=0.0):
+        self.secret = secret
+        self.fail = fail
+        self.delay = delay
+        self.requests = []
+        self.events = []
+        self.bad_signatures = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), self.handler_class())
+        self.server.daemon_threads = True
+
+    @property
+    def url(self):
+        host, port = self.server.server_address
+        return f'http://{host}:{port}/hook'
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def receive(self, headers, body):
+        """Record a request; return the status code to answer with."""
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.delay:
+                time.sleep(self.delay)
+            with self.lock:
+                if self.fail:
+                    self.fail -= 1
+                    return 500
+                if not verify(self.secret, headers, body):
+                    self.bad_signatures += 1
+                    return 400
+                data = json.loads(body)
+                self.requests.append(data)
+                self.events.extend(data['events'])
+                return 204
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def handler_class(self):
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                self.send_response(receiver.receive(self.headers, body))
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
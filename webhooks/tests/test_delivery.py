@@ -0,0 +1,123 @@
+import socket
+import time
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from jobs.models import Job
+from webhooks.delivery import SIGNATURE_HEADER, TIMESTAMP_HEADER, claim_due_events, deliver_events, sign, verify
+from webhooks.events import queue_event
+from webhooks.models import WebhookEndpoint, WebhookEvent
+from webhooks.testing import StubReceiver
+
+
+class SignatureTests(TestCase):
+    def test_verify(self):
+        body = b'{"events": []}'
+        timestamp = int(time.time())
+        headers = {TIMESTAMP_HEADER: str(timestamp), SIGNATURE_HEADER: sign('secret', timestamp, body)}
+        self.assertTrue(verify('secret', headers, body))
+        self.assertFalse(verify('other', headers, body))
+        self.assertFalse(verify('secret', headers, b'{"events": [1]}'))
+        stale = timestamp - 3600
+        self.assertFalse(verify('secret', {TIMESTAMP_HEADER: str(stale), SIGNATURE_HEADER: sign('secret', stale, body)}, body))
+        self.assertFalse(verify('secret', {}, body))
+
+
+@override_settings(WEBHOOK_BATCH_SIZE=2, WEBHOOK_WORKERS=8, WEBHOOK_ENDPOINT_CONCURRENCY=2, WEBHOOK_TIMEOUT=5)
+class DeliverEventsTests(TestCase):
+    def add_events(self, endpoint, count):
+        WebhookEvent.objects.bulk_create(
+            WebhookEvent(endpoint=endpoint, type='task.updated', payload={'id': i}) for i in range(count)
+        )
+
+    def test_events_are_batched_signed_and_deleted(self):
+        with StubReceiver(secret='s3cret') as receiver:
+            endpoint = WebhookEndpoint.objects.create(url=receiver.url, secret='s3cret')
+            self.add_events(endpoint, 5)
+            self.assertEqual(deliver_events(), 5)
+        self.assertEqual(len(receiver.requests), 3)
+        self.assertEqual(receiver.bad_signatures, 0)
+        self.assertEqual(sorted(event['data']['id'] for event in receiver.events), [0, 1, 2, 3, 4])
+        self.assertEqual(set(receiver.events[0]), {'id', 'type', 'created_at', 'data'})
+        self.assertFalse(WebhookEvent.objects.exists())
+        self.assertFalse(Job.objects.exists())
+
+    def test_concurrency_is_limited_per_endpoint(self):
+        with StubReceiver(delay=0.05) as slow, StubReceiver(delay=0.05) as other:
+            for receiver in (slow, other):
+                self.add_events(WebhookEndpoint.objects.create(url=receiver.url, secret=''), 12)
+            started = time.perf_counter()
+            self.assertEqual(deliver_events(), 24)
+            duration = time.perf_counter() - started
+        self.assertEqual((slow.max_in_flight, other.max_in_flight), (2, 2))
+        # 24 events in 12 POSTs of 0.05 s: 0.6 s if they were sent one at a time
+        self.assertLess(duration, 0.6)
+
+    def test_failed_batches_are_retried_with_backoff(self):
+        with StubReceiver(fail=1) as receiver:
+            endpoint = WebhookEndpoint.objects.create(url=receiver.url, secret='')
+            self.add_events(endpoint, 1)
+            self.assertEqual(deliver_events(), 0)
+            event = WebhookEvent.objects.get()
+            self.assertEqual((event.status, event.attempts), (WebhookEvent.Status.PENDING, 1))
+            self.assertIn('500', event.last_error)
+            self.assertGreater(event.next_attempt_at, timezone.now())
+            # The retry is queued for when the event is due
+            self.assertEqual(Job.objects.get(name='webhooks.delivery.deliver_events').run_at, event.next_attempt_at)
+
+            self.assertEqual(deliver_events(), 0)
+            WebhookEvent.objects.update(next_attempt_at=timezone.now())
+            self.assertEqual(deliver_events(), 1)
+        self.assertEqual(len(receiver.events), 1)
+
+    def test_new_events_are_not_held_back_by_a_retry(self):
+        with StubReceiver(fail=1) as failing, StubReceiver() as healthy:
+            failing_endpoint = WebhookEndpoint.objects.create(url=failing.url, secret='', event_types=['task.created'])
+            self.add_events(failing_endpoint, 1)
+            self.assertEqual(deliver_events(), 0)
+            job = Job.objects.get(name='webhooks.delivery.deliver_events')
+            self.assertGreater(job.run_at, timezone.now())
+
+            WebhookEndpoint.objects.create(url=healthy.url, secret='', event_types=['task.updated'])
+            queue_event('task.updated', {'id': 1})
+            # The same job, now due straight away
+            job = Job.objects.get(name='webhooks.delivery.deliver_events')
+            self.assertLessEqual(job.run_at, timezone.now())
+            self.assertEqual(deliver_events(), 1)
+        self.assertEqual(len(healthy.events), 1)
+
+    @override_settings(WEBHOOK_MAX_ATTEMPTS=2)
+    def test_events_are_given_up_on_after_max_attempts(self):
+        # Nothing listens on a port that was just freed
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            port = sock.getsockname()[1]
+        endpoint = WebhookEndpoint.objects.create(url=f'http://127.0.0.1:{port}/hook')
+        self.add_events(endpoint, 1)
+        deliver_events()
+        WebhookEvent.objects.update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+        deliver_events()
+        event = WebhookEvent.objects.get()
+        self.assertEqual((event.status, event.attempts), (WebhookEvent.Status.FAILED, 2))
+        self.assertIn('URLError', event.last_error)
+
+    def test_lease_covers_the_batches_claimed(self):
+        self.add_events(WebhookEndpoint.objects.create(url='http://busy.example/', secret=''), 12)
+        self.add_events(WebhookEndpoint.objects.create(url='http://quiet.example/', secret=''), 2)
+        now = timezone.now()
+        self.assertEqual(len(claim_due_events(now)), 14)
+        # 6 batches for the busy endpoint, 2 at a time: 3 rounds, plus one
+        # for the worker pool and one for the margin, of 5 s each
+        leases = set(WebhookEvent.objects.values_list('next_attempt_at', flat=True))
+        self.assertEqual(leases, {now + timedelta(seconds=25)})
+
+    @override_settings(WEBHOOK_EVENTS_PER_RUN=3)
+    def test_lease_of_a_capped_run(self):
+        self.add_events(WebhookEndpoint.objects.create(url='http://busy.example/', secret=''), 12)
+        now = timezone.now()
+        claimed = claim_due_events(now)
+        self.assertEqual(len(claimed), 3)
+        # 2 batches: one round for the pool, one for the endpoint, one for the margin
+        self.assertEqual(WebhookEvent.objects.get(pk=claimed[0].pk).next_attempt_at, now + timedelta(seconds=15))
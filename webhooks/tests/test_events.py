@@ -0,0 +1,62 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from jobs.models import Job
+from statuses.models import Status
+from tasks.models import Task
+from webhooks.models import WebhookEndpoint, WebhookEvent
+
+
+class WebhookEventsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username='u1', password='pass12345')
+        cls.status = Status.objects.create(name='New')
+
+    def test_nothing_is_stored_without_endpoints(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Task.objects.create(name='Task', status=self.status, author=self.user)
+        self.assertFalse(WebhookEvent.objects.exists())
+        self.assertFalse(Job.objects.exists())
+
+    def test_changes_are_stored_per_endpoint_at_commit(self):
+        first = WebhookEndpoint.objects.create(url='http://one.example/hook')
+        second = WebhookEndpoint.objects.create(url='http://two.example/hook')
+        with self.captureOnCommitCallbacks() as callbacks:
+            task = Task.objects.create(name='Task', status=self.status, author=self.user, executor=self.user)
+        self.assertFalse(WebhookEvent.objects.exists())
+        for callback in callbacks:
+            callback()
+        events = WebhookEvent.objects.order_by('endpoint_id')
+        self.assertEqual([(event.endpoint, event.type) for event in events], [(first, 'task.created'), (second, 'task.created')])
+        self.assertEqual(events[0].payload, {
+            'id': task.pk, 'name': 'Task', 'description': '', 'status': self.status.pk, 'author': self.user.pk,
+            'executor': self.user.pk, 'due_date': None, 'priority': Task.Priority.NORMAL,
+            'created_at': events[0].payload['created_at'],
+        })
+        self.assertEqual(Job.objects.get().name, 'webhooks.delivery.deliver_events')
+
+    def test_endpoints_get_only_the_types_they_subscribe_to(self):
+        WebhookEndpoint.objects.create(url='http://one.example/hook', event_types=['status.updated'])
+        WebhookEndpoint.objects.create(url='http://two.example/hook', is_active=False)
+        with self.captureOnCommitCallbacks(execute=True):
+            status = Status.objects.create(name='Done')
+            status.name = 'Finished'
+            status.save()
+        event = WebhookEvent.objects.get()
+        self.assertEqual((event.type, event.payload), ('status.updated', {'id': status.pk, 'name': 'Finished', 'is_closed': False}))
+
+    def test_deletes_send_the_last_values(self):
+        WebhookEndpoint.objects.create(url='http://one.example/hook')
+        status = Status.objects.create(name='Old')
+        pk = status.pk
+        with self.captureOnCommitCallbacks(execute=True):
+            status.delete()
+        event = WebhookEvent.objects.get()
+        self.assertEqual((event.type, event.payload['id'], event.payload['name']), ('status.deleted', pk, 'Old'))
+
+    def test_saves_of_other_fields_are_not_sent(self):
+        WebhookEndpoint.objects.create(url='http://one.example/hook')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.login(username='u1', password='pass12345')
+        self.assertFalse(WebhookEvent.objects.exists())